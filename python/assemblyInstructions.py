@@ -8,13 +8,17 @@ class Opcode(Enum):
     MUL = "MUL"
     DIV = "DIV"
     MOV = "MOV"
+    JMP = "JMP"      # JMP L: continue at label L
+    JNZ = "JNZ"      # JNZ src,L: continue at label L if src is not zero
+    LABEL = "LABEL"  # L: marks a jump target, executes nothing
 
 
 class OperandType(Enum): 
-    """The three ways a value can be referenced in an instruction: literal, register, or memory."""
+    """The three ways a value can be referenced in an instruction (literal, register, or memory), plus jump targets."""
     IMMEDIATE = 1   # #5
     VARIABLE = 2    # a, b, t1
     REGISTER = 3    # R0, R1, ...
+    LABEL = 4       # L1, loop, ...
 
 
 class Operand: 
@@ -28,7 +32,7 @@ class Operand:
             return f"#{self.value}"
         if self.type == OperandType.REGISTER:
             return f"R{self.value}"
-        if self.type == OperandType.VARIABLE:
+        if self.type in (OperandType.VARIABLE, OperandType.LABEL):
             return str(self.value)
         return f"<Operand {self.type} {self.value}>"
 
@@ -39,13 +43,18 @@ class AssemblyInstruction:
       MOV a,R0
       ADD #1,R0
       MOV R0,a
+    Control flow uses the same shape: JMP L (dst is None), JNZ R0,L and the label L itself.
     """
-    def __init__(self, opcode, src, dst):
+    def __init__(self, opcode, src, dst=None):
         self.opcode = opcode      # Opcode
         self.src = src            # Operand
-        self.dst = dst            # Operand
+        self.dst = dst            # Operand, or None for JMP and LABEL
 
     def __repr__(self):
+        if self.opcode == Opcode.LABEL:
+            return f"{self.src}:"
+        if self.dst is None:
+            return f"{self.opcode.value} {self.src}"
         return f"{self.opcode.value} {self.src},{self.dst}"
 
 
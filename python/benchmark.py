@@ -0,0 +1,250 @@
+# benchmark.py
+# Times each compiler stage on synthetic blocks of increasing size and records the results as JSON.
+#
+# Usage:
+#   python benchmark.py [--sizes 10 100 1000] [--output results.json] [--compare old.json]
+#   python benchmark.py --startup [--repeat 5] [--output startup.json] [--compare old.json]
+#
+# Each size is generated with tacGenerator.generate_tac, so the same arguments always
+# benchmark the same blocks and results from different commits can be compared.
+# --startup instead measures whole `python main.py` invocations on the runTests.py cases,
+# where interpreter and module startup dominate: the fastest wall time of each case, and
+# the import time of every module from `python -X importtime`.
+
+import argparse
+import json
+import os
+import platform
+import statistics
+import subprocess
+import tempfile
+import time
+import tracemalloc
+
+from tacGenerator import generate_tac, write_tac
+from parser import read_intermediate_code
+from liveness import LivenessAnalyzer
+from interference import InterferenceGraph
+from codegen import generate_target_code
+
+# A default run finishes in under a minute; larger blocks must be asked for with --sizes
+DEFAULT_SIZES = [10, 100, 1000, 10000, 100000]
+
+# Results file, ignored by git so benchmark runs never show up as changes
+DEFAULT_OUTPUT = "benchmark_results.json"
+
+STAGES = ["parse", "liveness", "interference", "allocation", "codegen"]
+
+
+def _git_commit():
+    """Returns the current commit hash, or None outside a git checkout."""
+    try:
+        result = subprocess.run(["git", "rev-parse", "HEAD"], capture_output=True, text=True,
+                                cwd=os.path.dirname(os.path.abspath(__file__)))
+    except OSError:
+        return None
+    return result.stdout.strip() or None
+
+
+def _run_stage(func, track_memory):
+    """Runs one stage and returns (result, seconds, peak_bytes)."""
+    if track_memory:
+        tracemalloc.reset_peak()
+    start = time.perf_counter()
+    result = func()
+    seconds = time.perf_counter() - start
+    peak = tracemalloc.get_traced_memory()[1] if track_memory else None
+    return result, seconds, peak
+
+
+def benchmark_size(size, args):
+    """Generates one block of the given size and times every stage on it."""
+    lines = generate_tac(size, args.vars, args.reuse, args.pressure, args.seed)
+    fd, path = tempfile.mkstemp(suffix=".txt")
+    os.close(fd)
+    write_tac(path, lines)
+
+    record = {"size": size, "status": "ok", "stages": {}}
+    state = {}
+
+    stage_funcs = {
+        "parse": lambda: read_intermediate_code(path),
+        "liveness": lambda: _analyze(state["parse"]),
+        "interference": lambda: InterferenceGraph(state["liveness"]),
+        "allocation": lambda: state["interference"].allocate_registers(args.registers),
+        "codegen": lambda: generate_target_code(state["parse"], state["interference"].allocations,
+                                                state["liveness"].live_at_entry,
+                                                state["liveness"].web_map),
+    }
+
+    if args.memory:
+        tracemalloc.start()
+    try:
+        for stage in STAGES:
+            try:
+                result, seconds, peak = _run_stage(stage_funcs[stage], args.memory)
+            except (RecursionError, MemoryError) as e:
+                record["status"] = f"{stage} failed: {type(e).__name__}"
+                break
+            record["stages"][stage] = {"seconds": seconds, "peak_bytes": peak}
+            state[stage] = result
+            if stage == "allocation" and not result:
+                record["status"] = "allocation failed"
+                break
+    finally:
+        if args.memory:
+            tracemalloc.stop()
+        os.remove(path)
+
+    if "liveness" in state:
+        record["webs"] = len(state["liveness"].webs)
+    if "interference" in state:
+        record["edges"] = sum(len(n) for n in state["interference"].adj_list.values()) // 2
+    return record
+
+
+def _analyze(code):
+    analyzer = LivenessAnalyzer(code)
+    analyzer.analyze()
+    return analyzer
+
+
+def compare_results(current, baseline):
+    """Prints the per-stage time ratio of the current run against a baseline run."""
+    base_by_size = {r["size"]: r for r in baseline["results"]}
+    print(f"\nComparison against {baseline.get('commit') or 'baseline'} (current / baseline):")
+    for record in current["results"]:
+        base = base_by_size.get(record["size"])
+        if base is None:
+            continue
+        ratios = []
+        for stage in STAGES:
+            now = record["stages"].get(stage)
+            old = base["stages"].get(stage)
+            if now and old and old["seconds"] > 0:
+                ratios.append(f"{stage} {now['seconds'] / old['seconds']:.2f}x")
+        print(f"  {record['size']:>8}: " + ", ".join(ratios))
+
+
+def _import_times(stderr):
+    """
+    Parses `-X importtime` output.
+
+    Returns:
+        (total microseconds spent importing, dict of top-level module -> cumulative microseconds)
+    """
+    modules = {}
+    for line in stderr.splitlines():
+        if not line.startswith("import time:") or "|" not in line:
+            continue
+        _, cumulative, name = line[len("import time:"):].split("|")
+        # Nested imports are indented under the module that triggered them
+        if cumulative.strip().isdigit() and not name[1:].startswith(" "):
+            modules[name.strip()] = int(cumulative)
+    return sum(modules.values()), modules
+
+
+def benchmark_startup(args):
+    """Times every runTests.py case as a separate main.py process and records its imports."""
+    from regressionTests import run_case
+    from runTests import TEST_CASES
+
+    records = []
+    print(f"{'ms':>8} {'import ms':>10} {'modules':>8}  case")
+    for name, case_args in TEST_CASES:
+        timed = run_case(name, case_args, repeat=args.repeat)
+        traced = run_case(name, case_args, python_flags=["-X", "importtime"])
+        import_us, modules = _import_times(traced.stderr)
+        records.append({"case": name, "seconds": timed.seconds, "import_seconds": import_us / 1e6,
+                         "modules": modules})
+        print(f"{timed.seconds * 1000:8.1f} {import_us / 1000:10.1f} {len(modules):8}  {name}")
+
+    print(f"\nMedian per invocation: {statistics.median(r['seconds'] for r in records) * 1000:.1f} ms, "
+          f"median import time: {statistics.median(r['import_seconds'] for r in records) * 1000:.1f} ms")
+    return records
+
+
+def compare_startup(current, baseline):
+    """Prints the median invocation and import times of a run against a baseline run."""
+    print(f"\nComparison against {baseline.get('commit') or 'baseline'} (current / baseline):")
+    for key, label in (("seconds", "per invocation"), ("import_seconds", "import time")):
+        now = statistics.median(r[key] for r in current["startup"])
+        old = statistics.median(r[key] for r in baseline["startup"])
+        print(f"  {label}: {now * 1000:.1f} ms / {old * 1000:.1f} ms = {now / old:.2f}x")
+
+
+def print_record(record):
+    """Prints one size's timings as a single table row."""
+    cells = []
+    for stage in STAGES:
+        timing = record["stages"].get(stage)
+        cells.append(f"{timing['seconds']:9.4f}" if timing else f"{'-':>9}")
+    print(f"{record['size']:>8} " + " ".join(cells) + f"  {record['status']}")
+
+
+def main():
+    arg_parser = argparse.ArgumentParser(description="Benchmark each compiler stage.")
+    arg_parser.add_argument("--sizes", type=int, nargs="+", default=DEFAULT_SIZES,
+                            help=f"block sizes to benchmark (default: {' '.join(map(str, DEFAULT_SIZES))})")
+    arg_parser.add_argument("--vars", type=int, default=8, help="number of named variables")
+    arg_parser.add_argument("--reuse", type=float, default=0.5, help="temporary reuse probability")
+    arg_parser.add_argument("--pressure", type=int, default=4, help="target number of live values")
+    arg_parser.add_argument("--registers", type=int, default=None,
+                            help="registers to allocate with (default: pressure + vars + 4)")
+    arg_parser.add_argument("--seed", type=int, default=0)
+    arg_parser.add_argument("--no-memory", dest="memory", action="store_false",
+                            help="skip peak-memory tracking, which slows every stage down")
+    arg_parser.add_argument("--output", default=DEFAULT_OUTPUT)
+    arg_parser.add_argument("--compare", help="earlier results file to compare against")
+    arg_parser.add_argument("--startup", action="store_true",
+                            help="time whole main.py runs on the test cases instead of stages")
+    arg_parser.add_argument("--repeat", type=int, default=5,
+                            help="runs per test case with --startup; the fastest counts")
+    args = arg_parser.parse_args()
+
+    if args.startup:
+        results = {
+            "commit": _git_commit(),
+            "python": platform.python_version(),
+            "timestamp": time.strftime("%Y-%m-%dT%H:%M:%S"),
+            "startup": benchmark_startup(args),
+        }
+        with open(args.output, "w") as f:
+            json.dump(results, f, indent=2)
+        print(f"\nResults written to: {args.output}")
+        if args.compare:
+            with open(args.compare) as f:
+                compare_startup(results, json.load(f))
+        return
+    if args.registers is None:
+        args.registers = args.pressure + args.vars + 4
+
+    results = {
+        "commit": _git_commit(),
+        "python": platform.python_version(),
+        "timestamp": time.strftime("%Y-%m-%dT%H:%M:%S"),
+        "params": {
+            "vars": args.vars, "reuse": args.reuse, "pressure": args.pressure,
+            "registers": args.registers, "seed": args.seed, "memory": args.memory,
+        },
+        "results": [],
+    }
+
+    print(f"{'size':>8} " + " ".join(f"{s:>9}" for s in STAGES) + "  status")
+    for size in args.sizes:
+        record = benchmark_size(size, args)
+        results["results"].append(record)
+        print_record(record)
+        # Rewrite after every size so a long run still leaves usable results if interrupted
+        with open(args.output, "w") as f:
+            json.dump(results, f, indent=2)
+
+    print(f"\nResults written to: {args.output}")
+
+    if args.compare:
+        with open(args.compare) as f:
+            compare_results(results, json.load(f))
+
+
+if __name__ == "__main__":
+    main()
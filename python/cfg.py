@@ -0,0 +1,114 @@
+# cfg.py
+# Control-flow graph of an IntermediateCode block made of several basic blocks.
+#
+# A basic block starts at line 1, at every label and after every jump, and runs until
+# the next such line. Control leaves the function by falling off the last line, which is
+# where the live-on-exit variables are stored.
+
+
+class BasicBlock:
+    """
+    A maximal run of lines that is always entered at its first line and left at its last.
+    - first_line / last_line: 1-based, inclusive
+    - successors / predecessors: indices of neighbouring blocks
+    - falls_to_exit: True if control can leave the function after this block
+    - gen / kill / live_in / live_out: bitsets over ControlFlowGraph.variables
+    """
+    def __init__(self, index, first_line, last_line):
+        self.index = index
+        self.first_line = first_line
+        self.last_line = last_line
+        self.successors = []
+        self.predecessors = []
+        self.falls_to_exit = False
+        self.gen = 0
+        self.kill = 0
+        self.live_in = 0
+        self.live_out = 0
+
+    def __repr__(self):
+        return f"<BasicBlock {self.index}: lines {self.first_line}-{self.last_line} -> {self.successors}>"
+
+
+class ControlFlowGraph:
+    """
+    Splits a block of TAC into basic blocks and links them by their jumps and fall-throughs.
+    Variables are numbered so that sets of them can be kept as integer bitsets.
+    """
+    def __init__(self, code):
+        """
+        Args:
+            code: an IntermediateCode whose labels have been validated
+        """
+        self.code = code
+        self.blocks = []
+        # variable -> bit position, and the reverse
+        self.bit = {}
+        self.variables = []
+        self._number_variables()
+        self._split_blocks()
+        self._link_blocks()
+
+    def _number_variables(self):
+        for var in sorted(self.code.get_all_variables() | set(self.code.live_on_exit)):
+            self.bit[var] = len(self.variables)
+            self.variables.append(var)
+
+    def _split_blocks(self):
+        """Cuts the lines into basic blocks at labels and after jumps."""
+        instructions = self.code.instructions
+        leaders = {1}
+        for line_num, instr in enumerate(instructions, start=1):
+            if instr.is_label():
+                leaders.add(line_num)
+            elif instr.is_jump() and line_num < len(instructions):
+                leaders.add(line_num + 1)
+        starts = sorted(line for line in leaders if line <= len(instructions))
+        for k, first_line in enumerate(starts):
+            last_line = starts[k + 1] - 1 if k + 1 < len(starts) else len(instructions)
+            self.blocks.append(BasicBlock(k, first_line, last_line))
+
+    def _link_blocks(self):
+        """Adds an edge for every jump and for every fall-through into the next block."""
+        block_of_label = {}
+        for block in self.blocks:
+            first = self.code.instructions[block.first_line - 1]
+            if first.is_label():
+                block_of_label[first.label] = block.index
+
+        for block in self.blocks:
+            last = self.code.instructions[block.last_line - 1]
+            successors = []
+            if last.is_jump():
+                successors.append(block_of_label[last.label])
+            if not last.is_jump() or last.is_conditional():
+                if block.index + 1 < len(self.blocks):
+                    successors.append(block.index + 1)
+                else:
+                    block.falls_to_exit = True
+            for succ in successors:
+                if succ not in block.successors:
+                    block.successors.append(succ)
+                    self.blocks[succ].predecessors.append(block.index)
+
+    def bits_of(self, variables):
+        """Returns the bitset holding the given variables."""
+        bits = 0
+        for var in variables:
+            bits |= 1 << self.bit[var]
+        return bits
+
+    def variables_of(self, bits):
+        """Returns the set of variables in a bitset."""
+        found = set()
+        while bits:
+            low = bits & -bits
+            found.add(self.variables[low.bit_length() - 1])
+            bits ^= low
+        return found
+
+    def __len__(self):
+        return len(self.blocks)
+
+    def __repr__(self):
+        return f"<ControlFlowGraph: {len(self.blocks)} blocks, {len(self.variables)} variables>"
@@ -0,0 +1,287 @@
+# chunkedParser.py
+# Parses very large TAC files in parallel, one byte range of the file per worker process.
+#
+# Every instruction line parses on its own, so the file is cut at line boundaries into
+# byte ranges. Each worker reads, parses and validates its range with the same rules as
+# parser.py, and returns it in columns instead of instruction objects, which would be
+# slow to pickle:
+#   kinds               array of KIND_* codes, one per line
+#   dst, src1, src2     arrays of indexes into the chunk's table of distinct names
+#                       (-1 for no operand); a label or jump keeps its label in dst
+#   ops                 array of indexes into OPERATORS (-1 for no operator)
+# The parent rebuilds the instructions chunk by chunk, in file order. A worker stops at
+# its first invalid line and reports it relative to the chunk; the parent adds the line
+# counts of the chunks before it, so the error names the same line as the serial parser.
+
+import os
+import sys
+from array import array
+
+from parser import parse_instruction
+from parserHelper import parse_live_line, is_valid_variable, is_valid_operand
+from threeAddress import (ThreeAddressInstruction, LabelInstruction, JumpInstruction, IntermediateCode,
+                          check_labels)
+
+# Chunks are never cut smaller than this, so small files are not split up for nothing
+MIN_CHUNK_BYTES = 1024 * 1024
+
+# Chunks per worker: several smaller chunks even out workers that finish early
+CHUNKS_PER_WORKER = 4
+
+KIND_ASSIGN = 0
+KIND_LABEL = 1
+KIND_GOTO = 2
+KIND_IF_GOTO = 3
+
+OPERATORS = ('+', '-', '*', '/')
+OPERATOR_CODES = {op: code for code, op in enumerate(OPERATORS)}
+
+
+def split_into_chunks(filename, num_chunks):
+    """
+    Cuts a file into at most num_chunks byte ranges of about the same size, each ending
+    just after a newline (the last one ends at the end of the file).
+
+    Returns:
+        List of (start, end) byte offsets covering the whole file in order
+    """
+    size = os.path.getsize(filename)
+    bounds = [0]
+    with open(filename, 'rb') as file:
+        for k in range(1, num_chunks):
+            target = size * k // num_chunks
+            if target <= bounds[-1]:
+                continue
+            # The chunk ends after the first newline at or after byte target - 1
+            file.seek(target - 1)
+            file.readline()
+            bound = file.tell()
+            if bound >= size:
+                break
+            if bound > bounds[-1]:
+                bounds.append(bound)
+    bounds.append(size)
+    return [(bounds[k], bounds[k + 1]) for k in range(len(bounds) - 1) if bounds[k] < bounds[k + 1]]
+
+
+def _read_lines(filename, start, end):
+    """Reads the lines of a byte range, splitting them the way text-mode readlines() does."""
+    with open(filename, 'rb') as file:
+        file.seek(start)
+        data = file.read(end - start)
+    # The encoding open(filename, 'r') uses in parser.py
+    import locale
+    text = data.decode(locale.getpreferredencoding(False))
+    if '\r' in text:
+        text = text.replace('\r\n', '\n').replace('\r', '\n')
+    lines = text.split('\n')
+    if lines[-1] == '':
+        # A range that ends with a newline has no partial line after it
+        lines.pop()
+    return lines
+
+
+def parse_chunk(filename, start, end, is_last):
+    """
+    Parses and validates the lines of one byte range into columns. Module-level so it
+    can run in a worker process. The last chunk leaves its final line (the live: line)
+    unparsed.
+
+    Returns:
+        dict with the columns (kinds, dst, src1, src2, ops), names (the distinct names
+        the columns index), defined and targets (labels defined and jumped to, in order),
+        num_lines, error (None, or (line index in the chunk, message)) and live_line
+    """
+    lines = _read_lines(filename, start, end)
+    live_line = lines.pop() if is_last and lines else None
+
+    kinds, dst, src1, src2, ops = [], [], [], [], []
+    names = []
+    index_of = {}
+    defined = []
+    targets = []
+    error = None
+
+    def name_index(name):
+        if name is None:
+            return -1
+        index = index_of.get(name)
+        if index is None:
+            index = index_of[name] = len(names)
+            names.append(name)
+        return index
+
+    # Operands repeat a lot, so each distinct token is validated once per chunk:
+    # token -> its name index, or -2 when it is not a valid operand (variable)
+    operands = {}
+    variables = {}
+    operand_get, variable_get = operands.get, variables.get
+    add_kind, add_dst, add_src1, add_src2, add_op = kinds.append, dst.append, src1.append, src2.append, ops.append
+
+    for line_index, line in enumerate(lines):
+        tokens = line.split()
+        # Fast path for the common well-formed assignments; anything else (control flow,
+        # negation, errors) goes through parse_instruction, which has the full rules
+        if len(tokens) == 5 and tokens[1] == '=' and tokens[3] in OPERATOR_CODES:
+            d, s1, s2 = variable_get(tokens[0]), operand_get(tokens[2]), operand_get(tokens[4])
+            if d is None:
+                d = variables[tokens[0]] = name_index(tokens[0]) if is_valid_variable(tokens[0]) else -2
+            if s1 is None:
+                s1 = operands[tokens[2]] = name_index(tokens[2]) if is_valid_operand(tokens[2]) else -2
+            if s2 is None:
+                s2 = operands[tokens[4]] = name_index(tokens[4]) if is_valid_operand(tokens[4]) else -2
+            if d >= 0 and s1 >= 0 and s2 >= 0:
+                add_kind(KIND_ASSIGN)
+                add_dst(d)
+                add_src1(s1)
+                add_src2(s2)
+                add_op(OPERATOR_CODES[tokens[3]])
+                continue
+        elif len(tokens) == 3 and tokens[1] == '=' and not tokens[2].startswith('-'):
+            d, s1 = variable_get(tokens[0]), operand_get(tokens[2])
+            if d is None:
+                d = variables[tokens[0]] = name_index(tokens[0]) if is_valid_variable(tokens[0]) else -2
+            if s1 is None:
+                s1 = operands[tokens[2]] = name_index(tokens[2]) if is_valid_operand(tokens[2]) else -2
+            if d >= 0 and s1 >= 0:
+                add_kind(KIND_ASSIGN)
+                add_dst(d)
+                add_src1(s1)
+                add_src2(-1)
+                add_op(-1)
+                continue
+
+        instr, error_msg = parse_instruction(line)
+        if instr is None:
+            error = (line_index, error_msg)
+            break
+        if instr.is_label():
+            kinds.append(KIND_LABEL)
+            dst.append(name_index(instr.label))
+            src1.append(-1)
+            defined.append(instr.label)
+        elif instr.is_jump():
+            kinds.append(KIND_IF_GOTO if instr.is_conditional() else KIND_GOTO)
+            dst.append(name_index(instr.label))
+            src1.append(name_index(instr.src1))
+            targets.append(instr.label)
+        else:
+            kinds.append(KIND_ASSIGN)
+            dst.append(name_index(instr.dst))
+            src1.append(name_index(instr.src1))
+        src2.append(name_index(instr.src2))
+        ops.append(OPERATOR_CODES[instr.op] if instr.op is not None else -1)
+
+    # Packed into typed arrays, the columns pickle as a few flat buffers
+    kinds, ops = array('b', kinds), array('b', ops)
+    dst, src1, src2 = array('l', dst), array('l', src1), array('l', src2)
+    return {"kinds": kinds, "dst": dst, "src1": src1, "src2": src2, "ops": ops, "names": names,
+            "defined": defined, "targets": targets, "num_lines": len(lines), "error": error,
+            "live_line": live_line}
+
+
+def _build_instructions(chunk):
+    """Rebuilds the instruction objects of one parsed chunk from its columns."""
+    # Index -1 (no operand, no operator) picks the None appended at the end of each table
+    names = chunk["names"] + [None]
+    operators = OPERATORS + (None,)
+    instructions = []
+    append = instructions.append
+    for kind, d, s1, s2, op in zip(chunk["kinds"], chunk["dst"], chunk["src1"], chunk["src2"], chunk["ops"]):
+        if kind == KIND_ASSIGN:
+            append(ThreeAddressInstruction(names[d], names[s1], operators[op], names[s2]))
+        elif kind == KIND_LABEL:
+            append(LabelInstruction(names[d]))
+        else:
+            append(JumpInstruction(names[d], names[s1]))
+    return instructions
+
+
+def read_intermediate_code_parallel(filename, workers=None, chunk_bytes=MIN_CHUNK_BYTES):
+    """
+    Reads and parses an input file like parser.read_intermediate_code, parsing chunks of
+    it in worker processes. Errors are printed exactly as the serial parser prints them.
+
+    Args:
+        filename: TAC file to parse
+        workers: number of worker processes (default: CPU count); 1 parses every chunk
+            in this process
+        chunk_bytes: smallest chunk to cut the file into; tests lower it so that small
+            files are split into several chunks
+
+    Returns:
+        IntermediateCode, or None if the file could not be read or is invalid
+    """
+    if workers is None:
+        workers = os.cpu_count() or 1
+    try:
+        size = os.path.getsize(filename)
+        num_chunks = max(1, min(workers * CHUNKS_PER_WORKER, size // chunk_bytes))
+        chunks = split_into_chunks(filename, num_chunks)
+    except (FileNotFoundError, IOError) as e:
+        print(f"Error reading file '{filename}': {e}", file=sys.stderr)
+        return None
+
+    if not chunks:
+        print("Error: Input file is empty", file=sys.stderr)
+        return None
+
+    jobs = [(filename, start, end, k == len(chunks) - 1) for k, (start, end) in enumerate(chunks)]
+    if workers > 1 and len(jobs) > 1:
+        from concurrent.futures import ProcessPoolExecutor
+        with ProcessPoolExecutor(max_workers=min(workers, len(jobs))) as pool:
+            # map hands the results back in file order, whatever order the workers finish in
+            results = list(pool.map(parse_chunk, *zip(*jobs)))
+    else:
+        results = [parse_chunk(*job) for job in jobs]
+
+    code = IntermediateCode()
+    defined = []
+    targets = []
+    lines_before = 0
+    # Millions of new instruction objects would set off the cyclic garbage collector over
+    # and over, and none of them can be part of a cycle yet
+    import gc
+    collecting = gc.isenabled()
+    gc.disable()
+    try:
+        for chunk in results:
+            if chunk["error"] is not None:
+                line_index, error_msg = chunk["error"]
+                print(f"Error on line {lines_before + line_index + 1}: {error_msg}", file=sys.stderr)
+                return None
+            code.instructions.extend(_build_instructions(chunk))
+            defined.extend(chunk["defined"])
+            targets.extend(chunk["targets"])
+            lines_before += chunk["num_lines"]
+    finally:
+        if collecting:
+            gc.enable()
+
+    # Process the last line (live-on-exit)
+    live_vars = parse_live_line(results[-1]["live_line"], lines_before + 1)
+    if live_vars is None:
+        return None
+    code.set_live_on_exit(live_vars)
+
+    is_valid, error_msg = check_labels(defined, targets)
+    if not is_valid:
+        print(f"Error: {error_msg}", file=sys.stderr)
+        return None
+    return code
+
+
+if __name__ == "__main__":
+    import time
+    from parser import read_intermediate_code
+
+    filename = sys.argv[1]
+    workers = int(sys.argv[2]) if len(sys.argv) > 2 else None
+    start = time.perf_counter()
+    serial = read_intermediate_code(filename)
+    serial_seconds = time.perf_counter() - start
+    start = time.perf_counter()
+    parallel = read_intermediate_code_parallel(filename, workers)
+    parallel_seconds = time.perf_counter() - start
+    same = (serial is None) == (parallel is None) and repr(serial) == repr(parallel)
+    print(f"serial {serial_seconds:.3f}s, parallel {parallel_seconds:.3f}s, same result: {same}")
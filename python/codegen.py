@@ -8,6 +8,8 @@ from assemblyInstructions import (
     OperandType,
     Opcode
 )
+from liveness import WebMap
+from costModel import CostModel
 
 _OP_MAP = {
     "+": Opcode.ADD,
@@ -16,75 +18,301 @@ _OP_MAP = {
     "/": Opcode.DIV,
 }
 
-def make_operand(value, allocations):
-    """Converts a variable name or integer literal into an Operand."""
+_COMMUTATIVE = {"+", "*"}
+
+def make_operand(value, allocations, webs=None, line_num=None):
+    """
+    Converts a variable name or integer literal into an Operand.
+    When a WebMap is given, the variable is resolved to the web it is read from on line_num,
+    constant webs become IMMEDIATE operands and webs kept in memory become VARIABLE operands.
+    """
     try:
         int(value)
         return Operand(OperandType.IMMEDIATE, value)
     except ValueError:
         pass
+    if webs is not None:
+        web = webs.use_web(line_num, value)
+        if web in webs.constants:
+            return Operand(OperandType.IMMEDIATE, webs.constants[web])
+        if web in webs.in_memory:
+            return Operand(OperandType.VARIABLE, value)
+        value = web
     return Operand(OperandType.REGISTER, allocations[value])
 
-def generate_target_code(intermediate_code, allocations, live_on_entry):
+def generate_target_code(intermediate_code, allocations, live_on_entry, webs=None, cost_model=None):
     """
     Main router for converting intermediate code into assembly instructions.
+    
+    Args:
+        intermediate_code: the IntermediateCode block to translate
+        allocations: dict mapping each web to its register number
+        live_on_entry: set of variables to load from memory on entry
+        webs: WebMap from the liveness analysis; if omitted every web is named after its variable
+        cost_model: CostModel used to choose between equivalent instruction sequences
     """
+    if webs is None:
+        webs = WebMap.by_name(intermediate_code, live_on_entry)
+    if cost_model is None:
+        cost_model = CostModel()
+
     target = TargetCode()
 
-    # 1. Handle entry: load variables from memory 
-    _load_live_on_entry(target, live_on_entry, allocations)
+    for line_num, instr in enumerate(intermediate_code.instructions, start=1):
+        # 0. Move values that change register at a segment boundary
+        if line_num in webs.transfers:
+            _emit_transfers(target, webs.transfers[line_num], allocations)
+
+        # 1. Handle entry: load variables from memory just before their first use
+        _load_live_on_entry(target, webs.loads.get(line_num, []), allocations)
 
-    # 2. Translate each instruction
-    for instr in intermediate_code.instructions:
-        _translate_instruction(target, instr, allocations)
+        # 2. Translate each instruction
+        _translate_instruction(target, instr, allocations, webs, line_num, cost_model)
 
     # 3. Handle exit: store live variables to memory 
-    _store_live_on_exit(target, intermediate_code.live_on_exit, allocations)
+    _store_live_on_exit(target, intermediate_code.live_on_exit, allocations, webs)
 
     return target
 
-def _load_live_on_entry(target, live_on_entry, allocations):
+def _load_live_on_entry(target, loads, allocations):
     """Emits MOV instructions for variables live upon block entry."""
-    for var in sorted(live_on_entry):
-        if var in allocations:
+    for var, web in loads:
+        if web in allocations:
             target.add(AssemblyInstruction(
                 Opcode.MOV,
                 Operand(OperandType.VARIABLE, var),
-                Operand(OperandType.REGISTER, allocations[var])
+                Operand(OperandType.REGISTER, allocations[web])
             ))
 
-def _translate_instruction(target, instr, allocations):
+def _emit_transfers(target, transfers, allocations):
+    """
+    Emits a parallel move of values into their registers for the next segment.
+    Moves are ordered so no register is overwritten before it is read; a cycle of
+    moves is broken by parking one value in its variable's memory location.
+    """
+    pending = []
+    for var, src_web, dst_web in transfers:
+        if allocations[src_web] != allocations[dst_web]:
+            pending.append((var, allocations[src_web], allocations[dst_web]))
+
+    parked = []
+    while pending:
+        sources = {src for _, src, _ in pending}
+        ready = next((move for move in pending if move[2] not in sources), None)
+        if ready is None:
+            var, src, dst = pending.pop(0)
+            target.add(AssemblyInstruction(
+                Opcode.MOV, Operand(OperandType.REGISTER, src), Operand(OperandType.VARIABLE, var)))
+            parked.append((var, dst))
+            continue
+        pending.remove(ready)
+        _, src, dst = ready
+        target.add(AssemblyInstruction(
+            Opcode.MOV, Operand(OperandType.REGISTER, src), Operand(OperandType.REGISTER, dst)))
+
+    for var, dst in parked:
+        target.add(AssemblyInstruction(
+            Opcode.MOV, Operand(OperandType.VARIABLE, var), Operand(OperandType.REGISTER, dst)))
+
+def _translate_instruction(target, instr, allocations, webs, line_num, cost_model):
     """Translates a single Three Address Code Instruction into one or more assembly instructions."""
-    # Skip dead definitions (Requirement: no register allocated)
-    if instr.dst not in allocations:
+    if instr.is_label() or instr.is_jump():
+        _translate_control_flow(target, instr, allocations, webs, line_num)
         return
 
-    dst_reg = Operand(OperandType.REGISTER, allocations[instr.dst])
+    dst_web = webs.def_web(line_num)
+    spill_store = None
+    if dst_web in webs.in_memory:
+        # Spilled web: compute in the scratch register, then store to memory
+        if webs.scratch_register is None:
+            raise ValueError(f"Web '{dst_web}' is spilled but no scratch register was reserved")
+        dst_reg = Operand(OperandType.REGISTER, webs.scratch_register)
+        spill_store = AssemblyInstruction(Opcode.MOV, dst_reg, Operand(OperandType.VARIABLE, instr.dst))
+    elif dst_web not in allocations:
+        # Skip dead definitions (Requirement: no register allocated)
+        return
+    else:
+        dst_reg = Operand(OperandType.REGISTER, allocations[dst_web])
 
     if instr.is_binary():
         # dst = src1 op src2
-        src1 = make_operand(instr.src1, allocations)
-        src2 = make_operand(instr.src2, allocations)
-        target.add(AssemblyInstruction(Opcode.MOV, src1, dst_reg))
-        target.add(AssemblyInstruction(_OP_MAP[instr.op], src2, dst_reg))
+        src1 = make_operand(instr.src1, allocations, webs, line_num)
+        src2 = make_operand(instr.src2, allocations, webs, line_num)
+        # In code with jumps a variable keeps one register, so a = b - a reads and writes the same one
+        home = Operand(OperandType.VARIABLE, instr.dst) if instr.src2 == instr.dst and spill_store is None else None
+        target.extend(_select_binary(instr.op, src1, src2, dst_reg, cost_model, home))
 
     elif instr.is_unary_negation():
         # dst = 0 - src => -src
-        src = make_operand(instr.src1, allocations)
-        target.add(AssemblyInstruction(Opcode.MOV, Operand(OperandType.IMMEDIATE, "0"), dst_reg))
-        target.add(AssemblyInstruction(Opcode.SUB, src, dst_reg))
+        src = make_operand(instr.src1, allocations, webs, line_num)
+        target.extend(_select_negation(src, dst_reg, cost_model))
 
     else:
         # dst = src (simple assignment)
-        src = make_operand(instr.src1, allocations)
-        target.add(AssemblyInstruction(Opcode.MOV, src, dst_reg))
+        src = make_operand(instr.src1, allocations, webs, line_num)
+        target.extend(_move(src, dst_reg))
+
+    if spill_store is not None:
+        target.add(spill_store)
+
+def _translate_control_flow(target, instr, allocations, webs, line_num):
+    """Emits a label, an unconditional jump (JMP) or a conditional jump (JNZ)."""
+    label = Operand(OperandType.LABEL, instr.label)
+    if instr.is_label():
+        target.add(AssemblyInstruction(Opcode.LABEL, label))
+    elif instr.is_conditional():
+        condition = make_operand(instr.src1, allocations, webs, line_num)
+        target.add(AssemblyInstruction(Opcode.JNZ, condition, label))
+    else:
+        target.add(AssemblyInstruction(Opcode.JMP, label))
+
+def _immediate_value(operand):
+    """Returns the integer value of an IMMEDIATE operand, or None for any other operand."""
+    if operand.type == OperandType.IMMEDIATE:
+        return int(operand.value)
+    return None
+
+def _same_operand(a, b):
+    """Returns True if both operands refer to the same value."""
+    return a.type == b.type and str(a.value) == str(b.value)
 
-def _store_live_on_exit(target, live_on_exit, allocations):
+def _immediate(value):
+    """Creates an IMMEDIATE operand from an integer."""
+    return Operand(OperandType.IMMEDIATE, str(value))
+
+def _move(src, dst_reg):
+    """Returns the MOV needed to get src into dst_reg, or nothing if it is already there."""
+    if _same_operand(src, dst_reg):
+        return []
+    return [AssemblyInstruction(Opcode.MOV, src, dst_reg)]
+
+def _fold_constants(op, a, b):
+    """Evaluates a binary operation on two literals, or returns None if it cannot be folded safely."""
+    if op == "+":
+        return a + b
+    if op == "-":
+        return a - b
+    if op == "*":
+        return a * b
+    # Only fold exact divisions so we never depend on a rounding convention
+    if op == "/" and b != 0 and a % b == 0:
+        return a // b
+    return None
+
+def _simplify_binary(op, src1, src2):
+    """
+    Applies algebraic identities to dst = src1 op src2.
+    Returns the single operand the result equals, or None if no identity applies.
+    """
+    a = _immediate_value(src1)
+    b = _immediate_value(src2)
+
+    if a is not None and b is not None:
+        folded = _fold_constants(op, a, b)
+        if folded is not None:
+            return _immediate(folded)
+
+    if op == "+":
+        if b == 0:
+            return src1
+        if a == 0:
+            return src2
+    elif op == "-":
+        if b == 0:
+            return src1
+        if _same_operand(src1, src2):
+            return _immediate(0)
+    elif op == "*":
+        if a == 0 or b == 0:
+            return _immediate(0)
+        if b == 1:
+            return src1
+        if a == 1:
+            return src2
+    elif op == "/":
+        if b == 1:
+            return src1
+    return None
+
+def _apply_op(opcode, left, right, dst_reg):
+    """
+    Returns the sequence dst = left <opcode> right, or None if the MOV of left would
+    overwrite right before it is read.
+    """
+    if _same_operand(right, dst_reg) and not _same_operand(left, dst_reg):
+        return None
+    return _move(left, dst_reg) + [AssemblyInstruction(opcode, right, dst_reg)]
+
+def _select_binary(op, src1, src2, dst_reg, cost_model, home=None):
+    """
+    Returns the cheapest instruction sequence for dst = src1 op src2 under the cost model.
+    home is the memory location of dst, used to park src2 when it is dst's own register.
+    """
+    simplified = _simplify_binary(op, src1, src2)
+    if simplified is not None:
+        return _move(simplified, dst_reg)
+
+    opcode = _OP_MAP[op]
+    candidates = [_apply_op(opcode, src1, src2, dst_reg)]
+    if op in _COMMUTATIVE:
+        candidates.append(_apply_op(opcode, src2, src1, dst_reg))
+    if op == "*":
+        # Strength reduction: x * 2 => x + x
+        if _immediate_value(src2) == 2:
+            candidates.append(_double(src1, dst_reg))
+        if _immediate_value(src1) == 2:
+            candidates.append(_double(src2, dst_reg))
+    if home is not None and not any(candidates):
+        candidates.append(_through_memory(opcode, src1, src2, dst_reg, home))
+
+    return _cheapest(candidates, cost_model)
+
+def _through_memory(opcode, left, right, dst_reg, home):
+    """
+    Returns dst = left <opcode> right for a right operand held in dst_reg itself, by first
+    storing it to home. Only used for code with jumps, where nothing reads a variable's
+    memory between the loads on entry and the stores on exit.
+    """
+    return [AssemblyInstruction(Opcode.MOV, right, home)] + _move(left, dst_reg) + \
+        [AssemblyInstruction(opcode, home, dst_reg)]
+
+def _double(src, dst_reg):
+    """Returns the sequence dst = src + src, reading the doubled value from dst itself."""
+    return _move(src, dst_reg) + [AssemblyInstruction(Opcode.ADD, dst_reg, dst_reg)]
+
+def _cheapest(candidates, cost_model):
+    """Returns the valid candidate sequence with the lowest cost."""
+    candidates = [c for c in candidates if c is not None]
+    if not candidates:
+        raise ValueError("No valid instruction sequence: source operand is overwritten by the destination")
+    return min(candidates, key=cost_model.sequence_cost)
+
+def _select_negation(src, dst_reg, cost_model):
+    """Returns the cheapest instruction sequence for dst = -src under the cost model."""
+    value = _immediate_value(src)
+    if value is not None:
+        return _move(_immediate(-value), dst_reg)
+
+    candidates = [
+        _apply_op(Opcode.SUB, _immediate(0), src, dst_reg),
+        _apply_op(Opcode.MUL, src, _immediate(-1), dst_reg),
+    ]
+    return _cheapest(candidates, cost_model)
+
+def _store_live_on_exit(target, live_on_exit, allocations, webs):
     """Emits MOV instructions to store live-on-exit variables back to memory."""
     for var in sorted(live_on_exit):
-        if var in allocations:
+        web = webs.exit.get(var)
+        if web in webs.constants:
+            target.add(AssemblyInstruction(
+                Opcode.MOV,
+                Operand(OperandType.IMMEDIATE, webs.constants[web]),
+                Operand(OperandType.VARIABLE, var)
+            ))
+        # Webs kept in memory were never modified, so there is nothing to store
+        elif web in allocations and web not in webs.in_memory:
             target.add(AssemblyInstruction(
                 Opcode.MOV,
-                Operand(OperandType.REGISTER, allocations[var]),
+                Operand(OperandType.REGISTER, allocations[web]),
                 Operand(OperandType.VARIABLE, var)
             ))
\ No newline at end of file
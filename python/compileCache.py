@@ -0,0 +1,190 @@
+# compileCache.py
+# Content-addressed disk cache of compiled blocks.
+#
+# Enabled with `python main.py --cache[=DIR] ...` or the TAC_CACHE environment variable
+# (TAC_CACHE=DIR). An entry is keyed on a hash of the normalized IntermediateCode text,
+# the register count, the allocator options and the compiler version, and stores the
+# register allocations, the generated assembly text and the report the compile printed,
+# so a hit skips liveness, colouring and codegen entirely and still prints the same output.
+#
+# Every entry is one JSON file written to a temporary file and renamed into place, so
+# several processes can share a cache directory without ever reading a partial entry.
+# Reading an entry refreshes its modification time, which is what LRU eviction sorts by.
+
+import hashlib
+import json
+import os
+import tempfile
+
+from envVars import CACHE_ENV_VAR
+
+DEFAULT_CACHE_DIR = ".tac_cache"
+
+# Total size of the entries kept before the least recently used ones are evicted
+DEFAULT_MAX_BYTES = 64 * 1024 * 1024
+
+_ENTRY_SUFFIX = ".json"
+
+_compiler_version = None
+
+
+def compiler_version():
+    """
+    Returns a hash of the compiler's own source files, so editing the compiler
+    invalidates every entry it produced.
+    """
+    global _compiler_version
+    if _compiler_version is None:
+        digest = hashlib.sha256()
+        source_dir = os.path.dirname(os.path.abspath(__file__))
+        for name in sorted(os.listdir(source_dir)):
+            if name.endswith(".py"):
+                digest.update(name.encode())
+                with open(os.path.join(source_dir, name), "rb") as f:
+                    digest.update(f.read())
+        _compiler_version = digest.hexdigest()[:16]
+    return _compiler_version
+
+
+def normalized_text(code):
+    """Returns a canonical text form of an IntermediateCode block (the order of live variables does not matter)."""
+    lines = [str(instr) for instr in code.instructions]
+    lines.append("live: " + ", ".join(sorted(code.live_on_exit)))
+    return "\n".join(lines)
+
+
+def cache_key(code, num_registers, options=None):
+    """
+    Hashes everything that determines the compiled output.
+
+    Args:
+        code: the IntermediateCode block
+        num_registers: registers available to the allocator
+        options: dict of allocator options that change the result (e.g. budget, segment)
+    """
+    payload = {
+        "code": normalized_text(code),
+        "registers": num_registers,
+        "options": options or {},
+        "version": compiler_version(),
+    }
+    return hashlib.sha256(json.dumps(payload, sort_keys=True).encode()).hexdigest()
+
+
+class CompileCache:
+    """
+    Directory of cached compilations with size-bounded LRU eviction.
+    - hits / misses / evictions: statistics of this process's lookups and stores
+    """
+    def __init__(self, directory=DEFAULT_CACHE_DIR, max_bytes=DEFAULT_MAX_BYTES):
+        self.directory = directory
+        self.max_bytes = max_bytes
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        os.makedirs(directory, exist_ok=True)
+
+    def _path(self, key):
+        return os.path.join(self.directory, key + _ENTRY_SUFFIX)
+
+    def get(self, key):
+        """
+        Returns the cached entry for a key, or None on a miss.
+        An entry is a dict with "allocations" (web -> register) and "assembly" (the .s text),
+        plus the extra values it was stored with (main.py keeps "listing" and "cost").
+        """
+        path = self._path(key)
+        try:
+            with open(path) as f:
+                entry = json.load(f)
+        except (OSError, ValueError):
+            # Missing, evicted by another process, or unreadable: all count as a miss
+            self.misses += 1
+            return None
+        try:
+            os.utime(path)
+        except OSError:
+            pass
+        self.hits += 1
+        return entry
+
+    def put(self, key, allocations, assembly, **extra):
+        """
+        Stores a compilation atomically, then evicts old entries if the cache is over its size.
+
+        Args:
+            allocations: dict of web -> register number
+            assembly: the generated assembly text
+            extra: any other JSON-serialisable values to keep with the entry
+        """
+        entry = dict(extra, allocations=allocations, assembly=assembly)
+        fd, tmp_path = tempfile.mkstemp(dir=self.directory, suffix=".tmp")
+        try:
+            with os.fdopen(fd, "w") as f:
+                json.dump(entry, f)
+            os.replace(tmp_path, self._path(key))
+        except BaseException:
+            if os.path.exists(tmp_path):
+                os.remove(tmp_path)
+            raise
+        self.evict()
+
+    def evict(self):
+        """Deletes the least recently used entries until the cache fits in max_bytes."""
+        entries = []
+        total = 0
+        for name in os.listdir(self.directory):
+            if not name.endswith(_ENTRY_SUFFIX):
+                continue
+            try:
+                stat = os.stat(os.path.join(self.directory, name))
+            except OSError:
+                continue
+            entries.append((stat.st_mtime, name, stat.st_size))
+            total += stat.st_size
+
+        entries.sort()
+        for _, name, size in entries:
+            if total <= self.max_bytes:
+                break
+            try:
+                os.remove(os.path.join(self.directory, name))
+                self.evictions += 1
+            except OSError:
+                # Another process removed it first
+                pass
+            total -= size
+        return total
+
+    def stats(self):
+        """Returns the hit/miss/eviction counts of this process."""
+        return {"hits": self.hits, "misses": self.misses, "evictions": self.evictions}
+
+    def __repr__(self):
+        return f"<CompileCache {self.directory}: {self.hits} hits, {self.misses} misses>"
+
+
+def cache_dir_from_env():
+    """Returns the cache directory named by TAC_CACHE, or None if caching is not requested."""
+    value = os.environ.get(CACHE_ENV_VAR, "").strip()
+    if not value or value.lower() in ("0", "off", "false"):
+        return None
+    if value.lower() in ("1", "on", "true"):
+        return DEFAULT_CACHE_DIR
+    return value
+
+
+if __name__ == "__main__":
+    from threeAddress import IntermediateCode, ThreeAddressInstruction
+
+    code = IntermediateCode()
+    code.add_instruction(ThreeAddressInstruction("a", "a", "+", "1"))
+    code.set_live_on_exit(["a"])
+
+    with tempfile.TemporaryDirectory() as tmp:
+        cache = CompileCache(tmp)
+        key = cache_key(code, 2)
+        print("first lookup:", cache.get(key))
+        cache.put(key, {"a": 0}, "MOV a,R0\nADD #1,R0\nMOV R0,a")
+        print("second lookup:", cache.get(key))
+        print(cache.stats())
@@ -0,0 +1,76 @@
+# costModel.py
+# Static cycle-cost estimates for target instructions
+
+from assemblyInstructions import Opcode, OperandType
+
+# Cycles to execute each opcode with register operands
+DEFAULT_OPCODE_COSTS = {
+    Opcode.MOV: 1,
+    Opcode.ADD: 1,
+    Opcode.SUB: 1,
+    Opcode.MUL: 3,
+    Opcode.DIV: 10,
+    Opcode.JMP: 1,
+    Opcode.JNZ: 2,
+    Opcode.LABEL: 0,
+}
+
+# Extra cycles for each operand, depending on where its value lives
+DEFAULT_OPERAND_COSTS = {
+    OperandType.IMMEDIATE: 0,
+    OperandType.REGISTER: 0,
+    OperandType.VARIABLE: 2,   # memory access
+    OperandType.LABEL: 0,
+}
+
+
+class CostModel:
+    """
+    A configurable cycle-cost table used by instruction selection and for reporting.
+    The cost of an instruction is its opcode cost plus the cost of each operand.
+    """
+    def __init__(self, opcode_costs=None, operand_costs=None):
+        """
+        Args:
+            opcode_costs: dict of Opcode -> cycles, overriding the defaults
+            operand_costs: dict of OperandType -> extra cycles, overriding the defaults
+        """
+        self.opcode_costs = dict(DEFAULT_OPCODE_COSTS)
+        self.operand_costs = dict(DEFAULT_OPERAND_COSTS)
+        if opcode_costs:
+            self.opcode_costs.update(opcode_costs)
+        if operand_costs:
+            self.operand_costs.update(operand_costs)
+
+    def instruction_cost(self, instr):
+        """Returns the cycle cost of a single AssemblyInstruction."""
+        cost = self.opcode_costs[instr.opcode]
+        for operand in (instr.src, instr.dst):
+            if operand is not None:
+                cost += self.operand_costs[operand.type]
+        return cost
+
+    def sequence_cost(self, instructions):
+        """Returns the total cycle cost of a list of AssemblyInstructions."""
+        return sum(self.instruction_cost(instr) for instr in instructions)
+
+    def estimate(self, target):
+        """Returns the static cycle estimate for a whole TargetCode."""
+        return self.sequence_cost(target.instructions)
+
+    def __repr__(self):
+        opcodes = ", ".join(f"{op.value}={c}" for op, c in self.opcode_costs.items())
+        return f"<CostModel {opcodes}>"
+
+
+if __name__ == "__main__":
+    from assemblyInstructions import TargetCode, AssemblyInstruction, Operand
+
+    prog = TargetCode()
+    prog.add(AssemblyInstruction(Opcode.MOV, Operand(OperandType.VARIABLE, "a"), Operand(OperandType.REGISTER, 0)))
+    prog.add(AssemblyInstruction(Opcode.MUL, Operand(OperandType.IMMEDIATE, "4"), Operand(OperandType.REGISTER, 0)))
+    prog.add(AssemblyInstruction(Opcode.MOV, Operand(OperandType.REGISTER, 0), Operand(OperandType.VARIABLE, "a")))
+    print(prog)
+
+    print(f"Default model: {CostModel().estimate(prog)} cycles")
+    print(f"Cheap multiply: {CostModel(opcode_costs={Opcode.MUL: 1}).estimate(prog)} cycles")
@@ -0,0 +1,10 @@
+# envVars.py
+# Names of the environment variables the compiler reads. They live apart from the modules
+# that act on them, so main.py can check whether a feature is requested without importing
+# (and paying the start-up cost of) the module behind it.
+
+# Directory of the compilation cache (see compileCache.py)
+CACHE_ENV_VAR = "TAC_CACHE"
+
+# Profile format, text or json (see profiler.py)
+PROFILE_ENV_VAR = "TAC_PROFILE"
@@ -0,0 +1,323 @@
+# fuzz.py
+# Differential fuzzing of the whole compiler with the vectorized simulator.
+#
+# Usage:
+#   python fuzz.py [--blocks 200] [--size 60] [--vectors 2000] [--modes default spill ...] [--seed 0]
+#                  [--parse-blocks 40] [--graph-blocks 100]
+#
+# Every random block (tacGenerator.generate_tac) is compiled in each mode and the
+# resulting TargetCode is run against the TAC on many input vectors at once
+# (simulator.compare). The first mismatch of each mode is printed with the block that
+# caused it, so it can be saved as a regression test.
+# The parallel parser is checked the same way: random blocks, some with an invalid line,
+# are written to a file cut into tiny chunks, and chunkedParser must return the same code
+# and print the same errors as the serial parser. The NumPy interference build must give
+# the same edges as the pure-Python one.
+
+import argparse
+import contextlib
+import io
+import os
+import random
+import sys
+import tempfile
+
+from tacGenerator import generate_tac, write_tac
+from parser import read_3_addr_instruction, read_intermediate_code
+from chunkedParser import read_intermediate_code_parallel
+from parserHelper import parse_live_line
+from threeAddress import IntermediateCode, ThreeAddressInstruction
+from liveness import LivenessAnalyzer
+from interference import InterferenceGraph, STATUS_UNDECIDED, _load_numpy
+from segments import SegmentedAllocation
+from incremental import IncrementalCompiler
+from portfolio import allocate_portfolio
+from codegen import generate_target_code
+from peephole import peephole_optimize
+from simulator import compare
+
+
+def _analyze(code, **options):
+    analyzer = LivenessAnalyzer(code, **options)
+    analyzer.analyze()
+    return analyzer
+
+
+def _codegen(code, allocations, analyzer, peephole=True):
+    target = generate_target_code(code, allocations, analyzer.live_at_entry, analyzer.web_map)
+    if peephole:
+        peephole_optimize(target)
+    return target
+
+
+def _compile_default(code, num_regs, peephole=True, **options):
+    """Pipeline as main.py runs it on a short block (spilling if the search gives up)."""
+    analyzer = _analyze(code, **options)
+    graph = InterferenceGraph(analyzer)
+    if not graph.allocate_registers(num_regs, time_budget=0.5):
+        if graph.status != STATUS_UNDECIDED:
+            return None
+        graph.allocate_with_spills(num_regs)
+        analyzer.web_map.spill(graph.spilled, graph.scratch_register)
+    return _codegen(code, graph.allocations, analyzer, peephole)
+
+
+def _compile_greedy(code, num_regs):
+    """Greedy colouring only: the search is given no nodes at all."""
+    analyzer = _analyze(code)
+    graph = InterferenceGraph(analyzer)
+    if not graph.allocate_registers(num_regs, node_budget=0):
+        return None
+    return _codegen(code, graph.allocations, analyzer)
+
+
+def _compile_spill(code, num_regs):
+    """Spilling allocator with too few registers, so some webs live in memory."""
+    analyzer = _analyze(code)
+    graph = InterferenceGraph(analyzer)
+    graph.allocate_with_spills(max(2, num_regs // 2))
+    analyzer.web_map.spill(graph.spilled, graph.scratch_register)
+    return _codegen(code, graph.allocations, analyzer)
+
+
+def _compile_segmented(code, num_regs):
+    """Short segments, so many values are moved across segment boundaries."""
+    analyzer = _analyze(code)
+    segmented = SegmentedAllocation(analyzer, segment_length=8)
+    if not segmented.allocate_registers(num_regs, time_budget=0.5, workers=1):
+        return None
+    analyzer.web_map = segmented.web_map
+    return _codegen(code, segmented.allocations, analyzer)
+
+
+def _compile_portfolio(code, num_regs):
+    """Every colouring strategy raced in worker processes, spilling if they all give up."""
+    analyzer = _analyze(code)
+    graph = InterferenceGraph(analyzer)
+    if not allocate_portfolio(graph, num_regs, time_budget=0.5):
+        if graph.status != STATUS_UNDECIDED:
+            return None
+        graph.allocate_with_spills(num_regs)
+        analyzer.web_map.spill(graph.spilled, graph.scratch_register)
+    return _codegen(code, graph.allocations, analyzer)
+
+
+def _edited(code, rng):
+    """Returns a copy of a block with one instruction deleted, inserted or given a new operand."""
+    instructions = list(code.instructions)
+    line = rng.randrange(len(instructions))
+    edit = rng.choice(("delete", "insert", "operand"))
+    # Deleting the only definition of a live-on-exit variable would make the block invalid
+    if edit == "delete" and len(instructions) > 1 and instructions[line].dst not in code.live_on_exit:
+        del instructions[line]
+    elif edit == "insert":
+        instr = instructions[line]
+        instructions.insert(line, ThreeAddressInstruction(instr.dst, instr.src1, "+", str(rng.randint(1, 100))))
+    else:
+        instr = instructions[line]
+        instructions[line] = ThreeAddressInstruction(instr.dst, instr.src1, "*", str(rng.randint(1, 100)))
+    edited = IntermediateCode()
+    for instr in instructions:
+        edited.add_instruction(instr)
+    edited.set_live_on_exit(list(code.live_on_exit))
+    return edited
+
+
+def _compile_incremental(code, num_regs):
+    """
+    Compiles an edited copy of the block, then the block itself with the same
+    IncrementalCompiler, so the checked code is the incremental recompile.
+    """
+    compiler = IncrementalCompiler(num_regs, time_budget=0.5)
+    # Seeded by the block, so a reported mismatch replays with the same edit
+    compiler.compile(_edited(code, random.Random(repr(code))))
+    success, graph, analyzer = compiler.compile(code)
+    if not success:
+        return None
+    return _codegen(code, graph.allocations, analyzer)
+
+
+# Mode name -> function(code, num_regs) returning TargetCode, or None if allocation failed
+FUZZ_MODES = {
+    "default": _compile_default,
+    "no-peephole": lambda code, n: _compile_default(code, n, peephole=False),
+    "plain": lambda code, n: _compile_default(code, n, memory_operands=False, rematerialize=False),
+    "greedy": _compile_greedy,
+    "spill": _compile_spill,
+    "segmented": _compile_segmented,
+    "incremental": _compile_incremental,
+    "portfolio": _compile_portfolio,
+}
+
+
+def code_from_lines(lines):
+    """Parses generated TAC lines (the last one is the live: line) into IntermediateCode."""
+    code = IntermediateCode()
+    for line_num, line in enumerate(lines[:-1], start=1):
+        code.add_instruction(read_3_addr_instruction(line, line_num))
+    code.set_live_on_exit(parse_live_line(lines[-1], len(lines)))
+    return code
+
+
+def fuzz(modes, blocks, size, vectors, seed, registers=None):
+    """
+    Compiles `blocks` random blocks in every mode and checks each against the TAC.
+
+    Returns:
+        dict of mode -> {"checked", "skipped", "mismatch"} where mismatch is the first
+        (Mismatch, TAC lines) found, or None
+    """
+    rng = random.Random(seed)
+    results = {mode: {"checked": 0, "skipped": 0, "mismatch": None} for mode in modes}
+    for block in range(blocks):
+        pressure = rng.randint(1, 6)
+        num_vars = rng.randint(1, 10)
+        lines = generate_tac(rng.randint(1, size), num_vars, rng.random(), pressure, seed=rng.randrange(1 << 30))
+        code = code_from_lines(lines)
+        num_regs = registers or rng.randint(2, pressure + num_vars + 2)
+        for mode in modes:
+            record = results[mode]
+            if record["mismatch"] is not None:
+                continue
+            target = FUZZ_MODES[mode](code, num_regs)
+            if target is None:
+                record["skipped"] += 1
+                continue
+            record["checked"] += 1
+            mismatch = compare(code, target, count=vectors, seed=block)
+            if mismatch is not None:
+                record["mismatch"] = (mismatch, lines, num_regs)
+    return results
+
+
+# Lines the serial parser rejects, planted in blocks to check the parallel parser's errors
+INVALID_LINES = ("1x = a + b", "a = b % c", "a = b +", "goto nowhere", "a =")
+
+# Chunk size for the parse check: a few lines per chunk, so every block is cut into several
+PARSE_CHUNK_BYTES = 64
+
+
+def _parse_both(path, workers):
+    """Parses a file serially and in parallel, returning (code, stderr) for each."""
+    outputs = []
+    for parse in (read_intermediate_code,
+                  lambda path: read_intermediate_code_parallel(path, workers, chunk_bytes=PARSE_CHUNK_BYTES)):
+        errors = io.StringIO()
+        with contextlib.redirect_stderr(errors):
+            code = parse(path)
+        outputs.append((repr(code) if code is not None else None, errors.getvalue()))
+    return outputs
+
+
+def fuzz_parser(blocks, size, seed, workers=2):
+    """
+    Parses `blocks` random blocks with both parsers. Most get an invalid line somewhere
+    in their second half, so the error usually lands in a later chunk.
+
+    Returns:
+        {"checked", "errors", "mismatch"} where mismatch is the first
+        (serial output, parallel output, TAC lines) that differ, or None
+    """
+    rng = random.Random(seed)
+    record = {"checked": 0, "errors": 0, "mismatch": None}
+    with tempfile.TemporaryDirectory() as tmp:
+        path = os.path.join(tmp, "block.txt")
+        for block in range(blocks):
+            num_lines = rng.randint(size // 2, size)
+            lines = generate_tac(num_lines, rng.randint(1, 10), rng.random(), rng.randint(1, 6),
+                                 seed=rng.randrange(1 << 30))
+            if rng.random() < 0.75:
+                lines[rng.randint(num_lines // 2, num_lines - 1)] = rng.choice(INVALID_LINES)
+            write_tac(path, lines)
+            serial, parallel = _parse_both(path, workers)
+            record["checked"] += 1
+            if serial[0] is None:
+                record["errors"] += 1
+            if serial != parallel:
+                record["mismatch"] = (serial, parallel, lines)
+                break
+    return record
+
+
+def fuzz_interference(blocks, size, seed):
+    """
+    Builds the interference graph of `blocks` random blocks with and without NumPy.
+
+    Returns:
+        {"checked", "mismatch"} where mismatch is the first (TAC lines, webs whose edges
+        differ) found, or None
+    """
+    rng = random.Random(seed)
+    record = {"checked": 0, "mismatch": None}
+    for block in range(blocks):
+        lines = generate_tac(rng.randint(1, size), rng.randint(1, 10), rng.random(), rng.randint(1, 6),
+                             seed=rng.randrange(1 << 30))
+        analyzer = _analyze(code_from_lines(lines))
+        scalar = InterferenceGraph(analyzer, vectorized=False).adj_list
+        vector = InterferenceGraph(analyzer, vectorized=True).adj_list
+        record["checked"] += 1
+        if scalar != vector:
+            differing = sorted(web for web in scalar.keys() | vector.keys() if scalar.get(web) != vector.get(web))
+            record["mismatch"] = (lines, differing)
+            break
+    return record
+
+
+def main():
+    arg_parser = argparse.ArgumentParser(description="Differentially fuzz the compiler against the TAC.")
+    arg_parser.add_argument("--blocks", type=int, default=200, help="random blocks to compile")
+    arg_parser.add_argument("--size", type=int, default=60, help="maximum instructions per block")
+    arg_parser.add_argument("--vectors", type=int, default=2000, help="input vectors per block")
+    arg_parser.add_argument("--registers", type=int, default=None, help="register count (default: random)")
+    arg_parser.add_argument("--modes", nargs="+", choices=sorted(FUZZ_MODES), default=list(FUZZ_MODES))
+    arg_parser.add_argument("--parse-blocks", type=int, default=40,
+                            help="random blocks for the parallel parser check (0 to skip it)")
+    arg_parser.add_argument("--graph-blocks", type=int, default=100,
+                            help="random blocks for the NumPy interference check (0 to skip it)")
+    arg_parser.add_argument("--seed", type=int, default=0)
+    args = arg_parser.parse_args()
+
+    results = fuzz(args.modes, args.blocks, args.size, args.vectors, args.seed, args.registers)
+
+    failed = False
+    for mode, record in results.items():
+        status = "ok" if record["mismatch"] is None else "MISMATCH"
+        print(f"{mode:>12}: {record['checked']} checked, {record['skipped']} not allocatable  {status}")
+        if record["mismatch"] is not None:
+            failed = True
+            mismatch, lines, num_regs = record["mismatch"]
+            print(f"    {mismatch} with {num_regs} registers on:")
+            for line in lines:
+                print(f"      {line}")
+
+    if args.parse_blocks > 0:
+        record = fuzz_parser(args.parse_blocks, args.size, args.seed)
+        status = "ok" if record["mismatch"] is None else "MISMATCH"
+        print(f"{'parse':>12}: {record['checked']} checked, {record['errors']} invalid  {status}")
+        if record["mismatch"] is not None:
+            failed = True
+            serial, parallel, lines = record["mismatch"]
+            print(f"    serial parser: {serial!r}")
+            print(f"    parallel parser: {parallel!r}")
+            print("    on:")
+            for line in lines:
+                print(f"      {line}")
+
+    if args.graph_blocks > 0 and _load_numpy() is None:
+        print(f"{'vectorized':>12}: skipped, NumPy is not installed")
+    elif args.graph_blocks > 0:
+        # Blocks several times the usual size, so the graphs have many edges
+        record = fuzz_interference(args.graph_blocks, args.size * 4, args.seed)
+        status = "ok" if record["mismatch"] is None else "MISMATCH"
+        print(f"{'vectorized':>12}: {record['checked']} checked  {status}")
+        if record["mismatch"] is not None:
+            failed = True
+            lines, differing = record["mismatch"]
+            print(f"    edges differ for {', '.join(differing)} on:")
+            for line in lines:
+                print(f"      {line}")
+    return 1 if failed else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
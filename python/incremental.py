@@ -0,0 +1,184 @@
+# incremental.py
+# Recompiles an edited block by redoing only the work its edit affects.
+#
+# The new instruction list is diffed against the previous one (common prefix and suffix).
+# Liveness is rescanned backward from the edited region only until the live sets match
+# again (LivenessAnalyzer.reanalyze). Webs whose live range is unchanged keep their
+# interference edges and their register; only the edges of changed webs are recomputed
+# and only those webs are coloured, around the registers the unchanged webs already hold.
+# If that partial colouring fails, the whole graph is coloured again from scratch.
+
+from liveness import LivenessAnalyzer
+from interference import (InterferenceGraph, SearchBudget, _backtracking_search,
+                          STATUS_COLOURED, STATUS_HEURISTIC, STATUS_UNDECIDED)
+
+
+def common_prefix_suffix(old, new):
+    """
+    Returns (prefix, suffix): the number of leading and trailing instructions two blocks
+    share. The two never overlap, so prefix + suffix <= min(len(old), len(new)).
+    """
+    limit = min(len(old), len(new))
+    prefix = 0
+    while prefix < limit and str(old[prefix]) == str(new[prefix]):
+        prefix += 1
+    suffix = 0
+    while suffix < limit - prefix and str(old[-1 - suffix]) == str(new[-1 - suffix]):
+        suffix += 1
+    return prefix, suffix
+
+
+def _span_key(ranges, shift):
+    """Returns the variable and the (start, end) lines of a web's ranges, moved by shift lines."""
+    return (ranges[0].var_name,) + tuple((r.start_line + shift, r.end_line + shift) for r in ranges)
+
+
+class IncrementalCompiler:
+    """
+    Keeps the analysis, graph and colouring of the last block it compiled and reuses
+    them for the next one. Blocks are always allocated as a single graph (no segments).
+    - mode: "full" or "incremental", how the last compile was done
+    - rescanned: (first, last) lines whose liveness was recomputed
+    - recoloured: number of webs that were coloured again
+    """
+    def __init__(self, num_registers, time_budget=None):
+        self.num_registers = num_registers
+        self.time_budget = time_budget
+        self.analyzer = None
+        self.graph = None
+        self.mode = None
+        self.rescanned = None
+        self.recoloured = 0
+
+    def compile(self, code):
+        """
+        Analyses and allocates a block, incrementally when a previous block can be reused.
+        When the search runs out of budget without an answer, spills like main.py does.
+
+        Returns:
+            (success, graph, analyzer)
+        """
+        previous = self.analyzer
+        previous_graph = self.graph
+        # Spilled allocations reserve a scratch register, so they are never reused
+        reusable = previous_graph is not None and previous_graph.status in (STATUS_COLOURED, STATUS_HEURISTIC)
+        # Webs of code with jumps span several ranges, which the range matching below does not handle
+        reusable = reusable and not code.has_control_flow() and not previous.code.has_control_flow()
+
+        analyzer = LivenessAnalyzer(code)
+        if reusable:
+            prefix, suffix = common_prefix_suffix(previous.code.instructions, code.instructions)
+            analyzer.reanalyze(previous, prefix, suffix)
+            graph, kept = self._update_graph(previous, previous_graph, analyzer)
+            self.mode = "incremental"
+            self.rescanned = analyzer.rescanned
+            success = self._recolour(graph, kept, previous_graph)
+        else:
+            analyzer.analyze()
+            graph = InterferenceGraph(analyzer)
+            self.mode = "full"
+            self.rescanned = (1, len(code.instructions))
+            self.recoloured = len(graph.variables)
+            success = self._colour_all(graph)
+
+        if graph.status == STATUS_UNDECIDED:
+            graph.allocate_with_spills(self.num_registers)
+            analyzer.web_map.spill(graph.spilled, graph.scratch_register)
+            success = True
+
+        self.analyzer = analyzer if success else None
+        self.graph = graph if success else None
+        return success, graph, analyzer
+
+    def _update_graph(self, previous, previous_graph, analyzer):
+        """
+        Builds the new interference graph from the previous one.
+        A web is kept when a web of the previous block has the same variable and the same
+        live ranges once the edit's line shift is applied; kept webs keep their edges.
+
+        Returns:
+            (graph, kept) where kept maps each kept new web to its previous web
+        """
+        first, last = analyzer.rescanned
+        old_count = len(previous.code.instructions)
+        shift = len(analyzer.code.instructions) - old_count
+        # Old lines after this one are the unchanged suffix
+        old_edit_end = last - shift
+
+        old_by_range = {}
+        for web, ranges in previous_graph.ranges.items():
+            # A web with an in-place update has one range per definition, in line order
+            if ranges[-1].end_line <= first:
+                old_by_range[_span_key(ranges, 0)] = web
+            elif ranges[0].start_line > old_edit_end:
+                old_by_range[_span_key(ranges, shift)] = web
+
+        kept = {}
+        for web, ranges in analyzer.webs.items():
+            old_web = old_by_range.get(_span_key(ranges, 0))
+            if old_web is not None:
+                kept[web] = old_web
+
+        old_to_new = {old: new for new, old in kept.items()}
+        edges = {web: set() for web in analyzer.webs}
+        for web, old_web in kept.items():
+            for neighbor in previous_graph.adj_list[old_web]:
+                if neighbor in old_to_new:
+                    edges[web].add(old_to_new[neighbor])
+
+        # Changed webs are checked only against the webs the range index finds overlapping them
+        index = analyzer.range_index()
+        for web, ranges in analyzer.webs.items():
+            if web in kept:
+                continue
+            for r in ranges:
+                for other in index.overlapping(r.start_line, r.end_line):
+                    if other != web:
+                        edges[web].add(other)
+                        edges[other].add(web)
+
+        return InterferenceGraph(analyzer, edges=edges), kept
+
+    def _recolour(self, graph, kept, previous_graph):
+        """
+        Gives kept webs their previous register and colours only the changed webs around
+        them, falling back to colouring the whole graph if that fails.
+        """
+        graph.allocations = {web: previous_graph.allocations[old] for web, old in kept.items()}
+        changed = [web for web in graph.variables if web not in kept]
+        changed.sort(key=lambda web: graph.ranges[web][0].start_line)
+        budget = SearchBudget(self.time_budget)
+        result = _backtracking_search(changed, graph.adj_list, self.num_registers, budget, graph.allocations)
+        graph.nodes_visited = budget.nodes_visited
+        graph.backtracks = budget.backtracks
+        if result:
+            graph.status = previous_graph.status
+            self.recoloured = len(changed)
+            return True
+
+        # The kept registers boxed the changed webs in: start over on the whole graph
+        self.recoloured = len(graph.variables)
+        return self._colour_all(graph)
+
+    def _colour_all(self, graph):
+        return graph.allocate_registers(self.num_registers, time_budget=self.time_budget)
+
+
+if __name__ == "__main__":
+    from threeAddress import IntermediateCode, ThreeAddressInstruction
+
+    def block(multiplier):
+        code = IntermediateCode()
+        code.add_instruction(ThreeAddressInstruction("t1", "a", "+", "b"))
+        code.add_instruction(ThreeAddressInstruction("t2", "t1", "*", multiplier))
+        code.add_instruction(ThreeAddressInstruction("d", "t2", "-", "a"))
+        code.set_live_on_exit(["d"])
+        return code
+
+    compiler = IncrementalCompiler(4)
+    compiler.compile(block("c"))
+    print(f"{compiler.mode}: {compiler.graph.allocations}")
+
+    compiler.compile(block("4"))
+    print(f"{compiler.mode}: rescanned lines {compiler.rescanned}, "
+          f"recoloured {compiler.recoloured} webs: {compiler.graph.allocations}")
@@ -1,6 +1,8 @@
 # liveness.py
 # Week 4: Liveness Analysis Logic
 
+from collections import deque
+
 from threeAddress import IntermediateCode, ThreeAddressInstruction
 
 class LiveRange:
@@ -13,6 +15,8 @@ class LiveRange:
         self.var_name = var_name
         self.start_line = start_line 
         self.end_line = end_line      
+        # Name of the web (allocation node) this range belongs to
+        self.web = var_name
         
     def overlaps_with(self, other):
         """
@@ -31,18 +35,127 @@ class LiveRange:
     def __str__(self):
         return self.__repr__()
 
+class WebMap:
+    """
+    Maps every occurrence of a variable in the block to the web that holds its value.
+    A web is one def-use chain of a variable, so a variable that is redefined
+    for an unrelated value gets a separate web (and possibly a separate register).
+    """
+    def __init__(self):
+        # line number -> web defined on that line
+        self.defs = {}
+        # (line number, variable) -> web read on that line
+        self.uses = {}
+        # variable -> web holding its value on block entry
+        self.entry = {}
+        # variable -> web holding its value on block exit
+        self.exit = {}
+        # line number -> [(variable, web)] to load from memory just before that line
+        self.loads = {}
+        # webs that are read straight from memory and never get a register
+        self.in_memory = set()
+        # web -> integer literal it always holds; uses become immediates instead of a register
+        self.constants = {}
+        # register reserved for computing values of spilled webs before they are stored
+        self.scratch_register = None
+        # line number -> [(variable, from web, to web)] moved between registers just before that line
+        self.transfers = {}
+
+    def def_web(self, line_num):
+        """Returns the web defined on a line, or None for a dead definition."""
+        return self.defs.get(line_num)
+
+    def use_web(self, line_num, var):
+        """Returns the web a variable is read from on a line."""
+        return self.uses[(line_num, var)]
+
+    def spill(self, webs, scratch_register):
+        """
+        Keeps the given webs in memory (in their variable's own location): uses read
+        them as VARIABLE operands and definitions are computed in the scratch register
+        and stored straight away.
+        """
+        self.in_memory.update(webs)
+        self.scratch_register = scratch_register
+
+    @classmethod
+    def by_name(cls, code, live_on_entry):
+        """Builds a map where every web is simply named after its variable."""
+        webs = cls()
+        for var in live_on_entry:
+            webs.entry[var] = var
+        if live_on_entry:
+            webs.loads[1] = [(var, var) for var in sorted(live_on_entry)]
+        for line_num, instr in enumerate(code.instructions, start=1):
+            for var in instr.get_used_variables():
+                webs.uses[(line_num, var)] = var
+            defined_var = instr.get_defined_variable()
+            if defined_var:
+                webs.defs[line_num] = defined_var
+        for var in code.live_on_exit:
+            webs.exit[var] = var
+        return webs
+
+
+def _ranges_live_after(ranges, live_vars, line_num, num_instr):
+    """
+    Picks, for each variable live just after a line, the live range holding its value there.
+
+    Args:
+        ranges: list of (variable, start, end)
+        live_vars: the variables live after line_num
+        num_instr: number of instructions in the block the ranges come from
+
+    Returns:
+        dict of variable -> (start, end)
+    """
+    found = {}
+    for var, start, end in ranges:
+        if var not in live_vars or start > line_num:
+            continue
+        # Live after the line when it is read on a later line or live on exit; a range
+        # that ends where the next one starts (a = a + 1) loses to the later one
+        if end - 1 > line_num or end == num_instr + 1:
+            if var not in found or start > found[var][0]:
+                found[var] = (start, end)
+    return found
+
+
 class LivenessAnalyzer:
-    def __init__(self, code):
+    def __init__(self, code, memory_operands=True, rematerialize=True):
+        """
+        Args:
+            code: the IntermediateCode block to analyze
+            memory_operands: when True, live-on-entry values are loaded lazily at their
+                first use, and values used only once are read straight from memory
+            rematerialize: when True, webs that only ever hold an integer literal are
+                left out of register allocation and recreated as immediates at each use
+        Both options apply to straight-line blocks only; code with labels and jumps gets
+        one web per variable, loaded on entry and kept in its register throughout.
+        """
         self.code = code
+        self.memory_operands = memory_operands
+        self.rematerialize = rematerialize
         self.liveness_results = []
         self.live_at_entry = set()
         self.live_ranges = {} 
         self.dead_definitions = []
+        # web name -> list of LiveRange objects making up that web
+        self.webs = {}
+        self.web_map = WebMap()
+        # ControlFlowGraph of the code, when it has labels and jumps
+        self.cfg = None
+        # LiveRangeIndex over self.webs, built by range_index() on first use
+        self._range_index = None
 
     def analyze(self):
         """
         Coordinates the backward scan to determine live ranges.
         """
+        self._range_index = None
+        if self.code.has_control_flow():
+            return self._analyze_cfg()
+
         num_instr = len(self.code.instructions)
         var_range_ends = {var: num_instr + 1 for var in self.code.live_on_exit}
         current_live_vars = set(self.code.live_on_exit)
@@ -61,6 +174,216 @@ class LivenessAnalyzer:
         self._finalize_analysis(current_live_vars, var_range_ends, results)
         return results
 
+    def range_index(self):
+        """
+        Returns the LiveRangeIndex over the webs, for point, range and pressure queries.
+        It is built on the first call after analyze() and shared by every later caller.
+        """
+        if self._range_index is None:
+            from rangeIndex import LiveRangeIndex
+            self._range_index = LiveRangeIndex(self.webs, len(self.code.instructions))
+        return self._range_index
+
+    def reanalyze(self, previous, prefix, suffix):
+        """
+        Incremental version of analyze() for a block that differs from an already analyzed
+        one only between its first `prefix` and last `suffix` instructions.
+        The backward scan restarts just below the unchanged suffix (taking its state from
+        the previous analysis) and stops in the unchanged prefix as soon as the live set
+        matches the previous one again; every other live range is reused or shifted.
+
+        Args:
+            previous: LivenessAnalyzer of the earlier version of the block, already analyzed
+            prefix: number of leading instructions identical in both versions
+            suffix: number of trailing instructions identical in both versions
+
+        Returns:
+            The liveness results, as analyze() does. self.rescanned holds the (first, last)
+            lines that were scanned again.
+        """
+        self._range_index = None
+        old_count = len(previous.code.instructions)
+        num_instr = len(self.code.instructions)
+        if (set(self.code.live_on_exit) != set(previous.code.live_on_exit)
+                or prefix + suffix > min(old_count, num_instr)):
+            self.rescanned = (1, num_instr)
+            return self.analyze()
+
+        shift = num_instr - old_count
+        old_ranges = previous._unmoved_ranges()
+        old_edit_end = old_count - suffix
+
+        # Scanner state just below the unchanged suffix, taken from the previous analysis
+        current_live_vars = set(previous._live_out(old_edit_end))
+        crossing = _ranges_live_after(old_ranges, current_live_vars, old_edit_end, old_count)
+        var_range_ends = {var: end + shift for var, (start, end) in crossing.items()}
+
+        self.live_ranges = {}
+        self.dead_definitions = []
+        scanned = []
+        converged_at = None
+        for line_num in range(num_instr - suffix, 0, -1):
+            scanned.append(current_live_vars.copy())
+            instr = self.code.instructions[line_num - 1]
+            self._process_instruction_def(instr, line_num, current_live_vars, var_range_ends)
+            self._process_instruction_uses(instr, line_num, current_live_vars, var_range_ends)
+            if line_num - 1 <= prefix and current_live_vars == previous._live_out(line_num - 1):
+                converged_at = line_num - 1
+                break
+        scanned.reverse()
+
+        reached_top = converged_at is None
+        if reached_top:
+            # The change reached the top of the block: entry ranges come from the new scan
+            converged_at = 0
+            for var in current_live_vars:
+                self._add_live_range(var, 0, var_range_ends[var])
+            self.live_at_entry = current_live_vars
+        else:
+            self.live_at_entry = set(previous.live_at_entry)
+
+        crossing = {} if reached_top else _ranges_live_after(
+            old_ranges, current_live_vars, converged_at, old_count)
+        for var, start, end in old_ranges:
+            if start > old_edit_end:
+                self._add_live_range(var, start + shift, end + shift)
+            elif start > converged_at or reached_top:
+                # Replaced by the ranges of the new scan
+                continue
+            elif crossing.get(var) == (start, end):
+                # Still live where the scan stopped: same start, end found by the new scan
+                self._add_live_range(var, start, var_range_ends[var])
+            else:
+                self._add_live_range(var, start, end)
+
+        for line_num, var in previous.dead_definitions:
+            if line_num <= converged_at:
+                self.dead_definitions.append((line_num, var))
+            elif line_num > old_edit_end:
+                self.dead_definitions.append((line_num + shift, var))
+
+        results = (previous.liveness_results[:converged_at] + scanned
+                   + previous.liveness_results[old_edit_end:])
+        self.liveness_results = results
+        self.rescanned = (converged_at + 1, num_instr - suffix)
+        self._build_webs()
+        return results
+
+    def _live_out(self, line_num):
+        """Returns the set of variables live just after a line (line 0 means block entry)."""
+        if line_num == 0:
+            return self.live_at_entry
+        return self.liveness_results[line_num - 1]
+
+    def _unmoved_ranges(self):
+        """
+        Returns every live range as (variable, start, end) as the backward scan created it,
+        i.e. with entry ranges starting at line 0 even where their load was moved later.
+        """
+        ranges = []
+        for var, var_ranges in self.live_ranges.items():
+            for k, r in enumerate(var_ranges):
+                # Ranges are sorted by start, so an entry range is always the first one
+                start = 0 if k == 0 and var in self.live_at_entry else r.start_line
+                ranges.append((var, start, r.end_line))
+        return ranges
+
+    def _analyze_cfg(self):
+        """
+        Liveness for code with several basic blocks. Block-level live sets are found by a
+        worklist dataflow over per-block gen/kill bitsets, so the fixed point costs work per
+        block rather than per line. One backward scan of each block then turns them into
+        live ranges: a variable's ranges in all blocks together form its single web.
+        """
+        from cfg import ControlFlowGraph
+        cfg = ControlFlowGraph(self.code)
+        self.cfg = cfg
+        exit_bits = cfg.bits_of(self.code.live_on_exit)
+        for block in cfg.blocks:
+            self._block_gen_kill(cfg, block)
+
+        # Backward dataflow: live_in = gen | (live_out & ~kill), iterated to a fixed point
+        worklist = deque(reversed(cfg.blocks))
+        queued = set(range(len(cfg.blocks)))
+        while worklist:
+            block = worklist.popleft()
+            queued.discard(block.index)
+            live_out = exit_bits if block.falls_to_exit else 0
+            for succ in block.successors:
+                live_out |= cfg.blocks[succ].live_in
+            block.live_out = live_out
+            live_in = block.gen | (live_out & ~block.kill)
+            if live_in != block.live_in:
+                block.live_in = live_in
+                for pred in block.predecessors:
+                    if pred not in queued:
+                        queued.add(pred)
+                        worklist.append(cfg.blocks[pred])
+
+        results = [None] * len(self.code.instructions)
+        for block in cfg.blocks:
+            self._scan_block(cfg, block, results)
+        self.live_at_entry = cfg.variables_of(cfg.blocks[0].live_in) if cfg.blocks else set()
+        self.liveness_results = results
+        self._build_variable_webs(results)
+        return results
+
+    def _block_gen_kill(self, cfg, block):
+        """Computes the variables a block reads before writing (gen) and the ones it writes (kill)."""
+        gen = 0
+        kill = 0
+        for line_num in range(block.last_line, block.first_line - 1, -1):
+            instr = self.code.instructions[line_num - 1]
+            defined_var = instr.get_defined_variable()
+            if defined_var:
+                bit = 1 << cfg.bit[defined_var]
+                kill |= bit
+                gen &= ~bit
+            for var in instr.get_used_variables():
+                gen |= 1 << cfg.bit[var]
+        block.gen = gen
+        block.kill = kill
+
+    def _scan_block(self, cfg, block, results):
+        """
+        Backward scan of one block starting from its live-out set, recording live ranges.
+        Values live into the block get a range from its first line (line 0 for the entry block).
+        """
+        current_live_vars = cfg.variables_of(block.live_out)
+        var_range_ends = {var: block.last_line + 1 for var in current_live_vars}
+        for line_num in range(block.last_line, block.first_line - 1, -1):
+            results[line_num - 1] = current_live_vars.copy()
+            instr = self.code.instructions[line_num - 1]
+            self._process_instruction_def(instr, line_num, current_live_vars, var_range_ends)
+            self._process_instruction_uses(instr, line_num, current_live_vars, var_range_ends)
+        start = 0 if block.index == 0 else block.first_line
+        for var in current_live_vars:
+            self._add_live_range(var, start, var_range_ends[var])
+
+    def _build_variable_webs(self, results):
+        """Makes every variable one web holding all of its live ranges, named after the variable."""
+        self.webs = {}
+        web_map = WebMap()
+        for var, ranges in self.live_ranges.items():
+            ranges.sort(key=lambda r: r.start_line)
+            self.webs[var] = ranges
+        for var in self.live_at_entry:
+            web_map.entry[var] = var
+        if self.live_at_entry:
+            web_map.loads[1] = [(var, var) for var in sorted(self.live_at_entry)]
+        for line_num, instr in enumerate(self.code.instructions, start=1):
+            for var in instr.get_used_variables():
+                web_map.uses[(line_num, var)] = var
+            defined_var = instr.get_defined_variable()
+            # A definition nobody reads gets no register, so it is not emitted at all
+            if defined_var and defined_var in results[line_num - 1]:
+                web_map.defs[line_num] = defined_var
+        # When no path leaves the function, live-on-exit variables have no ranges and no stores
+        for var in self.code.live_on_exit:
+            if var in self.webs:
+                web_map.exit[var] = var
+        self.web_map = web_map
+
     def _process_instruction_def(self, instr, line_num, current_live, range_ends):
         """
         Handles the variable being defined (left side of the equals).
@@ -97,6 +420,141 @@ class LivenessAnalyzer:
             
         self.live_at_entry = current_live
         self.liveness_results = results
+        self._build_webs()
+
+    def _build_webs(self):
+        """
+        Splits each variable into webs, one per live range except that in-place updates
+        stay in the web they update (see _chain_in_place_updates), and records which
+        web every use and definition in the block refers to.
+        """
+        self.webs = {}
+        def_webs = {}
+        entry_webs = {}
+        for var, ranges in self.live_ranges.items():
+            ranges.sort(key=lambda r: r.start_line)
+            groups = self._chain_in_place_updates(var, ranges)
+            for k, group in enumerate(groups, start=1):
+                web = var if len(groups) == 1 else f"{var}.{k}"
+                self.webs[web] = group
+                for live_range in group:
+                    live_range.web = web
+                    if live_range.start_line == 0:
+                        entry_webs[var] = web
+                    else:
+                        def_webs[(var, live_range.start_line)] = web
+
+        # Forward pass: a use reads the web most recently opened for its variable
+        web_map = WebMap()
+        web_map.entry = dict(entry_webs)
+        open_webs = dict(entry_webs)
+        for line_num, instr in enumerate(self.code.instructions, start=1):
+            for var in instr.get_used_variables():
+                web_map.uses[(line_num, var)] = open_webs[var]
+            defined_var = instr.get_defined_variable()
+            if not defined_var:
+                continue
+            web = def_webs.get((defined_var, line_num))
+            if web:
+                web_map.defs[line_num] = web
+                open_webs[defined_var] = web
+            else:
+                open_webs.pop(defined_var, None)
+        for var in self.code.live_on_exit:
+            web_map.exit[var] = open_webs[var]
+        self.web_map = web_map
+        if self.rematerialize:
+            self._find_constant_webs()
+        self._place_entry_loads(entry_webs)
+
+    def _chain_in_place_updates(self, var, ranges):
+        """
+        Groups a variable's ranges (sorted by start line) into webs. A range defined by an
+        in-place update that reads var as its first operand (x = x op y, x = -x) joins the
+        web of the range it reads, which dies on that line: the two-address update runs in
+        that web's register, so splitting them would only add a register and a move.
+
+        Returns:
+            List of webs, each a list of LiveRange sorted by start line
+        """
+        groups = []
+        # end line -> group of the range ending there
+        ending = {}
+        for live_range in ranges:
+            group = None
+            if live_range.start_line > 0:
+                instr = self.code.instructions[live_range.start_line - 1]
+                if instr.src1 == var:
+                    # The range holding var on the update line ends just after it
+                    group = ending.get(live_range.start_line + 1)
+            if group is None:
+                group = []
+                groups.append(group)
+            group.append(live_range)
+            ending[live_range.end_line] = group
+        return groups
+
+    def _find_constant_webs(self):
+        """
+        Marks webs defined from an integer literal (a = 5, a = -5), or copied from
+        such a web, as rematerializable and removes them from register allocation.
+        """
+        web_map = self.web_map
+        def_counts = {}
+        for web in web_map.defs.values():
+            def_counts[web] = def_counts.get(web, 0) + 1
+        for line_num, instr in enumerate(self.code.instructions, start=1):
+            web = web_map.def_web(line_num)
+            # A web also defined by an in-place update does not always hold the literal
+            if web is None or instr.is_binary() or def_counts[web] > 1:
+                continue
+            value = self._literal_value(instr.src1, line_num)
+            if value is None:
+                continue
+            if instr.is_unary_negation():
+                value = -value
+            web_map.constants[web] = str(value)
+            del self.webs[web]
+
+    def _literal_value(self, operand, line_num):
+        """Returns the integer an operand always holds on a line, or None if it is not constant."""
+        try:
+            return int(operand)
+        except ValueError:
+            pass
+        web = self.web_map.uses.get((line_num, operand))
+        if web in self.web_map.constants:
+            return int(self.web_map.constants[web])
+        return None
+
+    def _place_entry_loads(self, entry_webs):
+        """
+        Decides where each live-on-entry web is loaded from memory.
+        Without memory operands every entry web is loaded before line 1. Otherwise a
+        web used once and never redefined stays in memory (its instruction reads it as a
+        VARIABLE operand), and any other web is loaded just before its first use, which
+        shortens its range.
+        """
+        web_map = self.web_map
+        if not self.memory_operands:
+            if entry_webs:
+                web_map.loads[1] = sorted(entry_webs.items())
+            return
+
+        uses_by_web = {}
+        for (line_num, var), web in web_map.uses.items():
+            uses_by_web.setdefault(web, []).append(line_num)
+
+        for var, web in sorted(entry_webs.items()):
+            use_lines = uses_by_web.get(web, [])
+            # An in-place update (x = x op y) adds a range: its result needs a register
+            if len(use_lines) == 1 and len(self.webs[web]) == 1:
+                web_map.in_memory.add(web)
+                del self.webs[web]
+            else:
+                first_use = min(use_lines)
+                self.webs[web][0].start_line = first_use
+                web_map.loads.setdefault(first_use, []).append((var, web))
 
     def _add_live_range(self, var_name, start, end):
         """Helper to create and store a LiveRange object."""
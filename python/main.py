@@ -1,41 +1,126 @@
 # main.py
+# Only the modules every run needs are imported here. Each compiler stage is imported by
+# the function that first uses it, so argument errors exit before any stage is loaded
+# and options that are not used (caching, segments, the portfolio, --watch) cost nothing.
 import sys
 import os
-from parser import read_intermediate_code
-from liveness import LivenessAnalyzer
-from interference import InterferenceGraph
-from codegen import generate_target_code
+import time
+from profiler import PROFILER, PROFILE_FORMATS, profile_format_from_env
+from envVars import CACHE_ENV_VAR
+
+USAGE = ("Usage: python main.py [--profile[=text|json]] [--budget=SECONDS] [--segment[=LINES]] "
+         "[--cache[=DIR]] [--watch] [--no-validate] [--portfolio[=STRATEGY,...]] [--parallel-parse[=WORKERS]] "
+         "<num_registers> <input_file>")
+
+# Wall-clock seconds the exhaustive colouring search may take before falling back
+DEFAULT_TIME_BUDGET = 2.0
+
+KNOWN_OPTIONS = {"profile", "budget", "segment", "cache", "watch", "no-validate", "portfolio", "parallel-parse"}
+
+# Seconds between checks of the input file in --watch mode
+WATCH_INTERVAL = 0.5
 
 def main():
     """Runs the full compiler pipeline from input validation to assembly output."""
-    num_regs, input_file, intermediate_code = handle_input()
+    try:
+        run_pipeline()
+    finally:
+        finish_profile()
+
+def run_pipeline():
+    """Compiles the input file named on the command line and exits with the pipeline's status."""
+    num_regs, input_file, intermediate_code, options = handle_input()
     
     is_valid, error_msg = intermediate_code.validate_live_on_exit()
     if not is_valid:
         print(f"Error: {error_msg}", file=sys.stderr)
         sys.exit(1)
-    
-    graph, analyzer = create_interference_table(intermediate_code, num_regs)
+
+    if "watch" in options:
+        watch_file(num_regs, input_file, intermediate_code, options)
+        sys.exit(0)
+
+    cache, key = open_cache(options, intermediate_code, num_regs)
+    if cache is None:
+        compile_and_report(intermediate_code, num_regs, options, input_file)
+        sys.exit(0)
+
+    with PROFILER.stage("cache lookup"):
+        entry = cache.get(key)
+    PROFILER.count("cache hits" if entry is not None else "cache misses")
+    if entry is not None:
+        print_cached_compilation(entry, input_file)
+        sys.exit(0)
+
+    # A hit replays the report this compile prints, so keep a copy of it
+    recorder = StdoutRecorder()
+    try:
+        graph, target, cost_model = compile_and_report(intermediate_code, num_regs, options)
+    finally:
+        listing = recorder.stop()
+    with PROFILER.stage("write"):
+        write_to_assembly_file(target, input_file)
+        cache.put(key, graph.allocations, repr(target), listing=listing, cost=cost_model.estimate(target))
+        PROFILER.count("cache evictions", cache.evictions)
+    sys.exit(0)
+
+def compile_and_report(intermediate_code, num_regs, options, input_file=None):
+    """
+    Allocates registers and generates code for a block, printing the interference table,
+    colouring table, assembly and cost estimate. Writes the .s file if input_file is given.
+
+    Returns:
+        (graph, target, cost_model)
+    """
+    from codegen import generate_target_code
+    from costModel import CostModel
+    from peephole import peephole_optimize
+
+    graph, analyzer = create_interference_table(intermediate_code, num_regs, options["budget"],
+                                                options["segment"], "no-validate" not in options,
+                                                options["portfolio"])
 
     build_colouring_table(graph)
 
     live_on_entry = build_live_on_entry(analyzer)
 
-    target = generate_target_code(intermediate_code, graph.allocations, live_on_entry)
+    cost_model = CostModel()
+
+    with PROFILER.stage("codegen"):
+        target = generate_target_code(intermediate_code, graph.allocations, live_on_entry, analyzer.web_map, cost_model)
+
+    with PROFILER.stage("peephole"):
+        peephole_hits = peephole_optimize(target)
+    if PROFILER.enabled:
+        PROFILER.count("peephole rewrites", sum(peephole_hits.values()))
+        PROFILER.count("instructions emitted", len(target.instructions))
 
     print_target_code(target)
 
-    write_to_assembly_file(target, input_file)
-    sys.exit(0)
+    print_peephole_report(peephole_hits)
+
+    print_cost_estimate(target, cost_model)
+
+    if input_file is not None:
+        with PROFILER.stage("write"):
+            write_to_assembly_file(target, input_file)
+    return graph, target, cost_model
 
 def handle_input(): 
     """Validates and parses command-line arguments, returning the register count, input filename, and parsed intermediate code."""
-    if len(sys.argv) != 3:
-        print("Usage: python main.py <num_registers> <input_file>", file=sys.stderr)
+    options, args = split_options(sys.argv[1:])
+    if options is None or len(args) != 2:
+        print(USAGE, file=sys.stderr)
         sys.exit(1)
 
+    configure_profiler(options)
+    options["budget"] = parse_budget(options)
+    options["segment"] = parse_segment_length(options)
+    options["portfolio"] = parse_portfolio(options)
+    options["parallel-parse"] = parse_parse_workers(options)
+
     try:
-        num_regs = int(sys.argv[1])
+        num_regs = int(args[0])
         if num_regs < 1:
             print("Error: Argument one must be an integer greater than zero.", file=sys.stderr)
             sys.exit(1)
@@ -43,44 +128,403 @@ def handle_input():
         print("Error: Argument one must be an integer.", file=sys.stderr)
         sys.exit(1)
 
-    input_file = sys.argv[2]
+    input_file = args[1]
     if not os.path.isfile(input_file):
         print(f"Error: File '{input_file}' is not a readable file.", file=sys.stderr)
         sys.exit(1)
 
-    intermediate_code = read_intermediate_code(input_file)
+    with PROFILER.stage("parse"):
+        intermediate_code = read_input(input_file, options["parallel-parse"])
     if intermediate_code is None:
         sys.exit(1)
+    PROFILER.count("instructions parsed", len(intermediate_code.instructions))
+
+    return num_regs, input_file, intermediate_code, options
+
+def split_options(argv):
+    """
+    Separates --name[=value] options from positional arguments.
+    Returns (options, positional), or (None, None) if an option is not recognised.
+    """
+    options = {}
+    positional = []
+    for arg in argv:
+        if not arg.startswith("--"):
+            positional.append(arg)
+            continue
+        name, _, value = arg[2:].partition("=")
+        if name not in KNOWN_OPTIONS:
+            return None, None
+        options[name] = value or None
+    return options, positional
+
+def configure_profiler(options):
+    """Enables the profiler if --profile was given or TAC_PROFILE is set."""
+    if "profile" in options:
+        fmt = options["profile"] or "text"
+    else:
+        fmt = profile_format_from_env()
+    if fmt is None:
+        return 0
+    if fmt not in PROFILE_FORMATS:
+        print(f"Error: Unknown profile format '{fmt}'.", file=sys.stderr)
+        sys.exit(1)
+    PROFILER.enable(fmt)
+    return 0
+
+def parse_budget(options):
+    """Returns the allocation time budget in seconds from --budget, or the default."""
+    value = options.get("budget")
+    if value is None:
+        return DEFAULT_TIME_BUDGET
+    try:
+        budget = float(value)
+    except ValueError:
+        budget = -1
+    if budget <= 0:
+        print("Error: --budget must be a positive number of seconds.", file=sys.stderr)
+        sys.exit(1)
+    return budget
+
+def parse_segment_length(options):
+    """
+    Returns the segment length requested by --segment[=LINES], or None to let the
+    block length decide whether to segment.
+    """
+    if "segment" not in options:
+        return None
+    value = options["segment"]
+    if value is None:
+        from segments import DEFAULT_SEGMENT_LENGTH
+        return DEFAULT_SEGMENT_LENGTH
+    try:
+        length = int(value)
+    except ValueError:
+        length = 0
+    if length < 1:
+        print("Error: --segment must be a positive number of lines.", file=sys.stderr)
+        sys.exit(1)
+    return length
+
+def parse_portfolio(options):
+    """
+    Returns the colouring strategies to race from --portfolio[=STRATEGY,...], or None
+    when the portfolio is not used.
+    """
+    if "portfolio" not in options:
+        return None
+    from portfolio import STRATEGIES, DEFAULT_STRATEGIES
+    value = options["portfolio"]
+    if value is None:
+        return list(DEFAULT_STRATEGIES)
+    strategies = [name.strip() for name in value.split(",")]
+    for name in strategies:
+        if name not in STRATEGIES:
+            print(f"Error: Unknown colouring strategy '{name}' (choose from {', '.join(STRATEGIES)}).",
+                  file=sys.stderr)
+            sys.exit(1)
+    return strategies
+
+def parse_parse_workers(options):
+    """
+    Returns the worker count requested by --parallel-parse[=WORKERS] (0 for one per CPU),
+    or None to let the file size decide whether to parse in parallel.
+    """
+    if "parallel-parse" not in options:
+        return None
+    value = options["parallel-parse"]
+    if value is None:
+        return 0
+    try:
+        workers = int(value)
+    except ValueError:
+        workers = 0
+    if workers < 1:
+        print("Error: --parallel-parse must be a positive number of workers.", file=sys.stderr)
+        sys.exit(1)
+    return workers
+
+def read_input(input_file, workers=None):
+    """
+    Parses the input file. Files of PARALLEL_PARSE_THRESHOLD bytes or more (or any with
+    --parallel-parse) are split into chunks parsed by worker processes (see chunkedParser.py).
+    """
+    from parser import read_intermediate_code, PARALLEL_PARSE_THRESHOLD
+    if workers is None and (os.cpu_count() or 1) > 1 and os.path.getsize(input_file) >= PARALLEL_PARSE_THRESHOLD:
+        workers = 0
+    if workers is None:
+        return read_intermediate_code(input_file)
+    from chunkedParser import read_intermediate_code_parallel
+    workers = workers or os.cpu_count() or 1
+    PROFILER.count("parse workers", workers)
+    return read_intermediate_code_parallel(input_file, workers)
+
+def open_cache(options, code, num_regs):
+    """
+    Opens the compilation cache named by --cache[=DIR] or TAC_CACHE.
+    Returns (cache, key) for this block, or (None, None) if caching is off.
+    """
+    if "cache" not in options and not os.environ.get(CACHE_ENV_VAR):
+        # Caching is off: don't load hashlib and tempfile
+        return None, None
+    from compileCache import CompileCache, DEFAULT_CACHE_DIR, cache_key, cache_dir_from_env
+    if "cache" in options:
+        directory = options["cache"] or DEFAULT_CACHE_DIR
+    else:
+        directory = cache_dir_from_env()
+    if directory is None:
+        return None, None
+    try:
+        cache = CompileCache(directory)
+    except OSError as e:
+        print(f"Error: cannot use cache directory '{directory}': {e}", file=sys.stderr)
+        sys.exit(1)
+    key = cache_key(code, num_regs, {"budget": options["budget"], "segment": options["segment"],
+                                     "portfolio": options["portfolio"]})
+    return cache, key
+
+class StdoutRecorder:
+    """Keeps a copy of everything printed to stdout from its creation until stop()."""
+    def __init__(self):
+        self.stream = sys.stdout
+        self.parts = []
+        sys.stdout = self
+
+    def write(self, text):
+        self.parts.append(text)
+        return self.stream.write(text)
 
-    return num_regs, input_file, intermediate_code
+    def flush(self):
+        self.stream.flush()
 
-def create_interference_table(code, num_regs): 
-    """Runs liveness analysis, builds the interference graph, and attempts register allocation."""
+    def stop(self):
+        """Restores stdout and returns the text printed while recording."""
+        sys.stdout = self.stream
+        return "".join(self.parts)
+
+def print_cached_compilation(entry, input_file):
+    """
+    Prints and writes a compilation found in the cache. The report printed by the compile
+    that stored the entry is replayed, so the output is the same as a fresh compile's.
+    """
+    sys.stdout.write(entry["listing"])
+    with PROFILER.stage("write"):
+        output_file = assembly_output_path(input_file)
+        with open(output_file, "w") as f:
+            f.write(entry["assembly"] + "\n")
+    print(f"\nAssembly written to: {output_file}")
+    return 0
+
+def finish_profile():
+    """Prints the profile report to stderr if profiling was enabled for this run."""
+    if PROFILER.enabled:
+        PROFILER.print_report()
+        PROFILER.disable()
+    return 0
+
+def create_interference_table(code, num_regs, time_budget=DEFAULT_TIME_BUDGET, segment_length=None,
+                              validate=True, portfolio=None): 
+    """
+    Runs liveness analysis, builds the interference graph, and attempts register allocation.
+    Very long straight-line blocks (or any with --segment) are split into segments that
+    are allocated independently. Otherwise, a list of strategy names in portfolio races
+    those colouring strategies against each other (see portfolio.py). If the colouring
+    search runs out of budget without an answer, falls back to spilling on the whole block.
+    Unless validate is False, the finished allocation is checked before any code is
+    generated from it.
+    """
+    from liveness import LivenessAnalyzer
+    from interference import InterferenceGraph, STATUS_UNDECIDED
+    from segments import SegmentedAllocation, DEFAULT_SEGMENT_LENGTH, SEGMENT_THRESHOLD
     analyzer = LivenessAnalyzer(code)
     
-    analyzer.analyze()
-    
-    graph = InterferenceGraph(analyzer)
+    with PROFILER.stage("liveness"):
+        analyzer.analyze()
+
+    if segment_length is None and len(code.instructions) >= SEGMENT_THRESHOLD:
+        segment_length = DEFAULT_SEGMENT_LENGTH
+    if code.has_control_flow():
+        # Segments are cut by line number, which only works for straight-line code
+        segment_length = None
+
+    graph = None
+    if segment_length is not None:
+        with PROFILER.stage("allocation"):
+            segmented = SegmentedAllocation(analyzer, segment_length)
+            success = segmented.allocate_registers(num_regs, time_budget=time_budget)
+        if segmented.status != STATUS_UNDECIDED:
+            graph = segmented
+            # Codegen must read the per-segment pieces and the moves between them
+            analyzer.web_map = segmented.web_map
+        PROFILER.count("segments", len(segmented.segments))
+        PROFILER.count("boundary moves", segmented.num_transfers())
 
-    success = graph.allocate_registers(num_regs)
+    if graph is None:
+        with PROFILER.stage("interference"):
+            graph = InterferenceGraph(analyzer)
+
+        with PROFILER.stage("allocation"):
+            if portfolio:
+                from portfolio import allocate_portfolio
+                success = allocate_portfolio(graph, num_regs, portfolio, time_budget)
+                print_portfolio_winner(graph, portfolio)
+            else:
+                success = graph.allocate_registers(num_regs, time_budget=time_budget)
+            if graph.status == STATUS_UNDECIDED:
+                graph.allocate_with_spills(num_regs)
+                analyzer.web_map.spill(graph.spilled, graph.scratch_register)
+                success = True
+        if PROFILER.enabled:
+            PROFILER.count("components", len(graph.connected_components()))
+
+    if PROFILER.enabled:
+        PROFILER.count("live ranges created", sum(len(r) for r in analyzer.live_ranges.values()))
+        PROFILER.count("webs allocated", len(graph.variables))
+        PROFILER.count("edges added", graph.num_edges())
+        PROFILER.count("solver nodes visited", graph.nodes_visited)
+        PROFILER.count("backtracks", graph.backtracks)
+        PROFILER.count("webs spilled", len(graph.spilled))
+        PROFILER.count("peak pressure", analyzer.range_index().peak_pressure()[0])
     if not success:
         print(f"Register allocation failed: {num_regs} register(s) are not sufficient to colour the interference graph.")
+        print(f"  Uncolourable component: {', '.join(graph.failed_component)}")
+        print_pressure_note(analyzer, num_regs)
         sys.exit(1) 
 
+    if validate:
+        check_allocation(graph, analyzer, num_regs)
+
     print_interference_table(graph) 
 
+    print_allocation_notes(graph, num_regs)
+
     return graph, analyzer
 
+def watch_file(num_regs, input_file, code, options):
+    """
+    Recompiles input_file every time it changes until interrupted with Ctrl+C.
+    Each compile reuses the liveness, interference edges and registers of the previous
+    one wherever the edit left them unchanged (see incremental.py).
+    """
+    from incremental import IncrementalCompiler
+    from parser import read_intermediate_code
+    compiler = IncrementalCompiler(num_regs, options["budget"])
+    last_modified = os.stat(input_file).st_mtime_ns
+    print(f"Watching '{input_file}' for changes (Ctrl+C to stop).")
+    try:
+        while True:
+            if code is not None:
+                compile_incrementally(compiler, code, input_file)
+                code = None
+            time.sleep(WATCH_INTERVAL)
+            try:
+                modified = os.stat(input_file).st_mtime_ns
+            except OSError:
+                # The file is being replaced by an editor; look again next time
+                continue
+            if modified != last_modified:
+                last_modified = modified
+                # Parse errors are reported by the parser; keep watching for a fix
+                code = read_intermediate_code(input_file)
+    except KeyboardInterrupt:
+        print("\nStopped watching.")
+    return 0
+
+def compile_incrementally(compiler, code, input_file):
+    """Compiles one version of a watched file and writes its assembly, reporting errors without exiting."""
+    from validator import validate_allocation
+    from codegen import generate_target_code
+    from costModel import CostModel
+    from peephole import peephole_optimize
+    is_valid, error_msg = code.validate_live_on_exit()
+    if not is_valid:
+        print(f"Error: {error_msg}", file=sys.stderr)
+        return 1
+
+    with PROFILER.stage("allocation"):
+        success, graph, analyzer = compiler.compile(code)
+    first, last = compiler.rescanned
+    print(f"\nRecompiled ({compiler.mode}): liveness rescanned on lines {first}-{last}, "
+          f"{compiler.recoloured} of {len(graph.variables)} web(s) coloured")
+    if not success:
+        print(f"Register allocation failed: {compiler.num_registers} register(s) are not sufficient to colour the interference graph.")
+        print(f"  Uncolourable component: {', '.join(graph.failed_component)}")
+        print_pressure_note(analyzer, compiler.num_registers)
+        return 1
+
+    is_valid, error_msg = validate_allocation(graph.ranges, graph.allocations, analyzer.web_map,
+                                              len(code.instructions), compiler.num_registers)
+    if not is_valid:
+        print(f"Error: invalid register allocation: {error_msg}", file=sys.stderr)
+        return 1
+
+    print_allocation_notes(graph, compiler.num_registers)
+    build_colouring_table(graph)
+
+    cost_model = CostModel()
+    with PROFILER.stage("codegen"):
+        target = generate_target_code(code, graph.allocations, build_live_on_entry(analyzer),
+                                      analyzer.web_map, cost_model)
+    with PROFILER.stage("peephole"):
+        peephole_optimize(target)
+
+    print_target_code(target)
+    print_cost_estimate(target, cost_model)
+    write_to_assembly_file(target, input_file)
+    return 0
+
+def check_allocation(graph, analyzer, num_regs): 
+    """Exits with an error if the allocation lets two live webs share a register or leaves a used web without one."""
+    from validator import validate_allocation
+    with PROFILER.stage("validate"):
+        is_valid, error_msg = validate_allocation(graph.ranges, graph.allocations, analyzer.web_map,
+                                                  len(analyzer.code.instructions), num_regs)
+    if not is_valid:
+        print(f"Error: invalid register allocation: {error_msg}", file=sys.stderr)
+        sys.exit(1)
+    return 0
+
 def print_interference_table(graph): 
     """Prints the variable interference table to stdout."""
     graph.print_graph()
     return 0
 
+def print_pressure_note(analyzer, num_regs): 
+    """Points at the line where more webs are live at once than there are registers, if there is one."""
+    peak, line_num = analyzer.range_index().peak_pressure()
+    if peak > num_regs:
+        print(f"  Peak pressure: {peak} webs are live on line {line_num}, so at least {peak} registers are needed")
+    return 0
+
+def print_portfolio_winner(graph, strategies): 
+    """Logs which raced colouring strategy decided the allocation, for tuning the defaults."""
+    if graph.strategy is None:
+        print(f"\nPortfolio: none of {len(strategies)} strategies decided within the budget")
+    else:
+        print(f"\nPortfolio: '{graph.strategy}' decided the allocation "
+              f"(strategies raced: {len(strategies)}, search nodes: {graph.nodes_visited})")
+        PROFILER.count(f"portfolio wins ({graph.strategy})")
+    return 0
+
+def print_allocation_notes(graph, num_regs): 
+    """Explains how the allocation was reached when the exhaustive search ran out of budget."""
+    from interference import STATUS_HEURISTIC, STATUS_SPILLED
+    if graph.status == STATUS_HEURISTIC:
+        print("\nNote: colouring search ran out of budget; using the greedy colouring, which fits.")
+    elif graph.status == STATUS_SPILLED:
+        print(f"\nNote: colouring search ran out of budget and {num_regs} register(s) did not fit greedily.")
+        print(f"  Spilled to memory: {', '.join(graph.spilled) or '(none)'} (scratch register R{graph.scratch_register})")
+    return 0
+
 def build_colouring_table(graph): 
-    """Groups variables by their assigned register and prints the colouring table."""
+    """Groups webs by their assigned register and prints the colouring table."""
+    allocations = {var: graph.allocations[var] for var in graph.variables if var in graph.allocations}
+    return build_colouring_table_from(allocations)
+
+def build_colouring_table_from(allocations): 
+    """Groups the webs of an allocation dict by register and prints the colouring table."""
     reg_to_vars = {}
-    for var in graph.variables:
-        reg = graph.allocations[var]
+    for var, reg in allocations.items():
         if reg not in reg_to_vars:
             reg_to_vars[reg] = []
         reg_to_vars[reg].append(var)
@@ -98,25 +542,39 @@ def print_colouring_table(reg_to_vars):
 
 def build_live_on_entry(analyzer): 
     """Returns the set of variables live at line 0, meaning they were used before being defined in this block."""
-    live_on_entry = {
-        var for var, ranges in analyzer.live_ranges.items()
-        if any(r.start_line == 0 for r in ranges)
-    }
+    live_on_entry = set(analyzer.live_at_entry)
     return live_on_entry
 
 def write_to_assembly_file(target, input_file): 
     """Writes the generated assembly instructions to a .s file derived from the input filename."""
-    base, _ = os.path.splitext(input_file)
-    output_file = base + ".s"
+    output_file = assembly_output_path(input_file)
     target.write_to_file(output_file)
     print(f"\nAssembly written to: {output_file}")
     return 0
 
+def assembly_output_path(input_file): 
+    """Returns the .s filename derived from the input filename."""
+    base, _ = os.path.splitext(input_file)
+    return base + ".s"
+
 def print_target_code(target): 
     """Prints the generated assembly instructions to stdout."""
     print(f"\n-----Assembly-Instructions------")
     print(target)
     return 0
 
+def print_peephole_report(hits): 
+    """Prints how many times each peephole rule fired, if any did."""
+    applied = {name: count for name, count in hits.items() if count}
+    if not applied:
+        return 0
+    print("\nPeephole rewrites: " + ", ".join(f"{name} x{count}" for name, count in applied.items()))
+    return 0
+
+def print_cost_estimate(target, cost_model): 
+    """Prints the static cycle-cost estimate of the generated assembly."""
+    print(f"\nEstimated cost: {cost_model.estimate(target)} cycles ({len(target.instructions)} instructions)")
+    return 0
+
 if __name__ == "__main__":
     main()
\ No newline at end of file
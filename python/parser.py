@@ -1,8 +1,12 @@
 # parser.py
 
 import sys
-from threeAddress import ThreeAddressInstruction, IntermediateCode
-from parserHelper import parse_live_line, is_valid_variable, is_valid_operand
+from threeAddress import ThreeAddressInstruction, LabelInstruction, JumpInstruction, IntermediateCode
+from parserHelper import parse_live_line, is_valid_variable, is_valid_operand, is_valid_label
+
+# Files at least this many bytes are parsed in parallel chunks (chunkedParser.py) by main.py.
+# It lives here so main.py can decide without importing chunkedParser.
+PARALLEL_PARSE_THRESHOLD = 16 * 1024 * 1024
 
 def read_intermediate_code(filename):
     """Reads and parses input file into an IntermediateCode object."""
@@ -33,82 +37,114 @@ def read_intermediate_code(filename):
         return None  
     
     code.set_live_on_exit(live_vars)
+
+    is_valid, error_msg = code.validate_labels()
+    if not is_valid:
+        print(f"Error: {error_msg}", file=sys.stderr)
+        return None
     return code
 
 def read_3_addr_instruction(line, line_num):
-    """Main router for parsing a single line of TAC."""
+    """Main router for parsing a single line of TAC. Prints the error and returns None if the line is invalid."""
+    instr, error_msg = parse_instruction(line)
+    if instr is None:
+        print(f"Error on line {line_num}: {error_msg}", file=sys.stderr)
+    return instr
+
+def parse_instruction(line):
+    """
+    Parses and validates a single line of TAC without printing anything, so worker
+    processes (see chunkedParser.py) can report the error with its line number later.
+
+    Returns:
+        (instruction, None) on success, (None, error_message) on error
+    """
     line = line.strip()
     if not line:
-        print(f"Error on line {line_num}: Empty line", file=sys.stderr)
-        return None
+        return None, "Empty line"
     
     tokens = line.split()
+    if tokens[0].endswith(':') or tokens[0] in ('goto', 'if'):
+        return _parse_control_flow(tokens)
+
     if not (3 <= len(tokens) <= 5):
-        print(f"Error on line {line_num}: Invalid token count", file=sys.stderr)
-        return None
+        return None, "Invalid token count"
     
     # Validate destination and equals sign
     if not is_valid_variable(tokens[0]):
-        print(f"Error on line {line_num}: Invalid destination '{tokens[0]}'", file=sys.stderr)
-        return None
+        return None, f"Invalid destination '{tokens[0]}'"
     if tokens[1] != '=':
-        print(f"Error on line {line_num}: Missing '=' sign", file=sys.stderr)
-        return None
+        return None, "Missing '=' sign"
+
+    return _parse_by_token_count(tokens)
+
+def _parse_control_flow(tokens):
+    """Parses a label (L:), an unconditional jump (goto L) or a conditional jump (if x goto L)."""
+    if len(tokens) == 1 and tokens[0].endswith(':'):
+        label = tokens[0][:-1]
+        if not is_valid_label(label):
+            return None, f"Invalid label '{label}'"
+        return LabelInstruction(label), None
 
-    return _parse_by_token_count(tokens, line_num)
+    if tokens[0] == 'goto' and len(tokens) == 2:
+        label, condition = tokens[1], None
+    elif tokens[0] == 'if' and len(tokens) == 4 and tokens[2] == 'goto':
+        label, condition = tokens[3], tokens[1]
+        if not is_valid_operand(condition):
+            return None, f"Invalid operand '{condition}'"
+    else:
+        return None, "Malformed jump or label"
 
-def _parse_by_token_count(tokens, line_num):
+    if not is_valid_label(label):
+        return None, f"Invalid label '{label}'"
+    return JumpInstruction(label, condition), None
+
+def _parse_by_token_count(tokens):
     """Helper to delegate parsing based on the number of tokens."""
     dst = tokens[0]
     
     if len(tokens) == 3:
         # Case 1: dst = src
-        return _create_assignment(dst, tokens[2], line_num)
+        return _create_assignment(dst, tokens[2])
     
     elif len(tokens) == 4:
         # Case 2: dst = -src
-        return _create_unary(dst, tokens[2], tokens[3], line_num)
+        return _create_unary(dst, tokens[2], tokens[3])
     
     elif len(tokens) == 5:
         # Case 3: dst = src1 op src2
-        return _create_binary(dst, tokens[2], tokens[3], tokens[4], line_num)
+        return _create_binary(dst, tokens[2], tokens[3], tokens[4])
     
-    return None
+    return None, "Invalid token count"
 
-def _create_assignment(dst, src, line_num):
+def _create_assignment(dst, src):
     """Creates a simple assignment or compact unary negation instruction (3-token case)."""
     # Check for compact unary negation: dst = -src
     if src.startswith('-') and len(src) > 1:
         operand = src[1:]
         if not is_valid_operand(operand):
-            print(f"Error on line {line_num}: Invalid operand '{operand}'", file=sys.stderr)
-            return None
-        return ThreeAddressInstruction(dst, operand, '-', None)
+            return None, f"Invalid operand '{operand}'"
+        return ThreeAddressInstruction(dst, operand, '-', None), None
     
     if not is_valid_operand(src):
-        print(f"Error on line {line_num}: Invalid operand '{src}'", file=sys.stderr)
-        return None
-    return ThreeAddressInstruction(dst, src, None, None)
+        return None, f"Invalid operand '{src}'"
+    return ThreeAddressInstruction(dst, src, None, None), None
 
-def _create_unary(dst, op, src, line_num): 
+def _create_unary(dst, op, src): 
     """Creates a unary negation instruction (4-token case: dst = - src)."""
     if op != '-':
-        print(f"Error on line {line_num}: Expected '-' negation", file=sys.stderr)
-        return None
+        return None, "Expected '-' negation"
     if not is_valid_operand(src):
-        print(f"Error on line {line_num}: Invalid operand '{src}'", file=sys.stderr)
-        return None
-    return ThreeAddressInstruction(dst, src, '-', None)
+        return None, f"Invalid operand '{src}'"
+    return ThreeAddressInstruction(dst, src, '-', None), None
 
-def _create_binary(dst, src1, op, src2, line_num): 
+def _create_binary(dst, src1, op, src2): 
     """Creates a binary operation instruction (5-token case: dst = src1 op src2)."""
     if not is_valid_operand(src1) or not is_valid_operand(src2):
-        print(f"Error on line {line_num}: Invalid operand(s)", file=sys.stderr)
-        return None
+        return None, "Invalid operand(s)"
     if op not in ['+', '-', '*', '/']:
-        print(f"Error on line {line_num}: Invalid operator '{op}'", file=sys.stderr)
-        return None
-    return ThreeAddressInstruction(dst, src1, op, src2)
+        return None, f"Invalid operator '{op}'"
+    return ThreeAddressInstruction(dst, src1, op, src2), None
 
 
 # Test cases for parser module
@@ -69,6 +69,22 @@ def is_valid_variable(name):
     return False
 
 
+def is_valid_label(name):
+    """
+    Checks if a name is a valid label: a letter or underscore followed by letters,
+    digits or underscores (e.g., L1, loop, end_if).
+    
+    Args:
+        name: string to validate
+        
+    Returns:
+        True if valid, False otherwise
+    """
+    if not name or not (name[0].isalpha() or name[0] == '_'):
+        return False
+    return all(c.isalnum() or c == '_' for c in name) and name.isascii()
+
+
 def is_valid_operand(operand):
     """
     Checks if an operand is valid variable or integer literal
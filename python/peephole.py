@@ -0,0 +1,143 @@
+# peephole.py
+# Sliding-window peephole optimizer over TargetCode
+
+from assemblyInstructions import AssemblyInstruction, Opcode, OperandType
+
+
+class PeepholeRule:
+    """
+    A rewrite over a fixed-size window of consecutive instructions.
+    - name: used in the hit-count report
+    - size: number of instructions in the window
+    - rewrite: function(window) returning the replacement list, or None if the rule does not apply
+    Every rule must leave the register and memory state at the end of the window unchanged.
+    """
+    def __init__(self, name, size, rewrite):
+        self.name = name
+        self.size = size
+        self.rewrite = rewrite
+
+    def __repr__(self):
+        return f"<PeepholeRule {self.name}/{self.size}>"
+
+
+def _is_register(operand):
+    return operand is not None and operand.type == OperandType.REGISTER
+
+def _same(a, b):
+    return a.type == b.type and str(a.value) == str(b.value)
+
+def _is_mov(instr):
+    return instr.opcode == Opcode.MOV
+
+
+def _self_move(window):
+    """MOV Rx,Rx does nothing."""
+    instr = window[0]
+    if _is_mov(instr) and _same(instr.src, instr.dst):
+        return []
+    return None
+
+def _overwritten_write(window):
+    """A register write followed by a MOV that overwrites it without reading it is dead."""
+    first, second = window
+    if not _is_register(first.dst) or not _is_mov(second):
+        return None
+    if _same(first.dst, second.dst) and not _same(second.src, second.dst):
+        return [second]
+    return None
+
+def _load_then_store(window):
+    """MOV a,Rx followed by MOV Rx,a writes back the value memory already holds."""
+    first, second = window
+    if not (_is_mov(first) and _is_mov(second)):
+        return None
+    if (first.src.type == OperandType.VARIABLE and _is_register(first.dst)
+            and _same(first.dst, second.src) and _same(first.src, second.dst)):
+        return [first]
+    return None
+
+def _store_then_load(window):
+    """MOV Rx,a followed by MOV a,Rx reloads the value the register already holds."""
+    first, second = window
+    if not (_is_mov(first) and _is_mov(second)):
+        return None
+    if (_is_register(first.src) and first.dst.type == OperandType.VARIABLE
+            and _same(first.dst, second.src) and _same(first.src, second.dst)):
+        return [first]
+    return None
+
+
+PEEPHOLE_RULES = [
+    PeepholeRule("self-move", 1, _self_move),
+    PeepholeRule("overwritten-write", 2, _overwritten_write),
+    PeepholeRule("load-then-store", 2, _load_then_store),
+    PeepholeRule("store-then-load", 2, _store_then_load),
+]
+
+
+def peephole_optimize(target, rules=None):
+    """
+    Rewrites target.instructions in place until no rule applies anywhere.
+
+    Args:
+        target: the TargetCode to optimize
+        rules: list of PeepholeRule objects (defaults to PEEPHOLE_RULES)
+
+    Returns:
+        Dict mapping each rule name to the number of times it was applied
+    """
+    if rules is None:
+        rules = PEEPHOLE_RULES
+    hits = {rule.name: 0 for rule in rules}
+    instructions = target.instructions
+
+    changed = True
+    while changed:
+        changed = False
+        i = 0
+        while i < len(instructions):
+            for rule in rules:
+                window = instructions[i:i + rule.size]
+                if len(window) < rule.size:
+                    continue
+                replacement = rule.rewrite(window)
+                if replacement is None:
+                    continue
+                instructions[i:i + rule.size] = replacement
+                hits[rule.name] += 1
+                changed = True
+                # Step back so the new neighbours of the rewrite are examined too
+                i = max(i - 1, 0)
+                break
+            else:
+                i += 1
+
+    return hits
+
+
+if __name__ == "__main__":
+    from assemblyInstructions import TargetCode, Operand
+
+    def reg(n):
+        return Operand(OperandType.REGISTER, n)
+
+    def var(name):
+        return Operand(OperandType.VARIABLE, name)
+
+    prog = TargetCode()
+    prog.add(AssemblyInstruction(Opcode.MOV, var("a"), reg(0)))
+    prog.add(AssemblyInstruction(Opcode.MOV, reg(0), var("a")))
+    prog.add(AssemblyInstruction(Opcode.MOV, reg(1), reg(1)))
+    prog.add(AssemblyInstruction(Opcode.MOV, var("b"), reg(1)))
+    prog.add(AssemblyInstruction(Opcode.MOV, var("c"), reg(1)))
+    prog.add(AssemblyInstruction(Opcode.ADD, reg(0), reg(1)))
+    prog.add(AssemblyInstruction(Opcode.MOV, reg(1), var("d")))
+    prog.add(AssemblyInstruction(Opcode.MOV, var("d"), reg(1)))
+    print("Before:")
+    print(prog)
+
+    hits = peephole_optimize(prog)
+    print("\nAfter:")
+    print(prog)
+    print(f"\nRule hits: {hits}")
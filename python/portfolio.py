@@ -0,0 +1,257 @@
+# portfolio.py
+# Races several colouring strategies on the same interference graph and keeps the first answer.
+#
+# Every strategy is the same backtracking search (interference._backtracking_search) run
+# over the webs in a different order, and each one loses badly on some blocks:
+#   alphabetical - the order InterferenceGraph.allocate_registers uses
+#   degree       - most neighbours first
+#   saturation   - the order DSatur colours in: most distinctly coloured neighbours first
+#   start        - by the line the web's first live range starts on (greedy order)
+#   random       - shuffled orders, restarted with a doubling node budget
+# Each strategy runs in its own worker process and colours the graph one connected
+# component at a time. The first to find a colouring or to prove that none exists wins,
+# and the other workers are terminated.
+
+import queue
+import random
+import time
+from heapq import heapify, heappop, heappush
+
+from interference import (SearchBudget, _backtracking_search, STATUS_COLOURED, STATUS_HEURISTIC,
+                          STATUS_UNCOLOURABLE, STATUS_UNDECIDED)
+
+# Nodes the first random restart may visit; each later restart gets twice as many
+RESTART_NODES = 1000
+
+# Seconds to wait for a worker's answer after the time budget has run out
+RESULT_GRACE = 1.0
+
+# Seconds between checks for workers that died without answering
+POLL_INTERVAL = 0.1
+
+
+def _alphabetical_order(component, adj_list, starts, rng):
+    return list(component)
+
+
+def _degree_order(component, adj_list, starts, rng):
+    return sorted(component, key=lambda web: (-len(adj_list[web]), web))
+
+
+def _saturation_order(component, adj_list, starts, rng):
+    """
+    Orders webs the way DSatur picks them: next is the web whose coloured neighbours use
+    the most distinct colours (ties go to the higher degree), colouring greedily as it goes.
+    """
+    colours = {}
+    neighbour_colours = {web: set() for web in component}
+    heap = [(0, -len(adj_list[web]), web) for web in component]
+    heapify(heap)
+    order = []
+    while heap:
+        saturation, _, web = heappop(heap)
+        # Skip entries left behind when a web's saturation went up
+        if web in colours or -saturation != len(neighbour_colours[web]):
+            continue
+        used = neighbour_colours[web]
+        colour = next(c for c in range(len(used) + 1) if c not in used)
+        colours[web] = colour
+        order.append(web)
+        for neighbor in adj_list[web]:
+            if neighbor not in colours and colour not in neighbour_colours[neighbor]:
+                neighbour_colours[neighbor].add(colour)
+                heappush(heap, (-len(neighbour_colours[neighbor]), -len(adj_list[neighbor]), neighbor))
+    return order
+
+
+def _start_order(component, adj_list, starts, rng):
+    return sorted(component, key=lambda web: (starts[web], web))
+
+
+def _random_order(component, adj_list, starts, rng):
+    order = list(component)
+    rng.shuffle(order)
+    return order
+
+
+# Strategy name -> function(component, adj_list, starts, rng) returning the search order
+STRATEGIES = {
+    "alphabetical": _alphabetical_order,
+    "degree": _degree_order,
+    "saturation": _saturation_order,
+    "start": _start_order,
+    "random": _random_order,
+}
+
+DEFAULT_STRATEGIES = list(STRATEGIES)
+
+
+def _colour_component(name, component, adj_list, starts, n, budget, rng, allocations):
+    """
+    Searches one component in the strategy's order. The random strategy restarts with a
+    new shuffle whenever a restart uses up its node budget.
+
+    Returns:
+        True if a colouring was found, False if none exists, None if the budget ran out
+    """
+    order = STRATEGIES[name](component, adj_list, starts, rng)
+    if name != "random":
+        return _backtracking_search(order, adj_list, n, budget, allocations)
+
+    restart_nodes = RESTART_NODES
+    while True:
+        remaining = None if budget.deadline is None else max(0.0, budget.deadline - time.perf_counter())
+        restart = SearchBudget(remaining, restart_nodes)
+        result = _backtracking_search(order, adj_list, n, restart, allocations)
+        budget.nodes_visited += restart.nodes_visited
+        budget.backtracks += restart.backtracks
+        if result is not None:
+            return result
+        for web in component:
+            allocations.pop(web, None)
+        if budget.deadline is not None and time.perf_counter() >= budget.deadline:
+            return None
+        restart_nodes *= 2
+        order = _random_order(component, adj_list, starts, rng)
+
+
+def run_strategy(name, components, adj_list, starts, n, time_budget=None, seed=0):
+    """
+    Colours every component with one strategy. Module-level so it can run in a worker process.
+
+    Returns:
+        (result, allocations, failed_component, nodes_visited, backtracks) where result is
+        True, False (failed_component has no colouring) or None (the budget ran out)
+    """
+    budget = SearchBudget(time_budget)
+    rng = random.Random(seed)
+    allocations = {}
+    for component in components:
+        result = _colour_component(name, component, adj_list, starts, n, budget, rng, allocations)
+        if result is not True:
+            failed = component if result is False else None
+            return result, allocations, failed, budget.nodes_visited, budget.backtracks
+    return True, allocations, None, budget.nodes_visited, budget.backtracks
+
+
+def _race_worker(answers, name, components, adj_list, starts, n, time_budget, seed):
+    answers.put((name, run_strategy(name, components, adj_list, starts, n, time_budget, seed)))
+
+
+def race(components, adj_list, starts, n, strategies, time_budget=None, seed=0):
+    """
+    Runs every strategy in its own process and returns as soon as one of them decides the
+    colouring, terminating the rest. A single strategy runs in this process instead.
+
+    Returns:
+        (winner, outcome) where outcome is run_strategy's tuple, or (None, None) if every
+        strategy ran out of budget
+    """
+    if len(strategies) == 1:
+        outcome = run_strategy(strategies[0], components, adj_list, starts, n, time_budget, seed)
+        return (strategies[0], outcome) if outcome[0] is not None else (None, None)
+
+    import multiprocessing
+    answers = multiprocessing.Queue()
+    workers = [multiprocessing.Process(target=_race_worker, daemon=True,
+                                       args=(answers, name, components, adj_list, starts, n,
+                                             time_budget, seed))
+               for name in strategies]
+    deadline = None if time_budget is None else time.perf_counter() + time_budget + RESULT_GRACE
+    try:
+        for worker in workers:
+            worker.start()
+        received = 0
+        while received < len(workers):
+            timeout = POLL_INTERVAL
+            if deadline is not None:
+                timeout = max(0.0, min(timeout, deadline - time.perf_counter()))
+            try:
+                name, outcome = answers.get(timeout=timeout)
+            except queue.Empty:
+                if deadline is not None and time.perf_counter() >= deadline:
+                    break
+                # A worker that exited normally has queued its answer; one that crashed never will
+                crashed = sum(1 for worker in workers if worker.exitcode not in (None, 0))
+                if received + crashed >= len(workers):
+                    break
+                continue
+            received += 1
+            if outcome[0] is not None:
+                return name, outcome
+        return None, None
+    finally:
+        for worker in workers:
+            if worker.is_alive():
+                worker.terminate()
+            worker.join()
+
+
+def allocate_portfolio(graph, num_registers, strategies=None, time_budget=None, seed=0):
+    """
+    Allocates registers for an InterferenceGraph by racing colouring strategies, filling in
+    the same results as graph.allocate_registers plus graph.strategy, the strategy that won.
+    If every strategy runs out of budget, the greedy colouring is used when it fits.
+
+    Args:
+        graph: the InterferenceGraph to colour
+        num_registers: number of registers (colours) available
+        strategies: names from STRATEGIES to race (default: all of them)
+        time_budget: seconds each strategy may search, or None for no limit
+        seed: seed of the random strategy's shuffles
+
+    Returns:
+        True if every web got a register, False otherwise
+    """
+    strategies = list(strategies or DEFAULT_STRATEGIES)
+    for name in strategies:
+        if name not in STRATEGIES:
+            raise ValueError(f"Unknown colouring strategy '{name}'")
+
+    graph.allocations = {}
+    graph.spilled = []
+    graph.scratch_register = None
+    graph.failed_component = None
+    graph.strategy = None
+
+    starts = {web: min(r.start_line for r in ranges) for web, ranges in graph.ranges.items()}
+    components = graph.connected_components()
+    winner, outcome = race(components, graph.adj_list, starts, num_registers, strategies, time_budget, seed)
+
+    if winner is None:
+        graph.nodes_visited = 0
+        graph.backtracks = 0
+        allocations, uncoloured = graph._greedy_colouring(num_registers)
+        if uncoloured:
+            graph.status = STATUS_UNDECIDED
+            graph.failed_component = sorted(uncoloured)
+            return False
+        graph.allocations = allocations
+        graph.status = STATUS_HEURISTIC
+        return True
+
+    result, allocations, failed, graph.nodes_visited, graph.backtracks = outcome
+    graph.strategy = winner
+    if result is False:
+        graph.status = STATUS_UNCOLOURABLE
+        graph.failed_component = failed
+        return False
+    graph.allocations = allocations
+    graph.status = STATUS_COLOURED
+    return True
+
+
+if __name__ == "__main__":
+    from tacGenerator import generate_tac
+    from fuzz import code_from_lines
+    from liveness import LivenessAnalyzer
+    from interference import InterferenceGraph
+
+    code = code_from_lines(generate_tac(400, 8, 0.5, 6, seed=1))
+    analyzer = LivenessAnalyzer(code)
+    analyzer.analyze()
+    graph = InterferenceGraph(analyzer)
+    start = time.perf_counter()
+    success = allocate_portfolio(graph, 10, time_budget=5.0)
+    print(f"{graph.status} by '{graph.strategy}' in {time.perf_counter() - start:.3f}s "
+          f"({graph.nodes_visited} nodes)")
@@ -0,0 +1,145 @@
+# profiler.py
+# Optional per-stage timing, memory and counter instrumentation for the compiler pipeline.
+#
+# Enabled with `python main.py --profile[=text|json] ...` or the TAC_PROFILE environment
+# variable (TAC_PROFILE=text or TAC_PROFILE=json). When disabled, stage() hands back a shared
+# no-op context and count() returns immediately, so instrumented code pays nothing; json
+# and tracemalloc are only imported once profiling is turned on.
+
+import os
+import sys
+import time
+
+from envVars import PROFILE_ENV_VAR
+
+PROFILE_FORMATS = ("text", "json")
+
+
+class _NullStage:
+    """Context manager used for every stage while profiling is disabled."""
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        return False
+
+
+_NULL_STAGE = _NullStage()
+
+tracemalloc = None
+
+
+def _load_tracemalloc():
+    """Imports tracemalloc on first use, since only an enabled profiler needs it."""
+    global tracemalloc
+    if tracemalloc is None:
+        import tracemalloc as module
+        tracemalloc = module
+    return tracemalloc
+
+
+class _Stage:
+    """Times one pipeline stage and records its peak traced memory (tracemalloc is loaded by Profiler.enable)."""
+    def __init__(self, profiler, name):
+        self.profiler = profiler
+        self.name = name
+        self.start = 0.0
+
+    def __enter__(self):
+        tracemalloc.reset_peak()
+        self.start = time.perf_counter()
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        seconds = time.perf_counter() - self.start
+        peak = tracemalloc.get_traced_memory()[1]
+        self.profiler.stages.append({"stage": self.name, "seconds": seconds, "peak_bytes": peak})
+        return False
+
+
+class Profiler:
+    """
+    Collects stage timings and named counters for one compile.
+    - stages: list of {"stage", "seconds", "peak_bytes"} in the order they ran
+    - counters: dict of counter name -> value
+    """
+    def __init__(self):
+        self.enabled = False
+        self.format = "text"
+        self.stages = []
+        self.counters = {}
+
+    def enable(self, fmt="text"):
+        """Starts a fresh profile and begins tracing memory allocations."""
+        if fmt not in PROFILE_FORMATS:
+            raise ValueError(f"Unknown profile format '{fmt}'")
+        self.enabled = True
+        self.format = fmt
+        self.stages = []
+        self.counters = {}
+        if not _load_tracemalloc().is_tracing():
+            tracemalloc.start()
+
+    def disable(self):
+        """Stops profiling and memory tracing."""
+        self.enabled = False
+        if tracemalloc is not None and tracemalloc.is_tracing():
+            tracemalloc.stop()
+
+    def stage(self, name):
+        """Returns a context manager that records the wall time and peak memory of a stage."""
+        if not self.enabled:
+            return _NULL_STAGE
+        return _Stage(self, name)
+
+    def count(self, name, amount=1):
+        """Adds amount to a named counter."""
+        if not self.enabled:
+            return
+        self.counters[name] = self.counters.get(name, 0) + amount
+
+    def report(self):
+        """Returns the collected profile as a string in the configured format."""
+        if self.format == "json":
+            import json
+            return json.dumps({"stages": self.stages, "counters": self.counters}, indent=2)
+
+        lines = ["--- Profile ---", f"  {'stage':<14}{'seconds':>10}{'peak KiB':>12}"]
+        total = 0.0
+        for entry in self.stages:
+            total += entry["seconds"]
+            lines.append(f"  {entry['stage']:<14}{entry['seconds']:>10.4f}{entry['peak_bytes'] / 1024:>12.1f}")
+        lines.append(f"  {'total':<14}{total:>10.4f}")
+        if self.counters:
+            lines.append("  counters:")
+            for name, value in self.counters.items():
+                lines.append(f"    {name}: {value}")
+        lines.append("---------------")
+        return "\n".join(lines)
+
+    def print_report(self, stream=None):
+        """Writes the report (to stderr by default, so stdout stays unchanged)."""
+        print(self.report(), file=stream or sys.stderr)
+
+
+# Shared instance used by every pipeline stage
+PROFILER = Profiler()
+
+
+def profile_format_from_env():
+    """Returns the profile format requested by TAC_PROFILE, or None if profiling is not requested."""
+    value = os.environ.get(PROFILE_ENV_VAR, "").strip().lower()
+    if not value or value in ("0", "off", "false"):
+        return None
+    if value in PROFILE_FORMATS:
+        return value
+    return "text"
+
+
+if __name__ == "__main__":
+    PROFILER.enable("text")
+    with PROFILER.stage("build"):
+        data = [i * i for i in range(100000)]
+    PROFILER.count("items", len(data))
+    PROFILER.print_report(sys.stdout)
+    PROFILER.disable()
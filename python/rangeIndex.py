@@ -0,0 +1,197 @@
+# rangeIndex.py
+# Index over the live ranges of a block, built once after liveness analysis.
+#
+# Answers, without scanning every range or every line:
+#   live_at(line)            webs live on a line              O(log n + k log n)
+#   overlapping(start, end)  webs live anywhere in [start, end)
+#   range_of(var, line)      the range of a variable holding a line, e.g. where it ends  O(log n)
+#   pressure(line)           number of webs live on a line    O(1), from prefix sums
+#   peak_pressure(first, last)  most webs live on one line of [first, last]  O(log n)
+# Ranges are sorted by start line with a max-end tree over them (an implicit interval
+# tree), and pressure is kept in a max segment tree over the lines of the block.
+
+from bisect import bisect_left, bisect_right
+
+
+class LiveRangeIndex:
+    """
+    Read-only index over a dict of web name -> list of LiveRange (LivenessAnalyzer.webs,
+    InterferenceGraph.ranges). Lines run from 0 (block entry) to num_instructions + 1
+    (block exit), and a range [start, end) covers the lines start .. end - 1.
+    """
+    def __init__(self, webs, num_instructions):
+        """
+        Args:
+            webs: dict of web name -> list of LiveRange
+            num_instructions: number of instructions in the block
+        """
+        self.num_lines = num_instructions + 2
+        entries = []
+        for web, ranges in webs.items():
+            for r in ranges:
+                entries.append((r.start_line, r.end_line, web, r))
+        entries.sort(key=lambda entry: (entry[0], entry[1], entry[2]))
+        self._starts = [entry[0] for entry in entries]
+        self._ends = [entry[1] for entry in entries]
+        self._webs = [entry[2] for entry in entries]
+        self._ranges = [entry[3] for entry in entries]
+        self._max_end = self._build_max_tree(self._ends, default=-1)
+
+        # variable -> (its ranges sorted by start line, their start lines, running max of their ends)
+        by_var = {}
+        for r in self._ranges:
+            by_var.setdefault(r.var_name, []).append(r)
+        self._by_var = {}
+        for var, ranges in by_var.items():
+            reach = []
+            for r in ranges:
+                reach.append(max(reach[-1], r.end_line) if reach else r.end_line)
+            self._by_var[var] = (ranges, [r.start_line for r in ranges], reach)
+
+        self._pressure = self._count_pressure(webs)
+        self._peak = self._build_max_tree([(p, -line) for line, p in enumerate(self._pressure)],
+                                          default=(-1, 0))
+
+    @classmethod
+    def from_analyzer(cls, analyzer):
+        """Indexes the webs of a LivenessAnalyzer that has already run .analyze()."""
+        return cls(analyzer.webs, len(analyzer.code.instructions))
+
+    def _count_pressure(self, webs):
+        """Number of webs live on each line. Ranges of one web that touch or overlap count once."""
+        diff = [0] * (self.num_lines + 1)
+        for ranges in webs.values():
+            merged_start = merged_end = None
+            for r in sorted(ranges, key=lambda r: r.start_line):
+                if merged_end is not None and r.start_line <= merged_end:
+                    merged_end = max(merged_end, r.end_line)
+                    continue
+                if merged_end is not None:
+                    diff[merged_start] += 1
+                    diff[merged_end] -= 1
+                merged_start, merged_end = r.start_line, r.end_line
+            if merged_end is not None:
+                diff[merged_start] += 1
+                diff[merged_end] -= 1
+
+        pressure = [0] * self.num_lines
+        running = 0
+        for line in range(self.num_lines):
+            running += diff[line]
+            pressure[line] = running
+        return pressure
+
+    @staticmethod
+    def _build_max_tree(values, default):
+        """Bottom-up segment tree: leaves at size + i, each parent holds the max of its children."""
+        size = 1
+        while size < len(values):
+            size *= 2
+        tree = [default] * (2 * size)
+        tree[size:size + len(values)] = values
+        for node in range(size - 1, 0, -1):
+            tree[node] = max(tree[2 * node], tree[2 * node + 1])
+        return tree
+
+    def _indices_overlapping(self, start, end):
+        """Yields the positions of every range with start_line < end and end_line > start."""
+        count = bisect_left(self._starts, end)
+        if count == 0 or end <= start:
+            return
+        size = len(self._max_end) // 2
+        stack = [(1, 0, size)]
+        while stack:
+            node, low, high = stack.pop()
+            # Skip subtrees that lie past the candidates or whose ranges all end by `start`
+            if low >= count or self._max_end[node] <= start:
+                continue
+            if node >= size:
+                yield low
+                continue
+            middle = (low + high) // 2
+            stack.append((2 * node + 1, middle, high))
+            stack.append((2 * node, low, middle))
+
+    def live_at(self, line_num):
+        """Returns the sorted webs live on a line."""
+        return self.overlapping(line_num, line_num + 1)
+
+    def overlapping(self, start, end):
+        """Returns the sorted webs with a range overlapping the lines [start, end)."""
+        return sorted({self._webs[i] for i in self._indices_overlapping(start, end)})
+
+    def range_of(self, var, line_num):
+        """
+        Returns the LiveRange of variable var that holds its value on a line (the latest
+        one to start, when ranges touch), or None if var is not live there.
+        """
+        if var not in self._by_var:
+            return None
+        ranges, starts, reach = self._by_var[var]
+        k = bisect_right(starts, line_num) - 1
+        # Walk back only while some earlier range still reaches the line
+        while k >= 0 and reach[k] > line_num:
+            if ranges[k].end_line > line_num:
+                return ranges[k]
+            k -= 1
+        return None
+
+    def pressure(self, line_num):
+        """Returns the number of webs live on a line."""
+        if not 0 <= line_num < self.num_lines:
+            return 0
+        return self._pressure[line_num]
+
+    def peak_pressure(self, first=0, last=None):
+        """
+        Finds the line of [first, last] with the most webs live (the earliest one on a tie).
+
+        Returns:
+            (pressure, line_num)
+        """
+        if last is None:
+            last = self.num_lines - 1
+        first = max(first, 0)
+        last = min(last, self.num_lines - 1)
+        if first > last:
+            return 0, first
+        size = len(self._peak) // 2
+        best = (-1, 0)
+        low, high = first + size, last + size + 1
+        while low < high:
+            if low & 1:
+                best = max(best, self._peak[low])
+                low += 1
+            if high & 1:
+                high -= 1
+                best = max(best, self._peak[high])
+            low //= 2
+            high //= 2
+        return best[0], -best[1]
+
+    def __len__(self):
+        return len(self._ranges)
+
+    def __repr__(self):
+        peak, line = self.peak_pressure()
+        return f"<LiveRangeIndex: {len(self._ranges)} ranges, peak pressure {peak} on line {line}>"
+
+
+if __name__ == "__main__":
+    from threeAddress import IntermediateCode, ThreeAddressInstruction
+    from liveness import LivenessAnalyzer
+
+    code = IntermediateCode()
+    code.add_instruction(ThreeAddressInstruction("t1", "a", "+", "b"))
+    code.add_instruction(ThreeAddressInstruction("t2", "t1", "*", "a"))
+    code.add_instruction(ThreeAddressInstruction("a", "t2", "-", "t1"))
+    code.add_instruction(ThreeAddressInstruction("d", "a", "+", "1"))
+    code.set_live_on_exit(["d"])
+
+    analyzer = LivenessAnalyzer(code)
+    analyzer.analyze()
+    index = LiveRangeIndex.from_analyzer(analyzer)
+    print(index)
+    for line_num in range(len(code.instructions) + 2):
+        print(f"  line {line_num}: {index.pressure(line_num)} live {index.live_at(line_num)}")
+    print("Range of 'a' on line 2:", index.range_of("a", 2))
@@ -0,0 +1,277 @@
+# regressionTests.py
+# Runs the runTests.py cases in parallel and checks them against golden outputs.
+#
+# Usage:
+#   python regressionTests.py [--jobs N] [--threshold 2.0] [--slack 0.25] [--repeat 1]
+#                             [--update] [--update-timings] [name ...]
+#
+# Every case runs main.py in its own process, inside a scratch directory holding a copy of
+# its input file, so the committed .s files are never overwritten. Two things are
+# compared with the golden outputs:
+#   - stdout, stderr and the exit code, against tests/golden/<case>.out (whether a .s
+#     file is written shows up there as "Assembly written to: ...")
+#   - the .s file the case writes, if any, against the committed tests/<input>.s
+# A case run with --cache compiles its input twice in the same directory. The second run
+# must hit the cache and print exactly what the first, fresh compile printed.
+# The wall time of every case is compared with tests/golden/timings.json, and a case
+# fails when it takes longer than baseline * threshold + slack seconds.
+# --update rewrites the golden outputs from the current run; --update-timings rewrites
+# the timing baseline.
+
+import argparse
+import json
+import os
+import re
+import shutil
+import subprocess
+import sys
+import tempfile
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+from envVars import CACHE_ENV_VAR, PROFILE_ENV_VAR
+from runTests import TEST_CASES
+
+HERE = os.path.dirname(os.path.abspath(__file__))
+GOLDEN_DIR = os.path.join(HERE, "tests", "golden")
+TIMINGS_FILE = os.path.join(GOLDEN_DIR, "timings.json")
+
+# A case fails when it takes longer than baseline * DEFAULT_THRESHOLD + DEFAULT_SLACK seconds
+DEFAULT_THRESHOLD = 2.0
+DEFAULT_SLACK = 0.25
+
+
+class CaseResult:
+    """Outcome of one regression case."""
+    def __init__(self, name, args):
+        self.name = name
+        self.args = args
+        self.stdout = ""
+        self.stderr = ""
+        self.exit_code = None
+        self.assembly = None        # contents of the .s file written, or None
+        self.seconds = None         # fastest of the repeated runs
+        self.cached_stdout = None   # stdout of the second, cached compile of a --cache case
+        self.cache_hit = None       # whether that compile was a cache hit
+        self.failures = []          # human-readable reasons the case failed
+
+    def output(self):
+        """stdout, then stderr (if any) and the exit code, as stored in the golden .out file."""
+        stderr = f"--- stderr ---\n{self.stderr}" if self.stderr else ""
+        return f"{self.stdout}{stderr}Program exited with code: {self.exit_code}\n"
+
+    def __repr__(self):
+        return f"<CaseResult {self.name}: {'FAIL' if self.failures else 'ok'}>"
+
+
+def case_slug(name):
+    """Turns a test name into a file name: 'Alloc Failure (1 reg)' -> 'alloc_failure_1_reg'."""
+    return re.sub(r"[^a-z0-9]+", "_", name.lower()).strip("_")
+
+
+def golden_output_path(name):
+    return os.path.join(GOLDEN_DIR, case_slug(name) + ".out")
+
+
+def _input_files(args):
+    """Returns the arguments that name files in the python/ directory."""
+    return [arg for arg in args if not arg.startswith("-") and os.path.isfile(os.path.join(HERE, arg))]
+
+
+def _written_assembly(args):
+    """Returns the .s path a case writes, relative to its directory, or None if it takes no input file."""
+    inputs = _input_files(args)
+    if not inputs:
+        return None
+    return os.path.splitext(inputs[0])[0] + ".s"
+
+
+def _uses_cache(args):
+    return any(arg == "--cache" or arg.startswith("--cache=") for arg in args)
+
+
+def run_case(name, args, repeat=1, python_flags=()):
+    """
+    Runs one case `repeat` times in a fresh process and scratch directory.
+    The output of the last run is kept, and the fastest wall time is recorded.
+    python_flags are passed to the interpreter (e.g. ["-X", "importtime"]).
+
+    Returns:
+        CaseResult (with no failures yet; see check_case)
+    """
+    result = CaseResult(name, args)
+    env = dict(os.environ)
+    # A cached compile would skip the very work whose output and timing are being checked
+    env.pop(CACHE_ENV_VAR, None)
+    for _ in range(repeat):
+        with tempfile.TemporaryDirectory() as scratch:
+            for path in _input_files(args):
+                os.makedirs(os.path.join(scratch, os.path.dirname(path)), exist_ok=True)
+                shutil.copy(os.path.join(HERE, path), os.path.join(scratch, path))
+
+            start = time.perf_counter()
+            completed = subprocess.run([sys.executable, *python_flags, os.path.join(HERE, "main.py")] + args,
+                                       cwd=scratch, env=env, capture_output=True, text=True)
+            seconds = time.perf_counter() - start
+
+            result.stdout = completed.stdout
+            result.stderr = completed.stderr
+            result.exit_code = completed.returncode
+            if _uses_cache(args):
+                # Compile again with a JSON profile, whose counters tell whether the cache was hit
+                cached = subprocess.run([sys.executable, *python_flags, os.path.join(HERE, "main.py")] + args,
+                                        cwd=scratch, env=dict(env, **{PROFILE_ENV_VAR: "json"}),
+                                        capture_output=True, text=True)
+                result.cached_stdout = cached.stdout
+                result.cache_hit = '"cache hits": 1' in cached.stderr
+            written = _written_assembly(args)
+            result.assembly = None
+            if written and os.path.isfile(os.path.join(scratch, written)):
+                with open(os.path.join(scratch, written)) as f:
+                    result.assembly = f.read()
+            result.seconds = seconds if result.seconds is None else min(result.seconds, seconds)
+    return result
+
+
+def _read(path):
+    if not os.path.isfile(path):
+        return None
+    with open(path) as f:
+        return f.read()
+
+
+def _first_difference(expected, actual):
+    """Describes the first line where two texts differ."""
+    expected_lines = expected.splitlines()
+    actual_lines = actual.splitlines()
+    for line_num, (want, got) in enumerate(zip(expected_lines, actual_lines), start=1):
+        if want != got:
+            return f"line {line_num}: expected {want!r}, got {got!r}"
+    line_num = min(len(expected_lines), len(actual_lines)) + 1
+    if len(expected_lines) > len(actual_lines):
+        return f"line {line_num}: expected {expected_lines[line_num - 1]!r}, got end of output"
+    return f"line {line_num}: expected end of output, got {actual_lines[line_num - 1]!r}"
+
+
+def check_case(result, baseline, threshold, slack):
+    """Compares a finished case with its golden outputs and timing baseline, recording failures."""
+    expected = _read(golden_output_path(result.name))
+    if expected is None:
+        result.failures.append("no golden output (run with --update to record one)")
+    elif expected != result.output():
+        result.failures.append("output differs, " + _first_difference(expected, result.output()))
+
+    if result.cached_stdout is not None:
+        if not result.cache_hit:
+            result.failures.append("the second compile did not hit the cache")
+        elif result.cached_stdout != result.stdout:
+            result.failures.append("cache hit output differs from the fresh compile, "
+                                   + _first_difference(result.stdout, result.cached_stdout))
+
+    written = _written_assembly(result.args)
+    golden_assembly = _read(os.path.join(HERE, written)) if written else None
+    # Several cases may share an input file, so a case that writes no .s is judged by its stdout alone
+    if result.assembly is None:
+        pass
+    elif golden_assembly is None:
+        result.failures.append(f"{written} was written but has no committed golden copy")
+    elif result.assembly != golden_assembly:
+        result.failures.append(f"{written} differs, " + _first_difference(golden_assembly, result.assembly))
+
+    limit = None
+    if result.name in baseline:
+        limit = baseline[result.name] * threshold + slack
+    if limit is not None and result.seconds > limit:
+        result.failures.append(f"took {result.seconds:.3f}s, baseline {baseline[result.name]:.3f}s "
+                               f"(limit {limit:.3f}s)")
+
+
+def update_golden(result):
+    """Rewrites a case's golden stdout and .s file from its current run."""
+    os.makedirs(GOLDEN_DIR, exist_ok=True)
+    with open(golden_output_path(result.name), "w") as f:
+        f.write(result.output())
+    written = _written_assembly(result.args)
+    if written and result.assembly is not None:
+        with open(os.path.join(HERE, written), "w") as f:
+            f.write(result.assembly)
+
+
+def load_baseline(path=TIMINGS_FILE):
+    """Returns the stored case name -> seconds baseline, or an empty one if there is none."""
+    if not os.path.isfile(path):
+        return {}
+    with open(path) as f:
+        return json.load(f)["cases"]
+
+
+def save_baseline(seconds, path=TIMINGS_FILE):
+    """Stores a case name -> seconds baseline."""
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    with open(path, "w") as f:
+        json.dump({"python": sys.version.split()[0],
+                   "cases": {name: round(value, 4) for name, value in seconds.items()}}, f, indent=2)
+        f.write("\n")
+
+
+def run_all(cases, jobs=None, repeat=1):
+    """
+    Runs the cases in parallel, each in its own main.py process.
+
+    Returns:
+        list of CaseResult in the order of `cases`
+    """
+    jobs = jobs or os.cpu_count() or 1
+    # The work happens in the child processes, so threads are enough to keep `jobs` of them busy
+    with ThreadPoolExecutor(max_workers=jobs) as pool:
+        return list(pool.map(lambda case: run_case(case[0], case[1], repeat), cases))
+
+
+def main():
+    arg_parser = argparse.ArgumentParser(description="Check every test case against its golden output.")
+    arg_parser.add_argument("names", nargs="*", help="run only the cases whose names contain one of these")
+    arg_parser.add_argument("--jobs", type=int, default=None, help="cases run at once (default: CPU count)")
+    arg_parser.add_argument("--repeat", type=int, default=1, help="runs per case; the fastest time counts")
+    arg_parser.add_argument("--threshold", type=float, default=DEFAULT_THRESHOLD,
+                            help="allowed slowdown factor against the timing baseline")
+    arg_parser.add_argument("--slack", type=float, default=DEFAULT_SLACK,
+                            help="seconds allowed on top of baseline * threshold, for timer noise")
+    arg_parser.add_argument("--update", action="store_true", help="rewrite the golden outputs")
+    arg_parser.add_argument("--update-timings", action="store_true", help="rewrite the timing baseline")
+    args = arg_parser.parse_args()
+
+    cases = [(name, case_args) for name, case_args in TEST_CASES
+             if not args.names or any(part.lower() in name.lower() for part in args.names)]
+    if not cases:
+        print("No test case matches", ", ".join(args.names))
+        return 1
+
+    start = time.perf_counter()
+    results = run_all(cases, args.jobs, args.repeat)
+    elapsed = time.perf_counter() - start
+
+    if args.update:
+        for result in results:
+            update_golden(result)
+    if args.update_timings:
+        # Cases that were not run keep their old baseline
+        baseline = load_baseline()
+        baseline.update({r.name: r.seconds for r in results})
+        save_baseline(baseline)
+    baseline = load_baseline()
+
+    failed = 0
+    for result in results:
+        check_case(result, baseline, args.threshold, args.slack)
+        status = "FAIL" if result.failures else "ok"
+        print(f"{status:>4}  {result.seconds:7.3f}s  {result.name}")
+        for failure in result.failures:
+            print("        " + failure.replace("\n", "\n        "))
+        failed += bool(result.failures)
+
+    print(f"\n{len(results) - failed} passed, {failed} failed in {elapsed:.2f}s")
+    return 1 if failed else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -6,6 +6,7 @@
 #   3. Standard functionality (correct inputs, expected outputs)
 #   4. Register allocation failures and edge cases
 # Each test calls main() with a specific set of arguments and prints the result.
+# regressionTests.py runs the same cases in parallel and checks them against golden outputs.
 
 import sys
 from main import main 
@@ -20,49 +21,74 @@ def run_test(test_name, args):
         print("Program exited with code:", e.code)
     print("-------------------------------\n")
 
-if __name__ == "__main__":
+# (test name, command-line arguments) for every test, in the order they are run
+TEST_CASES = [
     # Command Line and Argument Validation Tests
-    run_test("Missing Arguments",           ["4"])
-    run_test("Non-integer Register Count",  ["abc", "input.txt"])
-    run_test("Negative Register Count",     ["-1", "input.txt"])
-    run_test("Zero Register Count",         ["0", "input.txt"])
-    run_test("Non-existent Input File",     ["4", "nonexistent.txt"])
+    ("Missing Arguments",           ["4"]),
+    ("Non-integer Register Count",  ["abc", "input.txt"]),
+    ("Negative Register Count",     ["-1", "input.txt"]),
+    ("Zero Register Count",         ["0", "input.txt"]),
+    ("Non-existent Input File",     ["4", "nonexistent.txt"]),
 
     # Parser and Syntax Validation Tests
-    run_test("Bad Variable Name",           ["4", "tests/bad_var.txt"])
-    run_test("Unsupported Operator (%)",    ["4", "tests/bad_op.txt"])
-    run_test("Missing 'live:' Prefix",      ["4", "tests/no_live_prefix.txt"])
-    run_test("Missing 'live:' Line",        ["4", "tests/missing_live.txt"])
-    run_test("Live Var Not in Code",        ["4", "tests/invalid_live_var.txt"])
-    run_test("Incomplete Instruction",      ["4", "tests/incomplete_instr.txt"])
+    ("Bad Variable Name",           ["4", "tests/bad_var.txt"]),
+    ("Unsupported Operator (%)",    ["4", "tests/bad_op.txt"]),
+    ("Missing 'live:' Prefix",      ["4", "tests/no_live_prefix.txt"]),
+    ("Missing 'live:' Line",        ["4", "tests/missing_live.txt"]),
+    ("Live Var Not in Code",        ["4", "tests/invalid_live_var.txt"]),
+    ("Incomplete Instruction",      ["4", "tests/incomplete_instr.txt"]),
 
     # Standard Functionality Tests
-    run_test("Standard Example 1",          ["4", "tests/test1.txt"])
-    run_test("Standard Example 2",          ["4", "tests/test2.txt"])
-    run_test("Standard Example 3",          ["4", "tests/test3.txt"])
-    run_test("Standard Example 4",          ["4", "tests/test4.txt"])
-    run_test("Long Arithmetic Chain",       ["4", "tests/test5.txt"])
-    run_test("High Register Pressure",      ["4", "tests/test6.txt"])
-    run_test("Variable Reuse Logic",        ["4", "tests/test7.txt"])
-    run_test("Complex Temp Usage",          ["4", "tests/test8.txt"])
-    run_test("Live on Entry (x, y)",        ["4", "tests/test9.txt"])
-    run_test("Multiple Live on Exit",       ["4", "tests/test10.txt"])
-    run_test("Live on Entry + Exit",        ["4", "tests/entry_and_exit.txt"])
+    ("Standard Example 1",          ["4", "tests/test1.txt"]),
+    ("Standard Example 2",          ["4", "tests/test2.txt"]),
+    ("Standard Example 3",          ["4", "tests/test3.txt"]),
+    ("Standard Example 4",          ["4", "tests/test4.txt"]),
+    ("Long Arithmetic Chain",       ["4", "tests/test5.txt"]),
+    ("High Register Pressure",      ["4", "tests/test6.txt"]),
+    ("Variable Reuse Logic",        ["4", "tests/test7.txt"]),
+    ("Complex Temp Usage",          ["4", "tests/test8.txt"]),
+    ("Live on Entry (x, y)",        ["4", "tests/test9.txt"]),
+    ("Multiple Live on Exit",       ["4", "tests/test10.txt"]),
+    ("Live on Entry + Exit",        ["4", "tests/entry_and_exit.txt"]),
+    ("Cache Hit Replays Output",    ["--cache", "4", "tests/test1.txt"]),
 
     # Register Allocation Failure Tests
-    run_test("Alloc Failure (1 reg)",                   ["1", "tests/alloc_fail_1reg.txt"])
-    run_test("Alloc Failure (High Pressure, 2 regs)",   ["2", "tests/alloc_fail_pressure.txt"])
-    run_test("Alloc Min Success (2 regs, should pass)", ["2", "tests/alloc_min_success.txt"])
-    run_test("Alloc Min Failure (1 reg, should fail)",  ["1", "tests/alloc_min_success.txt"])
+    ("Alloc Constant Operands (1 reg)",         ["1", "tests/alloc_fail_1reg.txt"]),
+    ("Alloc Failure (1 reg)",                   ["1", "tests/alloc_fail_1reg_vars.txt"]),
+    ("Alloc Failure (High Pressure, 2 regs)",   ["2", "tests/alloc_fail_pressure.txt"]),
+    ("Alloc Failure (Variable Operands, 2 regs)", ["2", "tests/alloc_fail_pressure_vars.txt"]),
+    ("Alloc Min Success (2 regs, should pass)", ["2", "tests/alloc_min_success.txt"]),
+    ("Alloc Min Failure (1 reg, should fail)",  ["1", "tests/alloc_min_success.txt"]),
+    ("Budget Exhausted, Spill (4 regs)",        ["--budget=0.2", "4", "tests/budget_spill.txt"]),
 
     # Edge Cases and Stress Tests
-    run_test("Single Instruction Block",    ["4", "tests/single_line.txt"])
-    run_test("Dead Definition Detection",   ["4", "tests/dead_def.txt"])
-    run_test("Large Integer Values",        ["4", "tests/large_ints.txt"])
-    run_test("Many Temps (t100+)",          ["8", "tests/many_temps.txt"])
-    run_test("Unary Negation Stress",       ["4", "tests/zero_init.txt"])
-    run_test("Mixed Absolute/Immediate",    ["4", "tests/mixed_types.txt"])
-    run_test("Empty Block",                 ["4", "tests/no_instr.txt"])
-    run_test("Extreme Whitespace",          ["4", "tests/whitespace.txt"])
-    run_test("Overlapping Live Ranges",     ["4", "tests/overlapping_ranges.txt"])
-    run_test("Empty File",                  ["4", "tests/test11.txt"])
\ No newline at end of file
+    ("Single Instruction Block",    ["4", "tests/single_line.txt"]),
+    ("Dead Definition Detection",   ["4", "tests/dead_def.txt"]),
+    ("Large Integer Values",        ["4", "tests/large_ints.txt"]),
+    ("Many Temps (t100+)",          ["8", "tests/many_temps.txt"]),
+    ("Unary Negation Stress",       ["4", "tests/zero_init.txt"]),
+    ("Mixed Absolute/Immediate",    ["4", "tests/mixed_types.txt"]),
+    ("Empty Block",                 ["4", "tests/no_instr.txt"]),
+    ("Extreme Whitespace",          ["4", "tests/whitespace.txt"]),
+    ("Overlapping Live Ranges",     ["4", "tests/overlapping_ranges.txt"]),
+    ("Web Splitting (2 regs)",      ["2", "tests/web_split.txt"]),
+    ("In-place Updates (1 reg)",    ["1", "tests/in_place.txt"]),
+    ("In-place Update of an Entry Value (1 reg)", ["1", "tests/in_place_entry.txt"]),
+    ("Single-use Entry Values (3 regs)", ["3", "tests/entry_single_use.txt"]),
+    ("Algebraic Simplification",    ["6", "tests/algebraic.txt"]),
+    ("Rematerialized Constants (2 regs)", ["2", "tests/constants.txt"]),
+    ("Segmented Allocation (6 regs)", ["--segment=10", "6", "tests/segmented.txt"]),
+    ("Portfolio, Saturation Order (5 regs)", ["--portfolio=saturation", "5", "tests/portfolio.txt"]),
+    # The same deterministic strategy twice: the race runs in worker processes, yet its winner is fixed
+    ("Portfolio Race, Uncolourable (2 regs)", ["--portfolio=start,start", "2", "tests/alloc_fail_pressure_vars.txt"]),
+    ("Portfolio, Every Budget Exhausted (3 regs)", ["--portfolio", "--budget=0.000001", "3", "tests/portfolio_budget.txt"]),
+    ("Control Flow Loop (3 regs)",  ["3", "tests/cfg_loop.txt"]),
+    ("Control Flow Branch (4 regs)", ["4", "tests/cfg_branch.txt"]),
+    ("Parallel Parse (2 workers)",  ["--parallel-parse=2", "3", "tests/cfg_loop.txt"]),
+    ("Parallel Parse Error",        ["--parallel-parse=2", "4", "tests/bad_var.txt"]),
+    ("Empty File",                  ["4", "tests/test11.txt"]),
+]
+
+if __name__ == "__main__":
+    for test_name, args in TEST_CASES:
+        run_test(test_name, args)
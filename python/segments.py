@@ -0,0 +1,268 @@
+# segments.py
+# Splits very long blocks at low-pressure points and allocates each segment independently.
+#
+# A web that is live across a cut is split into one piece per segment it touches
+# (named web@k for segment k). Every segment gets its own interference graph, coloured
+# in a worker process, and the pieces of a web are joined by register moves emitted
+# just before the first line of each later segment (see WebMap.transfers).
+
+import os
+from bisect import bisect_right
+
+from liveness import LiveRange, WebMap
+from interference import (InterferenceGraph, STATUS_COLOURED, STATUS_HEURISTIC,
+                          STATUS_UNCOLOURABLE, STATUS_UNDECIDED)
+
+# Target number of lines per segment
+DEFAULT_SEGMENT_LENGTH = 5000
+
+# Blocks at least this long are segmented automatically by main.py
+SEGMENT_THRESHOLD = 20000
+
+
+def crossing_pressure(webs, num_instructions):
+    """
+    Counts the register webs live across each line boundary.
+
+    Returns:
+        List where entry p is the number of webs holding a value between line p - 1 and line p
+    """
+    diff = [0] * (num_instructions + 2)
+    for ranges in webs.values():
+        for r in ranges:
+            # A range [start, end) crosses the boundary before p when start < p < end
+            first, last = r.start_line + 1, r.end_line - 1
+            if first <= last:
+                diff[first] += 1
+                diff[last + 1] -= 1
+
+    pressure = [0] * (num_instructions + 2)
+    running = 0
+    for p in range(num_instructions + 2):
+        running += diff[p]
+        pressure[p] = running
+    return pressure
+
+
+def find_cut_points(webs, num_instructions, segment_length=DEFAULT_SEGMENT_LENGTH):
+    """
+    Picks the lines that start a new segment. Each cut is the boundary with the fewest
+    live webs within a quarter segment of its target position, so few values need moving.
+
+    Returns:
+        Sorted list of line numbers; segment k starts at cuts[k - 1]
+    """
+    if segment_length < 1:
+        raise ValueError("segment length must be at least 1")
+    pressure = crossing_pressure(webs, num_instructions)
+    slack = max(1, segment_length // 4)
+
+    cuts = []
+    previous = 1
+    target = segment_length + 1
+    while target + slack <= num_instructions:
+        low = max(previous + 1, target - slack)
+        high = min(num_instructions, target + slack)
+        best = min(range(low, high + 1), key=lambda p: (pressure[p], abs(p - target)))
+        cuts.append(best)
+        previous = best
+        target = best + segment_length
+    return cuts
+
+
+def _allocate_segment(pieces, num_registers, time_budget, node_budget):
+    """
+    Colours one segment's pieces. Runs in a worker process, so it takes and returns plain data.
+
+    Args:
+        pieces: list of (piece name, variable, start, end)
+
+    Returns:
+        (status, allocations, failed_component, nodes_visited, backtracks, num_edges)
+    """
+    webs = {}
+    for name, var, start, end in pieces:
+        live_range = LiveRange(var, start, end)
+        live_range.web = name
+        webs[name] = [live_range]
+    graph = InterferenceGraph(None, webs)
+    graph.allocate_registers(num_registers, time_budget=time_budget, node_budget=node_budget, workers=1)
+    return (graph.status, graph.allocations, graph.failed_component,
+            graph.nodes_visited, graph.backtracks, graph.num_edges())
+
+
+class SegmentedAllocation:
+    """
+    Register allocation of a block split into segments. Exposes the same results as an
+    InterferenceGraph after allocate_registers (variables, allocations, status, ...).
+    """
+    def __init__(self, analyzer, segment_length=DEFAULT_SEGMENT_LENGTH):
+        """
+        Args:
+            analyzer: A LivenessAnalyzer object that has already run .analyze()
+            segment_length: target number of lines per segment
+        """
+        self.analyzer = analyzer
+        self.num_instructions = len(analyzer.code.instructions)
+        self.cuts = find_cut_points(analyzer.webs, self.num_instructions, segment_length)
+        self.ranges = {}
+        self.segments = []
+        self.web_map = None
+        self.variables = []
+        self.allocations = {}
+        self.status = None
+        self.failed_component = None
+        self.spilled = []
+        self.scratch_register = None
+        self.nodes_visited = 0
+        self.backtracks = 0
+        self.edges = 0
+        self._split()
+
+    def _segment_of(self, line_num):
+        """Returns the index of the segment containing a line (line 0 belongs to the first)."""
+        return bisect_right(self.cuts, line_num)
+
+    def _split(self):
+        """Clips every web to the segments it touches and builds the renamed web map."""
+        bounds = [0] + self.cuts + [self.num_instructions + 1]
+        self.segments = [[] for _ in range(len(bounds) - 1)]
+        self._pieces = {}
+        transfers = {}
+
+        for web, ranges in self.analyzer.webs.items():
+            # Webs come from a single block, so their ranges chain into one unbroken span
+            var = ranges[0].var_name
+            web_start = min(r.start_line for r in ranges)
+            web_end = max(r.end_line for r in ranges)
+            first = self._segment_of(web_start)
+            last = self._segment_of(web_end - 1)
+            if first == last:
+                self._add_piece(first, web, var, web_start, web_end)
+                continue
+
+            self._pieces[web] = True
+            previous = None
+            for k in range(first, last + 1):
+                name = f"{web}@{k}"
+                start = web_start if k == first else bounds[k]
+                end = web_end if k == last else bounds[k + 1]
+                self._add_piece(k, name, var, start, end)
+                if previous is not None:
+                    transfers.setdefault(bounds[k], []).append((var, previous, name))
+                previous = name
+
+        self.web_map = self._renamed_web_map(transfers)
+
+    def _add_piece(self, segment, name, var, start, end):
+        live_range = LiveRange(var, start, end)
+        live_range.web = name
+        self.ranges[name] = [live_range]
+        self.segments[segment].append((name, var, start, end))
+
+    def _piece(self, web, line_num):
+        """Returns the name of the piece of a web that is live on a line."""
+        if web in self._pieces:
+            return f"{web}@{self._segment_of(line_num)}"
+        return web
+
+    def _renamed_web_map(self, transfers):
+        """Copies the analyzer's web map with every split web replaced by its per-segment piece."""
+        old = self.analyzer.web_map
+        new = WebMap()
+        new.defs = {line: self._piece(web, line) for line, web in old.defs.items()}
+        new.uses = {(line, var): self._piece(web, line) for (line, var), web in old.uses.items()}
+        new.loads = {line: [(var, self._piece(web, line)) for var, web in loads]
+                     for line, loads in old.loads.items()}
+        new.exit = {var: self._piece(web, self.num_instructions) for var, web in old.exit.items()}
+        for var, web in old.entry.items():
+            start = self.analyzer.webs[web][0].start_line if web in self.analyzer.webs else 0
+            new.entry[var] = self._piece(web, start)
+        new.in_memory = set(old.in_memory)
+        new.constants = dict(old.constants)
+        new.transfers = transfers
+        return new
+
+    def allocate_registers(self, num_registers, time_budget=None, node_budget=None, workers=None):
+        """
+        Colours every segment, in parallel worker processes when there is more than one.
+        The budgets apply to each segment separately.
+
+        Returns:
+            True if every piece got a register, False otherwise
+        """
+        if workers is None:
+            workers = os.cpu_count() or 1
+        self.allocations = {}
+        self.failed_component = None
+        self.nodes_visited = 0
+        self.backtracks = 0
+        self.edges = 0
+
+        jobs = [(pieces, num_registers, time_budget, node_budget) for pieces in self.segments]
+        if workers > 1 and len(jobs) > 1:
+            from concurrent.futures import ProcessPoolExecutor
+            with ProcessPoolExecutor(max_workers=min(workers, len(jobs))) as pool:
+                results = list(pool.map(_allocate_segment, *zip(*jobs)))
+        else:
+            results = [_allocate_segment(*job) for job in jobs]
+
+        statuses = set()
+        for status, allocations, failed, nodes, backtracks, edges in results:
+            self.nodes_visited += nodes
+            self.backtracks += backtracks
+            self.edges += edges
+            statuses.add(status)
+            if failed and self.failed_component is None:
+                self.failed_component = failed
+            self.allocations.update(allocations)
+        self.variables = sorted(self.ranges.keys())
+
+        for status in (STATUS_UNCOLOURABLE, STATUS_UNDECIDED, STATUS_HEURISTIC):
+            if status in statuses:
+                self.status = status
+                break
+        else:
+            self.status = STATUS_COLOURED
+
+        if self.status in (STATUS_UNCOLOURABLE, STATUS_UNDECIDED):
+            self.allocations = {}
+            return False
+        return True
+
+    def num_edges(self):
+        return self.edges
+
+    def num_transfers(self):
+        return sum(len(moves) for moves in self.web_map.transfers.values())
+
+    def print_graph(self):
+        print("\n--- Segmented Allocation ---")
+        print(f"  {len(self.segments)} segments of {self.num_instructions} lines")
+        print(f"  Cuts before lines: {', '.join(str(c) for c in self.cuts) or '(none)'}")
+        print(f"  Values moved across boundaries: {self.num_transfers()}")
+        print("----------------------------")
+
+    def __repr__(self):
+        return f"<SegmentedAllocation: {len(self.segments)} segments>"
+
+
+if __name__ == "__main__":
+    import tempfile
+    from tacGenerator import generate_tac, write_tac
+    from parser import read_intermediate_code
+    from liveness import LivenessAnalyzer
+
+    with tempfile.TemporaryDirectory() as tmp:
+        path = os.path.join(tmp, "block.txt")
+        write_tac(path, generate_tac(60, pressure=3, seed=1))
+        code = read_intermediate_code(path)
+    analyzer = LivenessAnalyzer(code)
+    analyzer.analyze()
+
+    segmented = SegmentedAllocation(analyzer, segment_length=20)
+    segmented.print_graph()
+    if segmented.allocate_registers(12, workers=1):
+        print(f"Allocated {len(segmented.allocations)} pieces ({segmented.status})")
+    else:
+        print(f"Allocation failed ({segmented.status})")
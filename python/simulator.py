@@ -0,0 +1,199 @@
+# simulator.py
+# Vectorized interpreters for IntermediateCode and TargetCode, for differential testing.
+#
+# Every variable and register holds a NumPy array with one entry per input vector, so a
+# single pass over the code evaluates thousands of inputs at once. Arithmetic is on
+# 64-bit integers (wrapping on overflow); division truncates toward zero and dividing by
+# zero gives 0. Both interpreters use the same rules, so any difference between them on
+# the live-on-exit variables is a bug in code generation or register allocation.
+# Only straight-line code is supported: every vector must take the same path.
+
+import numpy as np
+
+from assemblyInstructions import Opcode, OperandType
+from parserHelper import is_valid_variable
+
+_INT = np.int64
+
+# Range of the random values given to variables on block entry
+DEFAULT_LOW = -1000
+DEFAULT_HIGH = 1000
+
+
+class Mismatch:
+    """The first live-on-exit value where the target code disagrees with the TAC."""
+    def __init__(self, variable, vector, inputs, expected, actual):
+        self.variable = variable
+        self.vector = vector        # index of the input vector
+        self.inputs = inputs        # variable -> value on entry for that vector
+        self.expected = expected
+        self.actual = actual
+
+    def __repr__(self):
+        entry = ", ".join(f"{var}={value}" for var, value in sorted(self.inputs.items()))
+        return (f"<Mismatch: {self.variable} is {self.actual}, expected {self.expected} "
+                f"(vector {self.vector}: {entry})>")
+
+
+def _wrap(value):
+    """Converts a Python integer to the int64 it wraps to."""
+    value = int(value) & 0xFFFFFFFFFFFFFFFF
+    return _INT(value - (1 << 64) if value >= 1 << 63 else value)
+
+
+def _apply(op, a, b):
+    """Applies a binary operator ('+', '-', '*', '/') elementwise."""
+    with np.errstate(over="ignore"):
+        if op == "+":
+            return a + b
+        if op == "-":
+            return a - b
+        if op == "*":
+            return a * b
+    zero = b == 0
+    divisor = np.where(zero, 1, b)
+    with np.errstate(over="ignore"):
+        quotient = np.abs(a) // np.abs(divisor)
+        quotient = np.where((a < 0) != (divisor < 0), -quotient, quotient)
+    return np.where(zero, 0, quotient).astype(_INT)
+
+
+def _negate(a):
+    with np.errstate(over="ignore"):
+        return -a
+
+
+_OPCODE_OPS = {
+    Opcode.ADD: "+",
+    Opcode.SUB: "-",
+    Opcode.MUL: "*",
+    Opcode.DIV: "/",
+}
+
+
+def random_inputs(variables, count, seed=0, low=DEFAULT_LOW, high=DEFAULT_HIGH):
+    """
+    Draws `count` random entry values for every variable.
+
+    Returns:
+        dict of variable -> int64 array of length count
+    """
+    rng = np.random.default_rng(seed)
+    return {var: rng.integers(low, high, size=count, dtype=_INT) for var in sorted(variables)}
+
+
+def evaluate_tac(code, inputs):
+    """
+    Reference evaluator: runs an IntermediateCode block on every input vector.
+
+    Args:
+        code: the IntermediateCode block
+        inputs: dict of variable -> array of entry values (every variable read before it is written)
+
+    Returns:
+        dict of live-on-exit variable -> array of exit values
+    """
+    if code.has_control_flow():
+        raise ValueError("The vectorized simulator only runs straight-line code")
+    count = len(next(iter(inputs.values()))) if inputs else 1
+    env = dict(inputs)
+
+    def value(operand):
+        if is_valid_variable(operand):
+            return env[operand]
+        return np.full(count, _wrap(operand), dtype=_INT)
+
+    for instr in code.instructions:
+        if instr.is_binary():
+            env[instr.dst] = _apply(instr.op, value(instr.src1), value(instr.src2))
+        elif instr.is_unary_negation():
+            env[instr.dst] = _negate(value(instr.src1))
+        else:
+            env[instr.dst] = value(instr.src1)
+    return {var: env[var] for var in code.live_on_exit}
+
+
+def execute_target(target, inputs, live_on_exit):
+    """
+    Runs a TargetCode sequence on every input vector. Memory starts out holding the inputs.
+
+    Args:
+        target: the TargetCode to run
+        inputs: dict of variable -> array of entry values in memory
+        live_on_exit: the variables whose memory values are returned
+
+    Returns:
+        dict of live-on-exit variable -> array of values left in memory
+    """
+    count = len(next(iter(inputs.values()))) if inputs else 1
+    memory = dict(inputs)
+    registers = {}
+
+    def read(operand):
+        if operand.type == OperandType.IMMEDIATE:
+            return np.full(count, _wrap(operand.value), dtype=_INT)
+        if operand.type == OperandType.REGISTER:
+            if operand.value not in registers:
+                raise ValueError(f"R{operand.value} is read before it is written")
+            return registers[operand.value]
+        if operand.value not in memory:
+            raise ValueError(f"Memory location '{operand.value}' is read before it is written")
+        return memory[operand.value]
+
+    def write(operand, value):
+        if operand.type == OperandType.REGISTER:
+            registers[operand.value] = value
+        elif operand.type == OperandType.VARIABLE:
+            memory[operand.value] = value
+        else:
+            raise ValueError(f"Cannot write to immediate operand {operand}")
+
+    for instr in target.instructions:
+        if instr.opcode not in _OPCODE_OPS and instr.opcode != Opcode.MOV:
+            raise ValueError("The vectorized simulator only runs straight-line code")
+        if instr.opcode == Opcode.MOV:
+            write(instr.dst, read(instr.src))
+        else:
+            # dst = dst op src
+            write(instr.dst, _apply(_OPCODE_OPS[instr.opcode], read(instr.dst), read(instr.src)))
+    return {var: memory[var] for var in live_on_exit}
+
+
+def compare(code, target, count=1000, seed=0):
+    """
+    Runs the TAC and the target code on `count` random input vectors and compares every
+    live-on-exit variable.
+
+    Returns:
+        The first Mismatch found, or None if the outputs agree on every vector
+    """
+    inputs = random_inputs(code.get_all_variables(), count, seed)
+    expected = evaluate_tac(code, inputs)
+    actual = execute_target(target, inputs, code.live_on_exit)
+    for var in sorted(code.live_on_exit):
+        differs = np.nonzero(expected[var] != actual[var])[0]
+        if len(differs):
+            vector = int(differs[0])
+            entry = {name: int(values[vector]) for name, values in inputs.items()}
+            return Mismatch(var, vector, entry, int(expected[var][vector]), int(actual[var][vector]))
+    return None
+
+
+if __name__ == "__main__":
+    from threeAddress import IntermediateCode, ThreeAddressInstruction
+    from liveness import LivenessAnalyzer
+    from interference import InterferenceGraph
+    from codegen import generate_target_code
+
+    code = IntermediateCode()
+    code.add_instruction(ThreeAddressInstruction("t1", "a", "+", "b"))
+    code.add_instruction(ThreeAddressInstruction("t2", "t1", "*", "2"))
+    code.add_instruction(ThreeAddressInstruction("d", "t2", "/", "c"))
+    code.set_live_on_exit(["d"])
+
+    analyzer = LivenessAnalyzer(code)
+    analyzer.analyze()
+    graph = InterferenceGraph(analyzer)
+    graph.allocate_registers(4)
+    target = generate_target_code(code, graph.allocations, analyzer.live_at_entry, analyzer.web_map)
+    print(compare(code, target, count=10000) or "Target code matches on 10000 input vectors")
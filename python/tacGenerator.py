@@ -0,0 +1,97 @@
+# tacGenerator.py
+# Seeded generator of synthetic three-address code blocks for stress tests and benchmarks
+
+import argparse
+import random
+
+# Single-letter variables allowed by the spec ('t' is reserved for temporaries)
+NAMED_VARIABLES = [c for c in "abcdefghijklmnopqrsuvwxyz"]
+
+_OPERATORS = ["+", "-", "*", "/"]
+
+
+def generate_tac(num_instructions, num_vars=8, temp_reuse=0.5, pressure=4, seed=0):
+    """
+    Generates a random but valid TAC block as a list of lines (the last one is the live: line).
+
+    Args:
+        num_instructions: number of instruction lines in the block
+        num_vars: how many single-letter variables may appear (at most 25)
+        temp_reuse: probability that a temporary definition reuses an old temp name
+            instead of a fresh one, which creates several webs per name
+        pressure: operands are mostly drawn from the last `pressure` values defined,
+            so roughly that many values are live at any point
+        seed: random seed, so the same arguments always produce the same block
+
+    Returns:
+        List of strings, one per line, without trailing newlines
+    """
+    rng = random.Random(seed)
+    named = NAMED_VARIABLES[:max(1, min(num_vars, len(NAMED_VARIABLES)))]
+    pressure = max(1, pressure)
+
+    recent = []        # most recently defined values, newest last
+    old_temps = []     # temp names that have dropped out of the recent window
+    next_temp = 1
+    lines = []
+
+    def pick_operand():
+        roll = rng.random()
+        if recent and roll < 0.75:
+            return rng.choice(recent)
+        if roll < 0.9:
+            return rng.choice(named)
+        return str(rng.randint(1, 100))
+
+    for _ in range(num_instructions):
+        # Choose the destination: a named variable or a (possibly reused) temporary
+        if rng.random() < 0.25:
+            dst = rng.choice(named)
+        elif old_temps and rng.random() < temp_reuse:
+            dst = old_temps.pop(rng.randrange(len(old_temps)))
+        else:
+            dst = f"t{next_temp}"
+            next_temp += 1
+
+        shape = rng.random()
+        if shape < 0.8:
+            op = rng.choice(_OPERATORS)
+            src2 = str(rng.randint(1, 100)) if op == "/" else pick_operand()
+            lines.append(f"{dst} = {pick_operand()} {op} {src2}")
+        elif shape < 0.9:
+            lines.append(f"{dst} = -{pick_operand()}")
+        else:
+            lines.append(f"{dst} = {pick_operand()}")
+
+        if dst in recent:
+            recent.remove(dst)
+        recent.append(dst)
+        if len(recent) > pressure:
+            dropped = recent.pop(0)
+            if dropped.startswith("t"):
+                old_temps.append(dropped)
+
+    live = sorted(set(recent[-min(len(recent), pressure):]))
+    lines.append("live: " + ", ".join(live))
+    return lines
+
+
+def write_tac(filename, lines):
+    """Writes generated TAC lines to a file."""
+    with open(filename, "w") as f:
+        f.write("\n".join(lines) + "\n")
+
+
+if __name__ == "__main__":
+    arg_parser = argparse.ArgumentParser(description="Generate a synthetic TAC block.")
+    arg_parser.add_argument("num_instructions", type=int)
+    arg_parser.add_argument("output_file")
+    arg_parser.add_argument("--vars", type=int, default=8, help="number of named variables")
+    arg_parser.add_argument("--reuse", type=float, default=0.5, help="temporary reuse probability")
+    arg_parser.add_argument("--pressure", type=int, default=4, help="target number of live values")
+    arg_parser.add_argument("--seed", type=int, default=0)
+    args = arg_parser.parse_args()
+
+    tac = generate_tac(args.num_instructions, args.vars, args.reuse, args.pressure, args.seed)
+    write_tac(args.output_file, tac)
+    print(f"Wrote {args.num_instructions} instructions to {args.output_file}")
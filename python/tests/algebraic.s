@@ -0,0 +1,14 @@
+MOV a,R0
+MOV R0,R1
+MOV #0,R0
+MOV R1,R2
+ADD R2,R2
+MOV #7,R1
+MOV #0,R3
+MOV R0,R4
+ADD R1,R4
+MOV R4,R0
+ADD R3,R0
+MOV R0,R1
+MOV R2,e
+MOV R1,m
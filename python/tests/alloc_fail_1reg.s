@@ -0,0 +1,2 @@
+MOV #3,R0
+MOV R0,c
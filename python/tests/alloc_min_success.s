@@ -0,0 +1,4 @@
+MOV #3,R0
+MOV #-1,R1
+MOV R0,c
+MOV R1,d
@@ -0,0 +1,177 @@
+MOV h,R0
+DIV #6,R0
+MOV R0,R1
+MUL #46,R1
+MOV a,R0
+DIV #91,R0
+MOV #-1600,R1
+MOV R1,R2
+MOV R0,R1
+SUB #-40,R1
+MOV R0,R3
+ADD R2,R3
+MOV R3,t9
+MOV t9,R0
+MOV R0,R2
+MUL R1,R2
+MOV t9,R1
+SUB R0,R1
+MOV #0,R3
+SUB R0,R3
+MOV R3,c
+MOV #40,R0
+ADD R1,R0
+MOV R2,R3
+SUB R0,R3
+MOV R3,a
+MOV R0,R2
+MUL R1,R2
+MOV a,R0
+ADD R2,R0
+MOV c,R1
+SUB #8,R1
+MOV R1,R2
+DIV #86,R2
+MOV R0,R1
+ADD R0,R1
+MOV R1,R0
+MUL R2,R0
+MOV R0,R1
+SUB #-84,R1
+MOV R1,R2
+DIV #5,R2
+MOV a,R0
+ADD R2,R0
+MOV e,R1
+ADD R0,R1
+MOV #0,R2
+SUB R0,R2
+MOV R1,R0
+ADD c,R0
+MOV R2,R3
+ADD R1,R3
+MOV R3,c
+MOV c,R1
+MOV c,R2
+MUL c,R2
+MOV R0,R3
+MUL #40,R3
+MOV R3,c
+MUL R1,R3
+MOV R3,c
+MOV R0,R3
+ADD R2,R3
+MOV R3,t22
+MOV t22,R0
+MUL R1,R0
+MOV R2,R1
+SUB #81,R1
+MOV R0,R2
+SUB c,R2
+MOV #58,R3
+ADD a,R3
+MOV R3,t8
+MOV R1,R3
+SUB R2,R3
+MOV R3,t2
+MOV #0,R3
+MOV R3,g
+MOV t8,R3
+MUL R0,R3
+MOV R3,t20
+ADD R0,R3
+MOV R3,c
+MOV t20,R3
+MUL t20,R3
+MOV R3,t24
+ADD t24,R3
+MOV R3,t3
+MOV R3,t14
+MOV t24,R3
+SUB t3,R3
+MOV R3,t5
+SUB R1,R3
+MOV R3,t17
+MOV R0,R3
+DIV #15,R3
+MOV R3,t26
+MOV #50,R3
+MUL c,R3
+MOV R3,t27
+MOV t26,R3
+DIV #57,R3
+MOV R3,t29
+MOV t26,R3
+ADD #6,R3
+MOV R3,t30
+MOV t27,R3
+SUB t30,R3
+MOV R3,t31
+MOV t29,R3
+ADD #54,R3
+MOV R3,g
+MOV t29,R3
+MUL t29,R3
+MOV R3,t32
+MOV R2,R3
+MOV R3,t27
+MOV t31,R2
+ADD t32,R2
+MOV t32,R3
+ADD t27,R3
+MOV R3,t6
+MOV R2,R3
+MUL t32,R3
+MOV R3,t15
+MOV t15,R2
+DIV #39,R2
+MOV t15,R3
+DIV #81,R3
+MOV R3,t2
+MOV R0,R3
+MUL R2,R3
+MOV R3,t16
+MOV #-25,R0
+MOV t2,R2
+SUB R0,R2
+MOV R2,R0
+MUL t16,R0
+MOV t16,R3
+SUB R0,R3
+MOV R3,h
+MOV g,R3
+DIV #68,R3
+MOV R3,a
+MOV h,R3
+SUB R2,R3
+MOV R3,t34
+MOV #0,R2
+SUB R0,R2
+MOV #70,R3
+SUB R2,R3
+MOV R3,t22
+MOV a,R3
+MUL t34,R3
+MOV R3,t35
+MOV R2,R3
+ADD t22,R3
+MOV R3,t37
+MOV t22,R2
+ADD R0,R2
+MOV t37,R0
+ADD t35,R0
+MOV R2,R3
+DIV #19,R3
+MOV R3,t23
+MOV #5,R2
+SUB R0,R2
+MOV #0,R0
+SUB t23,R0
+MOV t23,R3
+MUL R1,R3
+MOV R3,e
+MOV R2,R1
+DIV #28,R1
+MOV R0,b
+MOV #95,t41
+MOV R1,t42
@@ -0,0 +1,16 @@
+MOV a,R0
+MOV b,R1
+MOV R0,R2
+SUB R1,R2
+JNZ R2,diff
+MOV R0,R2
+JMP join
+diff:
+MOV R2,R3
+MUL R2,R3
+MOV R3,R2
+ADD R1,R2
+join:
+MOV R2,R1
+ADD R0,R1
+MOV R1,d
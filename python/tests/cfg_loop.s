@@ -0,0 +1,16 @@
+MOV n,R1
+MOV #0,R2
+MOV R1,R0
+loop:
+JNZ R0,body
+JMP done
+body:
+MOV R0,R1
+MUL R0,R1
+ADD R1,R2
+SUB #1,R0
+JMP loop
+done:
+MOV R2,R0
+ADD R0,R0
+MOV R0,t2
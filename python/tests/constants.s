@@ -0,0 +1,8 @@
+MOV a,R0
+MUL #100,R0
+MOV R0,R1
+ADD #-7,R1
+MOV R1,R0
+DIV #100,R0
+MOV R0,b
+MOV #-7,t2
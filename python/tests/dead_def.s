@@ -1,4 +1,2 @@
-MOV #5,R0
-MOV R0,R1
-ADD #1,R1
-MOV R1,c
+MOV #6,R0
+MOV R0,c
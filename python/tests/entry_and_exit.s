@@ -1,9 +1,6 @@
-MOV x,R1
-MOV y,R2
-MOV z,R3
-MOV R1,R0
-ADD R2,R0
-MOV R3,R1
+MOV x,R0
+ADD y,R0
+MOV z,R1
 ADD R0,R1
 MOV R0,R2
 ADD R1,R2
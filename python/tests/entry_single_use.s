@@ -0,0 +1,9 @@
+MOV a,R0
+ADD b,R0
+MOV c,R1
+ADD d,R1
+MOV R0,R2
+MUL R1,R2
+MOV R2,R0
+ADD f,R0
+MOV R0,e
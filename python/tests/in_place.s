@@ -0,0 +1,4 @@
+MOV x,R0
+ADD #1,R0
+MUL #3,R0
+MOV R0,x
@@ -0,0 +1,3 @@
+MOV a,R0
+DIV #91,R0
+MOV R0,a
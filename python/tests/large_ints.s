@@ -1,4 +1,2 @@
-MOV #999999,R0
-MOV R0,R1
-MUL #123456,R1
-MOV R1,b
+MOV #123455876544,R0
+MOV R0,b
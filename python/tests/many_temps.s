@@ -1,8 +1,4 @@
-MOV #1,R0
-MOV #2,R2
-MOV #3,R3
+MOV #3,R0
 MOV R0,R1
-ADD R2,R1
-MOV R1,R0
-ADD R3,R0
-MOV R0,t101
+ADD #3,R1
+MOV R1,t101
@@ -1,6 +1,4 @@
-MOV #5,R0
-MOV R0,R2
-ADD #10,R2
-MOV R2,R1
-MUL R0,R1
-MOV R1,b
+MOV #15,R1
+MOV R1,R0
+MUL #5,R0
+MOV R0,b
@@ -1,6 +1,4 @@
-MOV #1,R0
+MOV #2,R0
 MOV R0,R1
 ADD #1,R1
-MOV R1,R0
-ADD #1,R0
-MOV R0,c
+MOV R1,c
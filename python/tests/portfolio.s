@@ -0,0 +1,17 @@
+MOV v,R2
+MOV R2,R0
+ADD #1,R0
+MOV R2,R1
+ADD #2,R1
+MOV w,R4
+MOV R4,R2
+ADD #3,R2
+MOV R4,R3
+ADD #4,R3
+MOV R0,R4
+ADD R1,R4
+MOV R2,R0
+ADD R3,R0
+MOV R4,R1
+MUL R0,R1
+MOV R1,g
@@ -0,0 +1,562 @@
+MOV a,R0
+MOV R0,R1
+ADD b,R1
+MOV R1,R2
+MUL R0,R2
+MOV R2,R1
+MUL R0,R1
+MOV R1,R2
+MUL R0,R2
+MOV R2,R1
+MUL R0,R1
+MOV R1,R2
+MUL R0,R2
+MOV R2,R1
+MUL R0,R1
+MOV R1,R2
+MUL R0,R2
+MOV R2,R1
+MUL R0,R1
+MOV R1,R2
+MUL R0,R2
+MOV R2,R1
+MUL R0,R1
+MOV R1,R2
+MUL R0,R2
+MOV R2,R1
+MUL R0,R1
+MOV R1,R2
+MUL R0,R2
+MOV R2,R1
+MUL R0,R1
+MOV R1,R2
+MUL R0,R2
+MOV R2,R1
+MUL R0,R1
+MOV R1,R2
+MUL R0,R2
+MOV R2,R1
+MUL R0,R1
+MOV R1,R2
+MUL R0,R2
+MOV R2,R1
+MUL R0,R1
+MOV R1,R2
+MUL R0,R2
+MOV R2,R1
+MUL R0,R1
+MOV R1,R2
+MUL R0,R2
+MOV R2,R1
+MUL R0,R1
+MOV R1,R2
+MUL R0,R2
+MOV R2,R1
+MUL R0,R1
+MOV R1,R2
+MUL R0,R2
+MOV R2,R1
+MUL R0,R1
+MOV R1,R2
+MUL R0,R2
+MOV R2,R1
+MUL R0,R1
+MOV R1,R2
+MUL R0,R2
+MOV R2,R1
+MUL R0,R1
+MOV R1,R2
+MUL R0,R2
+MOV R2,R1
+MUL R0,R1
+MOV R1,R2
+MUL R0,R2
+MOV R2,R1
+MUL R0,R1
+MOV R1,R2
+MUL R0,R2
+MOV R2,R1
+MUL R0,R1
+MOV R1,R2
+MUL R0,R2
+MOV R2,R1
+MUL R0,R1
+MOV R1,R2
+MUL R0,R2
+MOV R2,R1
+MUL R0,R1
+MOV R1,R2
+MUL R0,R2
+MOV R2,R1
+MUL R0,R1
+MOV R1,R2
+MUL R0,R2
+MOV R2,R1
+MUL R0,R1
+MOV R1,R2
+MUL R0,R2
+MOV R2,R1
+MUL R0,R1
+MOV R1,R2
+MUL R0,R2
+MOV R2,R1
+MUL R0,R1
+MOV R1,R2
+MUL R0,R2
+MOV R2,R1
+MUL R0,R1
+MOV R1,R2
+MUL R0,R2
+MOV R2,R1
+MUL R0,R1
+MOV R1,R2
+MUL R0,R2
+MOV R2,R1
+MUL R0,R1
+MOV R1,R2
+MUL R0,R2
+MOV R2,R1
+MUL R0,R1
+MOV R1,R2
+MUL R0,R2
+MOV R2,R1
+MUL R0,R1
+MOV R1,R2
+MUL R0,R2
+MOV R2,R1
+MUL R0,R1
+MOV R1,R2
+MUL R0,R2
+MOV R2,R1
+MUL R0,R1
+MOV R1,R2
+MUL R0,R2
+MOV R2,R1
+MUL R0,R1
+MOV R1,R2
+MUL R0,R2
+MOV R2,R1
+MUL R0,R1
+MOV R1,R2
+MUL R0,R2
+MOV R2,R1
+MUL R0,R1
+MOV R1,R2
+MUL R0,R2
+MOV R2,R1
+MUL R0,R1
+MOV R1,R2
+MUL R0,R2
+MOV R2,R1
+MUL R0,R1
+MOV R1,R2
+MUL R0,R2
+MOV R2,R1
+MUL R0,R1
+MOV R1,R2
+MUL R0,R2
+MOV R2,R1
+MUL R0,R1
+MOV R1,R2
+MUL R0,R2
+MOV R2,R1
+MUL R0,R1
+MOV R1,R2
+MUL R0,R2
+MOV R2,R1
+MUL R0,R1
+MOV R1,R2
+MUL R0,R2
+MOV R2,R1
+MUL R0,R1
+MOV R1,R2
+MUL R0,R2
+MOV R2,R1
+MUL R0,R1
+MOV R1,R2
+MUL R0,R2
+MOV R2,R1
+MUL R0,R1
+MOV R1,R2
+MUL R0,R2
+MOV R2,R1
+MUL R0,R1
+MOV R1,R2
+MUL R0,R2
+MOV R2,R1
+MUL R0,R1
+MOV R1,R2
+MUL R0,R2
+MOV R2,R1
+MUL R0,R1
+MOV R1,R2
+MUL R0,R2
+MOV R2,R1
+MUL R0,R1
+MOV R1,R2
+MUL R0,R2
+MOV R2,R1
+MUL R0,R1
+MOV R1,R2
+MUL R0,R2
+MOV R2,R1
+MUL R0,R1
+MOV R1,R2
+MUL R0,R2
+MOV R2,R1
+MUL R0,R1
+MOV R1,R2
+MUL R0,R2
+MOV R2,R1
+MUL R0,R1
+MOV R1,R2
+MUL R0,R2
+MOV R2,R1
+MUL R0,R1
+MOV R1,R2
+MUL R0,R2
+MOV R2,R1
+MUL R0,R1
+MOV R1,R2
+MUL R0,R2
+MOV R2,R1
+MUL R0,R1
+MOV R1,R2
+MUL R0,R2
+MOV R2,R1
+MUL R0,R1
+MOV R1,R2
+MUL R0,R2
+MOV R2,R1
+MUL R0,R1
+MOV R1,R2
+MUL R0,R2
+MOV R2,R1
+MUL R0,R1
+MOV R1,R2
+MUL R0,R2
+MOV R2,R1
+MUL R0,R1
+MOV R1,R2
+MUL R0,R2
+MOV R2,R1
+MUL R0,R1
+MOV R1,R2
+MUL R0,R2
+MOV R2,R1
+MUL R0,R1
+MOV R1,R2
+MUL R0,R2
+MOV R2,R1
+MUL R0,R1
+MOV R1,R2
+MUL R0,R2
+MOV R2,R1
+MUL R0,R1
+MOV R1,R2
+MUL R0,R2
+MOV R2,R1
+MUL R0,R1
+MOV R1,R2
+MUL R0,R2
+MOV R2,R1
+MUL R0,R1
+MOV R1,R2
+MUL R0,R2
+MOV R2,R1
+MUL R0,R1
+MOV R1,R2
+MUL R0,R2
+MOV R2,R1
+MUL R0,R1
+MOV R1,R2
+MUL R0,R2
+MOV R2,R1
+MUL R0,R1
+MOV R1,R2
+MUL R0,R2
+MOV R2,R1
+MUL R0,R1
+MOV R1,R2
+MUL R0,R2
+MOV R2,R1
+MUL R0,R1
+MOV R1,R2
+MUL R0,R2
+MOV R2,R1
+MUL R0,R1
+MOV R1,R2
+MUL R0,R2
+MOV R2,R1
+MUL R0,R1
+MOV R1,R2
+MUL R0,R2
+MOV R2,R1
+MUL R0,R1
+MOV R1,R2
+MUL R0,R2
+MOV R2,R1
+MUL R0,R1
+MOV R1,R2
+MUL R0,R2
+MOV R2,R1
+MUL R0,R1
+MOV R1,R2
+MUL R0,R2
+MOV R2,R1
+MUL R0,R1
+MOV R1,R2
+MUL R0,R2
+MOV R2,R1
+MUL R0,R1
+MOV R1,R2
+MUL R0,R2
+MOV R2,R1
+MUL R0,R1
+MOV R1,R2
+MUL R0,R2
+MOV R2,R1
+MUL R0,R1
+MOV R1,R2
+MUL R0,R2
+MOV R2,R1
+MUL R0,R1
+MOV R1,R2
+MUL R0,R2
+MOV R2,R1
+MUL R0,R1
+MOV R1,R2
+MUL R0,R2
+MOV R2,R1
+MUL R0,R1
+MOV R1,R2
+MUL R0,R2
+MOV R2,R1
+MUL R0,R1
+MOV R1,R2
+MUL R0,R2
+MOV R2,R1
+MUL R0,R1
+MOV R1,R2
+MUL R0,R2
+MOV R2,R1
+MUL R0,R1
+MOV R1,R2
+MUL R0,R2
+MOV R2,R1
+MUL R0,R1
+MOV R1,R2
+MUL R0,R2
+MOV R2,R1
+MUL R0,R1
+MOV R1,R2
+MUL R0,R2
+MOV R2,R1
+MUL R0,R1
+MOV R1,R2
+MUL R0,R2
+MOV R2,R1
+MUL R0,R1
+MOV R1,R2
+MUL R0,R2
+MOV R2,R1
+MUL R0,R1
+MOV R1,R2
+MUL R0,R2
+MOV R2,R1
+MUL R0,R1
+MOV R1,R2
+MUL R0,R2
+MOV R2,R1
+MUL R0,R1
+MOV R1,R2
+MUL R0,R2
+MOV R2,R1
+MUL R0,R1
+MOV R1,R2
+MUL R0,R2
+MOV R2,R1
+MUL R0,R1
+MOV R1,R2
+MUL R0,R2
+MOV R2,R1
+MUL R0,R1
+MOV R1,R2
+MUL R0,R2
+MOV R2,R1
+MUL R0,R1
+MOV R1,R2
+MUL R0,R2
+MOV R2,R1
+MUL R0,R1
+MOV R1,R2
+MUL R0,R2
+MOV R2,R1
+MUL R0,R1
+MOV R1,R2
+MUL R0,R2
+MOV R2,R1
+MUL R0,R1
+MOV R1,R2
+MUL R0,R2
+MOV R2,R1
+MUL R0,R1
+MOV R1,R2
+MUL R0,R2
+MOV R2,R1
+MUL R0,R1
+MOV R1,R2
+MUL R0,R2
+MOV R2,R1
+MUL R0,R1
+MOV R1,R2
+MUL R0,R2
+MOV R2,R1
+MUL R0,R1
+MOV R1,R2
+MUL R0,R2
+MOV R2,R1
+MUL R0,R1
+MOV R1,R2
+MUL R0,R2
+MOV R2,R1
+MUL R0,R1
+MOV R1,R2
+MUL R0,R2
+MOV R2,R1
+MUL R0,R1
+MOV R1,R2
+MUL R0,R2
+MOV R2,R1
+MUL R0,R1
+MOV R1,R2
+MUL R0,R2
+MOV R2,R1
+MUL R0,R1
+MOV R1,R2
+MUL R0,R2
+MOV R2,R1
+MUL R0,R1
+MOV R1,R2
+MUL R0,R2
+MOV R2,R1
+MUL R0,R1
+MOV R1,R2
+MUL R0,R2
+MOV R2,R1
+MUL R0,R1
+MOV R1,R2
+MUL R0,R2
+MOV R2,R1
+MUL R0,R1
+MOV R1,R2
+MUL R0,R2
+MOV R2,R1
+MUL R0,R1
+MOV R1,R2
+MUL R0,R2
+MOV R2,R1
+MUL R0,R1
+MOV R1,R2
+MUL R0,R2
+MOV R2,R1
+MUL R0,R1
+MOV R1,R2
+MUL R0,R2
+MOV R2,R1
+MUL R0,R1
+MOV R1,R2
+MUL R0,R2
+MOV R2,R1
+MUL R0,R1
+MOV R1,R2
+MUL R0,R2
+MOV R2,R1
+MUL R0,R1
+MOV R1,R2
+MUL R0,R2
+MOV R2,R1
+MUL R0,R1
+MOV R1,R2
+MUL R0,R2
+MOV R2,R1
+MUL R0,R1
+MOV R1,R2
+MUL R0,R2
+MOV R2,R1
+MUL R0,R1
+MOV R1,R2
+MUL R0,R2
+MOV R2,R1
+MUL R0,R1
+MOV R1,R2
+MUL R0,R2
+MOV R2,R1
+MUL R0,R1
+MOV R1,R2
+MUL R0,R2
+MOV R2,R1
+MUL R0,R1
+MOV R1,R2
+MUL R0,R2
+MOV R2,R1
+MUL R0,R1
+MOV R1,R2
+MUL R0,R2
+MOV R2,R1
+MUL R0,R1
+MOV R1,R2
+MUL R0,R2
+MOV R2,R1
+MUL R0,R1
+MOV R1,R2
+MUL R0,R2
+MOV R2,R1
+MUL R0,R1
+MOV R1,R2
+MUL R0,R2
+MOV R2,R1
+MUL R0,R1
+MOV R1,R2
+MUL R0,R2
+MOV R2,R1
+MUL R0,R1
+MOV R1,R2
+MUL R0,R2
+MOV R2,R1
+MUL R0,R1
+MOV R1,R2
+MUL R0,R2
+MOV R2,R1
+MUL R0,R1
+MOV R1,R2
+MUL R0,R2
+MOV R2,R1
+MUL R0,R1
+MOV R1,R2
+MUL R0,R2
+MOV R2,R1
+MUL R0,R1
+MOV R1,R2
+MUL R0,R2
+MOV R2,R1
+MUL R0,R1
+MOV R1,R2
+MUL R0,R2
+MOV R2,R1
+MUL R0,R1
+MOV R1,R2
+MUL R0,R2
+MOV R2,R1
+MUL R0,R1
+MOV R1,R2
+MUL R0,R2
+MOV R2,R1
+MUL R0,R1
+MOV R1,R2
+MUL R0,R2
+MOV R2,R1
+MUL R0,R1
+MOV R1,R2
+MUL R0,R2
+MOV R2,t280
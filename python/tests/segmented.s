@@ -0,0 +1,66 @@
+MOV b,R0
+MOV R0,R1
+MUL R0,R1
+MOV c,R0
+MOV R0,R2
+MUL #55,R2
+MOV #0,R3
+MOV f,R1
+MOV R3,R2
+DIV #84,R2
+MOV e,R3
+SUB #90,R3
+MOV R3,R2
+MOV R3,R4
+ADD R1,R4
+MOV R0,R1
+SUB R2,R1
+MOV R1,R2
+MOV #0,R3
+SUB R1,R3
+MOV R3,R1
+SUB R2,R1
+MOV R1,R2
+DIV #4,R2
+MOV R0,R3
+MOV R2,R0
+ADD R1,R0
+MOV R0,R1
+DIV #84,R1
+MOV #0,R0
+MOV R1,R2
+MUL R0,R2
+MOV R0,R1
+ADD R0,R1
+MOV R1,R0
+ADD R2,R0
+MOV R0,R2
+DIV #55,R2
+MOV R1,R0
+MOV R0,R1
+MOV R2,R3
+ADD R2,R3
+MOV h,R2
+ADD R3,R2
+MOV R2,R0
+MUL R2,R0
+MOV R0,R2
+DIV #38,R2
+MOV #54,R0
+DIV #93,R0
+MOV R2,R1
+SUB R0,R1
+MOV #19,R0
+ADD R2,R0
+MOV R0,t15
+MOV R1,R0
+MOV t15,R1
+MOV R1,R2
+ADD R0,R2
+MOV #97,R0
+MUL R2,R0
+MOV R0,R3
+MUL R1,R3
+MOV R2,t16
+MOV R0,t17
+MOV R3,t3
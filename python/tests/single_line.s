@@ -1,2 +1 @@
-MOV #10,R0
-MOV R0,a
+MOV #10,a
@@ -1,17 +1,15 @@
 MOV a,R0
-MOV c,R1
-MOV R0,R0
 ADD #1,R0
-MOV R0,R2
-MUL #4,R2
-MOV R2,R3
-ADD #1,R3
-MOV R0,R2
-MUL #3,R2
-MOV R3,R0
-SUB R2,R0
-MOV R0,R2
-DIV #2,R2
-MOV R1,R0
-ADD R2,R0
+MOV R0,R1
+MUL #4,R1
+MOV R1,R2
+ADD #1,R2
+MOV R0,R1
+MUL #3,R1
+MOV R2,R0
+SUB R1,R0
+MOV R0,R1
+DIV #2,R1
+MOV c,R0
+ADD R1,R0
 MOV R0,d
@@ -1,8 +1,4 @@
-MOV #1,R0
-MOV #2,R1
-MOV R0,R2
-ADD R1,R2
-MOV R0,R3
-SUB R1,R3
-MOV R2,c
-MOV R3,d
+MOV #3,R0
+MOV #-1,R1
+MOV R0,c
+MOV R1,d
@@ -1,5 +1,2 @@
-MOV #10,R0
-MOV R0,R1
-MOV R1,R0
-ADD #5,R0
+MOV #15,R0
 MOV R0,z
@@ -1,8 +1,4 @@
-MOV #5,R0
-MOV #0,R1
-SUB R0,R1
-MOV R1,R0
-MUL #2,R0
+MOV #-10,R0
 MOV #0,R1
 SUB R0,R1
 MOV R1,d
@@ -1,6 +1,4 @@
 MOV a,R0
-MOV b,R1
-MOV R0,R2
-ADD R1,R2
-MOV R2,R0
-MUL #2,R0
+ADD b,R0
+MOV R0,R1
+ADD R1,R1
@@ -1,13 +1,10 @@
-MOV #1,R0
-MOV #2,R1
-MOV R0,R2
-ADD R1,R2
-MOV R2,R3
-MUL #2,R3
-MOV R3,R2
-SUB R0,R2
-MOV R2,R3
-DIV R1,R3
-MOV R3,R0
+MOV #3,R0
+MOV R0,R1
+ADD R1,R1
+MOV R1,R0
+SUB #1,R0
+MOV R0,R1
+DIV #2,R1
+MOV R1,R0
 ADD #1,R0
 MOV R0,d
@@ -0,0 +1,5 @@
+MOV #3,R0
+MOV #7,R1
+MOV R0,R2
+MUL R1,R2
+MOV R2,g
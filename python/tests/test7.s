@@ -1,7 +1,4 @@
-MOV #5,R0
-MOV R0,R1
-ADD #1,R1
-MOV #10,R0
-MOV R0,R2
-ADD R1,R2
-MOV R2,c
+MOV #6,R0
+MOV #10,R1
+ADD R0,R1
+MOV R1,c
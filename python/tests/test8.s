@@ -1,9 +1,6 @@
-MOV #10,R0
-MOV #20,R1
-MOV R0,R2
-ADD R1,R2
-MOV R2,R3
-MUL R0,R3
-MOV R3,R0
-SUB R1,R0
+MOV #30,R0
+MOV R0,R1
+MUL #10,R1
+MOV R1,R0
+SUB #20,R0
 MOV R0,t5
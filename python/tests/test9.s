@@ -1,7 +1,5 @@
-MOV x,R1
-MOV y,R2
-MOV R1,R0
-ADD R2,R0
+MOV x,R0
+ADD y,R0
 MOV R0,R1
-MUL #2,R1
+ADD R1,R1
 MOV R1,b
@@ -0,0 +1,8 @@
+MOV #3,R0
+MOV R0,R1
+MUL #3,R1
+MOV R1,R0
+ADD #1,R0
+MOV R0,R1
+ADD R1,R1
+MOV R1,b
@@ -1,8 +1 @@
-MOV #5,R0
-MOV #0,R1
-SUB R0,R1
-MOV #0,R0
-SUB R1,R0
-MOV #0,R1
-SUB R0,R1
-MOV R1,d
+MOV #-5,d
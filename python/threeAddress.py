@@ -33,6 +33,14 @@ class ThreeAddressInstruction:
     def is_assignment(self):
         """Returns True if this is simple assignment (dst = src)"""
         return self.op is None and self.src2 is None
+
+    def is_label(self):
+        """Returns True if this is a label (name:)"""
+        return False
+
+    def is_jump(self):
+        """Returns True if this is a jump (goto L or if x goto L)"""
+        return False
     
     def get_used_variables(self):
         """Returns a list of all variables used by this instruction"""
@@ -66,6 +74,79 @@ class ThreeAddressInstruction:
         return self.__repr__()
 
 
+class LabelInstruction(ThreeAddressInstruction):
+    """
+    Marks a jump target: 'name:'
+    A label defines and uses no variables.
+    """
+    def __init__(self, label):
+        super().__init__(None, None)
+        self.label = label
+
+    def is_assignment(self):
+        return False
+
+    def is_label(self):
+        return True
+
+    def get_used_variables(self):
+        return []
+
+    def __repr__(self):
+        return f"{self.label}:"
+
+
+class JumpInstruction(ThreeAddressInstruction):
+    """
+    Transfers control to a label.
+
+    2 Cases:
+      - goto L          (unconditional)
+      - if src goto L   (taken when src is not zero)
+    """
+    def __init__(self, label, condition=None):
+        super().__init__(None, condition)
+        self.label = label
+
+    def is_assignment(self):
+        return False
+
+    def is_jump(self):
+        return True
+
+    def is_conditional(self):
+        """Returns True if the jump depends on a condition operand"""
+        return self.src1 is not None
+
+    def __repr__(self):
+        if self.is_conditional():
+            return f"if {self.src1} goto {self.label}"
+        return f"goto {self.label}"
+
+
+def check_labels(defined, targets):
+    """
+    Validates label names gathered in program order: each defined label must be unique
+    and each jump target must be defined.
+
+    Args:
+        defined: labels in the order they are defined
+        targets: jump targets in the order the jumps appear
+
+    Returns:
+        (is_valid, error_message)
+    """
+    labels = set()
+    for label in defined:
+        if label in labels:
+            return False, f"Label '{label}' is defined more than once"
+        labels.add(label)
+    for label in targets:
+        if label not in labels:
+            return False, f"Jump to undefined label '{label}'"
+    return True, None
+
+
 class IntermediateCode:
     """
     Represents a sequence of three-address instructions plus live-on-exit variables.
@@ -88,11 +169,26 @@ class IntermediateCode:
         """Returns a set of all variables mentioned in the code"""
         variables = set()
         for instr in self.instructions:
-            variables.add(instr.get_defined_variable())
+            defined_var = instr.get_defined_variable()
+            if defined_var:
+                variables.add(defined_var)
             for var in instr.get_used_variables():
                 variables.add(var)
         return variables
     
+    def has_control_flow(self):
+        """Returns True if the code contains labels or jumps, i.e. is more than one basic block"""
+        return any(instr.is_label() or instr.is_jump() for instr in self.instructions)
+
+    def validate_labels(self):
+        """
+        Validates that labels are unique and every jump targets a defined label.
+        Returns (is_valid, error_message).
+        """
+        defined = [instr.label for instr in self.instructions if instr.is_label()]
+        targets = [instr.label for instr in self.instructions if instr.is_jump()]
+        return check_labels(defined, targets)
+
     def validate_live_on_exit(self):
         """
         Validates that all live-on-exit variables appear in the code.
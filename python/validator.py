@@ -0,0 +1,102 @@
+# validator.py
+# Linear-time check of a finished register allocation, run before the .s file is written.
+#
+# Instead of testing every pair of webs for interference, one sweep walks the block line
+# by line: each live range claims its register on its start line and gives it back on its
+# end line. A register that is claimed while another web still holds it means two
+# simultaneously live webs share a register. Ranges are bucketed by line number, so the
+# whole check is linear in the size of the block.
+
+
+def validate_allocation(ranges, allocations, web_map, num_instructions, num_registers=None):
+    """
+    Checks an allocation against the live ranges and the web map it was made for.
+
+    Args:
+        ranges: dict of web name -> list of LiveRange (e.g. InterferenceGraph.ranges)
+        allocations: dict of web name -> register number
+        web_map: the WebMap codegen will read (uses, defs, exit, constants, in_memory)
+        num_instructions: number of instructions in the block
+        num_registers: registers available, or None to skip the register-number check
+
+    Returns:
+        (is_valid, error_message)
+    """
+    starts = [[] for _ in range(num_instructions + 2)]
+    ends = [[] for _ in range(num_instructions + 2)]
+    for web, web_ranges in ranges.items():
+        if web not in allocations:
+            if web in web_map.in_memory:
+                continue
+            return False, f"Web '{web}' is live but has no register"
+        reg = allocations[web]
+        if num_registers is not None and not 0 <= reg < num_registers:
+            return False, f"Web '{web}' is given R{reg}, but only {num_registers} register(s) exist"
+        if reg == web_map.scratch_register:
+            return False, f"Web '{web}' is given the scratch register R{reg}"
+        for r in web_ranges:
+            starts[r.start_line].append(web)
+            ends[r.end_line].append(web)
+
+    holder = {}
+    # Number of open ranges of each web (the ranges of one web may touch or overlap)
+    open_ranges = {}
+    for line_num in range(num_instructions + 2):
+        # Ranges are half-open, so a range ending here frees its register for one starting here
+        for web in ends[line_num]:
+            open_ranges[web] -= 1
+            if not open_ranges[web]:
+                del holder[allocations[web]]
+        for web in starts[line_num]:
+            reg = allocations[web]
+            if holder.get(reg, web) != web:
+                return False, f"Webs '{holder[reg]}' and '{web}' are both live on line {line_num} in R{reg}"
+            holder[reg] = web
+            open_ranges[web] = open_ranges.get(web, 0) + 1
+
+    return _check_references(allocations, web_map)
+
+
+def _check_references(allocations, web_map):
+    """Checks that every web the generated code reads or writes has somewhere to live."""
+    def placed(web):
+        return web in allocations or web in web_map.constants or web in web_map.in_memory
+
+    for (line_num, var), web in web_map.uses.items():
+        if not placed(web):
+            return False, f"'{var}' is read on line {line_num} but web '{web}' has no register"
+    for var, web in web_map.exit.items():
+        if not placed(web):
+            return False, f"'{var}' is live on exit but web '{web}' has no register"
+    for line_num, loads in web_map.loads.items():
+        for var, web in loads:
+            if web not in allocations and web not in web_map.in_memory:
+                return False, f"'{var}' is loaded before line {line_num} but web '{web}' has no register"
+    for line_num, moves in web_map.transfers.items():
+        for var, src, dst in moves:
+            if src not in allocations or dst not in allocations:
+                return False, f"'{var}' is moved before line {line_num} between webs without registers"
+    return True, None
+
+
+if __name__ == "__main__":
+    from threeAddress import IntermediateCode, ThreeAddressInstruction
+    from liveness import LivenessAnalyzer
+    from interference import InterferenceGraph
+
+    code = IntermediateCode()
+    code.add_instruction(ThreeAddressInstruction("t1", "a", "+", "b"))
+    code.add_instruction(ThreeAddressInstruction("t2", "t1", "*", "a"))
+    code.add_instruction(ThreeAddressInstruction("d", "t2", "-", "t1"))
+    code.set_live_on_exit(["d"])
+
+    analyzer = LivenessAnalyzer(code)
+    analyzer.analyze()
+    graph = InterferenceGraph(analyzer)
+    graph.allocate_registers(4)
+    print("Allocation:", graph.allocations)
+    print("Valid:", validate_allocation(graph.ranges, graph.allocations, analyzer.web_map, len(code.instructions), 4))
+
+    graph.allocations["t2"] = graph.allocations["t1"]
+    print("After forcing t1 and t2 together:",
+          validate_allocation(graph.ranges, graph.allocations, analyzer.web_map, len(code.instructions), 4))